@@ -3,16 +3,24 @@
 #
 
 # Standard library
+import atexit
+import functools
 import os
-from typing import Any, Optional, Union
+import select
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, TypeVar, Union
 
 # Database
 import psycopg2
+import psycopg2.extras
+import psycopg2.pool
 from psycopg2.extras import RealDictCursor
 
 # Environment variables
 from dev.env import load_env
-load_env()
 
 # Logging
 import logging
@@ -23,14 +31,127 @@ logger = logging.getLogger(__name__)
 # Constants
 #
 
-# Database connection parameters
-DB_PARAMS = {
-    "host": os.getenv("POSTGRES_HOST"),
-    "port": os.getenv("POSTGRES_PORT"),
-    "database": os.getenv("POSTGRES_DB"),
-    "user": os.getenv("POSTGRES_USER"),
-    "password": os.getenv("POSTGRES_PASSWORD"),
-}
+# Item and result types for map_with_connections()
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+#
+# Connection Parameters
+#
+
+
+@functools.lru_cache(maxsize=1)
+def _db_params() -> dict[str, Optional[str]]:
+    """
+    Load the environment and build the connection parameters on first use.
+
+    Deferred until a connection is actually needed, so importing this module never
+    parses .env files and env vars set after import are still honoured.
+
+    @returns dict - Keyword arguments for psycopg2.connect()
+    """
+
+    load_env()
+    return {
+        "host": os.getenv("POSTGRES_HOST"),
+        "port": os.getenv("POSTGRES_PORT"),
+        "database": os.getenv("POSTGRES_DB"),
+        "user": os.getenv("POSTGRES_USER"),
+        "password": os.getenv("POSTGRES_PASSWORD"),
+    }
+
+
+#
+# Settings
+#
+
+
+def _pool_max_connections() -> int:
+    """
+    Maximum number of pooled connections (PG_POOL_MAX, default 8).
+
+    @returns int - Pool size
+    """
+
+    load_env()
+    return int(os.getenv("PG_POOL_MAX", "8"))
+
+
+def db_workers() -> int:
+    """
+    Number of concurrent database workers (ETL_DB_WORKERS, default 4).
+
+    Each worker holds its own pooled connection, so this is capped at the pool size.
+
+    @returns int - Worker count
+    """
+
+    load_env()
+    return min(int(os.getenv("ETL_DB_WORKERS", "4")), _pool_max_connections())
+
+
+def _pg_pipeline() -> bool:
+    """
+    Whether execute_script() first sends a batch as one multi-statement query (PG_PIPELINE=1).
+
+    @returns bool - True when pipelining is enabled
+    """
+
+    load_env()
+    return os.getenv("PG_PIPELINE") == "1"
+
+
+#
+# Connection Pool
+#
+
+# Created lazily on first use so importing this module never opens a connection
+_pool: Optional[psycopg2.pool.ThreadedConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> psycopg2.pool.ThreadedConnectionPool:
+    """
+    Get the shared connection pool, creating it on first use.
+
+    @returns psycopg2.pool.ThreadedConnectionPool - Process-wide connection pool
+    """
+
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                max_connections = _pool_max_connections()
+                logger.debug("Creating connection pool (maxconn=%d)", max_connections)
+                _pool = psycopg2.pool.ThreadedConnectionPool(
+                    minconn=1,
+                    maxconn=max_connections,
+                    cursor_factory=RealDictCursor,
+                    **_db_params(),
+                )
+
+    return _pool
+
+
+def close_pool() -> None:
+    """
+    Close every pooled connection and discard the pool.
+
+    The next get_connection() call creates a fresh pool.
+    """
+
+    global _pool
+
+    with _pool_lock:
+        if _pool is not None:
+            logger.debug("Closing connection pool")
+            _pool.closeall()
+            _pool = None
+
+
+atexit.register(close_pool)
 
 
 #
@@ -40,13 +161,49 @@ DB_PARAMS = {
 
 def get_connection() -> psycopg2.extensions.connection:
     """
-    Connect to the PostgreSQL database.
+    Borrow a connection from the PostgreSQL connection pool.
+
+    Callers must hand the connection back with release_connection() instead of closing it.
 
     @returns psycopg2.extensions.connection - Database connection
     """
 
-    logger.debug("Connecting to database")
-    return psycopg2.connect(**DB_PARAMS, cursor_factory=RealDictCursor)
+    logger.debug("Borrowing connection from pool")
+    return _get_pool().getconn()
+
+
+def release_connection(conn: psycopg2.extensions.connection, close: bool = False) -> None:
+    """
+    Return a borrowed connection to the pool.
+
+    @param conn (psycopg2.extensions.connection): Connection from get_connection()
+    @param close (bool): Discard the connection instead of reusing it (e.g. after an error)
+    """
+
+    logger.debug("Returning connection to pool (close=%s)", close)
+    _get_pool().putconn(conn, close=close)
+
+
+@contextmanager
+def get_pooled_connection() -> Iterator[psycopg2.extensions.connection]:
+    """
+    Borrow a pooled connection for the duration of a with block.
+
+    The connection goes back to the pool when the block exits (any open transaction
+    is rolled back by the pool). It is discarded instead if a database error escapes.
+
+    @returns Iterator[psycopg2.extensions.connection] - Database connection
+    """
+
+    conn = get_connection()
+    broken = False
+    try:
+        yield conn
+    except psycopg2.Error:
+        broken = True
+        raise
+    finally:
+        release_connection(conn, close=broken)
 
 
 def execute_query(
@@ -57,7 +214,7 @@ def execute_query(
 
     @param query (str): SQL query to execute (use %s placeholders when using params)
     @param params (Optional[Union[tuple, dict]]): Parameters for parameterized query
-    @returns dict - Query results with columns, rows, and rowcount
+    @returns dict - Query results with columns, rows (as tuples), and rowcount
     """
 
     # Validate query
@@ -66,8 +223,10 @@ def execute_query(
 
     # Execute the query
     conn = get_connection()
+    broken = False
     try:
-        cursor = conn.cursor()
+        # Plain tuple cursor: rows come back in column order without per-row dicts
+        cursor = conn.cursor(cursor_factory=psycopg2.extensions.cursor)
 
         # Use parameterized query if params are provided
         if params is not None:
@@ -84,9 +243,6 @@ def execute_query(
         # Fetch all rows
         rows = cursor.fetchall() if cursor.description else []
 
-        # Convert rows to list of values
-        result_rows = [[row[column] for column in columns] for row in rows]
-
         # Get rowcount
         rowcount = cursor.rowcount
 
@@ -94,11 +250,233 @@ def execute_query(
 
         # Clean up
         cursor.close()
-        conn.close()
 
     except psycopg2.Error as e:
         logger.error("Query execution failed: %s", e)
-        conn.close()
+        broken = True
+        raise
+
+    finally:
+        # Failed connections are discarded so a broken socket is never reused
+        release_connection(conn, close=broken)
+
+    return {"columns": columns, "rows": rows, "rowcount": rowcount}
+
+
+def execute_script(statements: list[str]) -> dict[int, str]:
+    """
+    Execute several SQL statements on one connection in a single transaction.
+
+    Each statement runs behind its own savepoint, so a failing statement is rolled
+    back on its own while the rest of the batch still commits. With PG_PIPELINE=1 the
+    whole batch is first sent as a single multi-statement query (one round trip);
+    only if that fails is it replayed statement by statement.
+
+    @param statements (list[str]): SQL statements (or multi-statement scripts) in execution order
+    @returns dict[int, str] - Error messages keyed by index of each failed statement
+    """
+
+    if not statements:
+        return {}
+
+    failures: dict[int, str] = {}
+
+    conn = get_connection()
+    broken = False
+    try:
+        cursor = conn.cursor()
+
+        # Fast path: the server parses and runs the whole batch from one message
+        # (separators go on their own line so a trailing -- comment can't swallow them)
+        if len(statements) > 1 and _pg_pipeline():
+            cursor.execute("SAVEPOINT script_batch")
+            try:
+                cursor.execute("\n;\n".join(statements))
+            except psycopg2.Error as e:
+                cursor.execute("ROLLBACK TO SAVEPOINT script_batch")
+                logger.debug("Batched script failed, replaying per statement: %s", e)
+            else:
+                conn.commit()
+                cursor.close()
+                logger.debug("Script executed as one batch (%d statements)", len(statements))
+                return failures
+
+        for index, statement in enumerate(statements):
+            savepoint = f"script_{index}"
+            cursor.execute(f"SAVEPOINT {savepoint}")
+
+            try:
+                cursor.execute(statement)
+            except psycopg2.Error as e:
+                cursor.execute(f"ROLLBACK TO SAVEPOINT {savepoint}")
+                failures[index] = str(e)
+                logger.debug("Script statement %d failed: %s", index, e)
+
+            cursor.execute(f"RELEASE SAVEPOINT {savepoint}")
+
+        # Commit everything that succeeded in one go
+        conn.commit()
+        cursor.close()
+
+        logger.debug(
+            "Script executed (%d statements, %d failed)", len(statements), len(failures)
+        )
+
+    except psycopg2.Error as e:
+        logger.error("Script execution failed: %s", e)
+        broken = True
         raise
 
-    return {"columns": columns, "rows": result_rows, "rowcount": rowcount}
+    finally:
+        release_connection(conn, close=broken)
+
+    return failures
+
+
+def execute_script_concurrently(statements: list[str]) -> dict[int, str]:
+    """
+    Execute independent SQL statements across up to db_workers() pooled connections.
+
+    Statements are dealt round-robin into one batch per worker and each batch runs
+    through execute_script() in its own transaction, so no statement may depend on
+    another statement in the same call.
+
+    @param statements (list[str]): Mutually independent SQL statements
+    @returns dict[int, str] - Error messages keyed by index of each failed statement
+    """
+
+    workers = min(db_workers(), len(statements))
+    if workers <= 1:
+        return execute_script(statements)
+
+    batches = [list(range(worker, len(statements), workers)) for worker in range(workers)]
+
+    def run_batch(indexes: list[int]) -> dict[int, str]:
+        batch_failures = execute_script([statements[i] for i in indexes])
+        return {indexes[i]: error for i, error in batch_failures.items()}
+
+    failures: dict[int, str] = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch_failures in executor.map(run_batch, batches):
+            failures.update(batch_failures)
+
+    return failures
+
+
+def map_with_connections(
+    fn: Callable[[psycopg2.extensions.connection, T], R], items: list[T]
+) -> list[R]:
+    """
+    Call fn(conn, item) for every item across up to db_workers() pooled connections.
+
+    Items are dealt round-robin into one batch per worker and each worker runs its
+    batch in order on a single borrowed connection, so fn must leave the connection
+    usable (commit or roll back) and should handle its own errors.
+
+    @param fn (Callable): Function taking a connection and one item
+    @param items (list): Mutually independent work items
+    @returns list - fn results in input order
+    """
+
+    workers = min(db_workers(), len(items))
+    if workers <= 1:
+        if not items:
+            return []
+        with get_pooled_connection() as conn:
+            return [fn(conn, item) for item in items]
+
+    batches = [list(range(worker, len(items), workers)) for worker in range(workers)]
+
+    def run_batch(indexes: list[int]) -> list[tuple[int, R]]:
+        with get_pooled_connection() as conn:
+            return [(i, fn(conn, items[i])) for i in indexes]
+
+    results: list[Any] = [None] * len(items)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch_results in executor.map(run_batch, batches):
+            for i, result in batch_results:
+                results[i] = result
+
+    return results
+
+
+def execute_async_batch(statements: list[str]) -> dict[int, str]:
+    """
+    Execute independent SQL statements over up to db_workers() non-blocking connections.
+
+    Uses psycopg2 async mode: each connection is handed the next pending statement as
+    soon as its previous one completes, and one select() loop waits on all of them,
+    so no threads are involved. Async connections autocommit, so every statement (or
+    multi-statement script) runs as its own implicit transaction. Falls back to
+    execute_script() when only one worker is configured.
+
+    The connections are opened directly instead of drawn from the pool: async mode is
+    fixed when a connection is created, and every pooled connection is synchronous.
+
+    @param statements (list[str]): Mutually independent SQL statements
+    @returns dict[int, str] - Error messages keyed by index of each failed statement
+    """
+
+    workers = min(db_workers(), len(statements))
+    if workers <= 1:
+        return execute_script(statements)
+
+    failures: dict[int, str] = {}
+    pending = deque(range(len(statements)))
+    running: dict[int, tuple[psycopg2.extensions.connection, int]] = {}
+
+    def submit(conn: psycopg2.extensions.connection) -> None:
+        # Hand the connection its next statement (errors raised before sending skip ahead)
+        while pending:
+            index = pending.popleft()
+            try:
+                conn.cursor().execute(statements[index])
+            except psycopg2.Error as e:
+                failures[index] = str(e)
+                continue
+            running[conn.fileno()] = (conn, index)
+            return
+
+    connections = []
+    try:
+        # Open the connections and wait for them all to be ready
+        for _ in range(workers):
+            conn = psycopg2.connect(**_db_params(), async_=True)
+            connections.append(conn)
+        for conn in connections:
+            psycopg2.extras.wait_select(conn)
+            submit(conn)
+
+        # Poll every running statement; wait on the sockets that are still busy
+        while running:
+            readers: list[int] = []
+            writers: list[int] = []
+
+            for fileno, (conn, index) in list(running.items()):
+                try:
+                    state = conn.poll()
+                except psycopg2.Error as e:
+                    failures[index] = str(e)
+                    logger.debug("Async statement %d failed: %s", index, e)
+                    state = psycopg2.extensions.POLL_OK
+
+                if state == psycopg2.extensions.POLL_OK:
+                    del running[fileno]
+                    submit(conn)
+                elif state == psycopg2.extensions.POLL_READ:
+                    readers.append(fileno)
+                elif state == psycopg2.extensions.POLL_WRITE:
+                    writers.append(fileno)
+
+            if readers or writers:
+                select.select(readers, writers, [])
+
+        logger.debug(
+            "Async batch executed (%d statements, %d failed)", len(statements), len(failures)
+        )
+
+    finally:
+        for conn in connections:
+            conn.close()
+
+    return failures
@@ -3,6 +3,7 @@
 #
 
 # Standard library
+import functools
 import os
 import sys
 
@@ -22,12 +23,14 @@ logger = logging.getLogger(__name__)
 #
 
 
+@functools.lru_cache(maxsize=1)
 def load_env():
     """
     Load environment variables based on MAGO_ENV or -s flag.
 
     Checks sys.argv for -s/--staging, then MAGO_ENV env var.
     Loads .env or .env.staging files from project root and data/.
+    Runs once per process; later calls return the cached environment name.
 
     @returns str - The environment that was loaded ("dev" or "staging")
     """
@@ -10,7 +10,7 @@ import os
 from typing import Any
 
 # Storage client
-from dev.storage import get_s3_client
+from dev.storage import get_s3_client, list_bucket_names, record_bucket_created
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -41,13 +41,12 @@ def create_bucket() -> dict[str, Any]:
     client = get_s3_client(endpoint_url=endpoint_url)
 
     # Get existing buckets
-    list_response = client.list_buckets()
-    existing_buckets = {bucket["Name"] for bucket in list_response.get("Buckets", [])}
+    existing_buckets = list_bucket_names(client)
 
-    # Get bucket names from data/buckets directory (exclude .minio)
-    bucket_names = [
+    # Get bucket names from data/buckets directory (exclude .minio), sorted for stable output
+    bucket_names = sorted(
         item.name for item in buckets_dir.iterdir() if item.is_dir() and item.name != ".minio"
-    ]
+    )
 
     # Create each bucket
     buckets_created = []
@@ -59,6 +58,7 @@ def create_bucket() -> dict[str, Any]:
             continue
 
         client.create_bucket(Bucket=bucket_name)
+        record_bucket_created(client, bucket_name)
         buckets_created.append(bucket_name)
 
     logger.info(
@@ -6,16 +6,20 @@
 import argparse
 import json
 import logging
-from pathlib import Path
+import os
 from typing import Any, Optional
 
 # Database
-from dev.db import execute_query
+from dev.db import execute_async_batch, execute_script
+from dev.etl.drop_tables import quote_identifier
 
 # DAG
-from dev.etl.dependency_graph import build_dependency_graph, topological_sort
+from dev.etl.dependency_graph import build_dependency_graph, topological_layers
 from dev.etl.seed_tables import extract_table_name_from_create_sql
 
+# Paths
+from dev.paths import walk_files
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -25,21 +29,113 @@ logger = logging.getLogger(__name__)
 
 
 def find_create_sql_files(base_path: str, usernames: Optional[list[str]] = None) -> list[str]:
-    """Find all create.sql files in the tables directory"""
+    """
+    Find all create.sql files in the tables directory
+
+    Directory listings are cached per directory and revalidated by mtime (see
+    walk_files), so repeated scans of an unchanged tree cost one stat() per directory.
+
+    @param base_path (str): Tables directory
+    @param usernames (Optional[list[str]]): Only search these schema directories
+    @returns list[str] - Paths to create.sql files
+    """
     sql_files = []
-    base = Path(base_path)
 
-    # Search in specific usernames or all directories
-    search_dirs = [base / u for u in usernames] if usernames else [base]
+    # Search in specific usernames (each once) or all directories
+    if usernames:
+        search_dirs = [os.path.join(base_path, u) for u in dict.fromkeys(usernames)]
+    else:
+        search_dirs = [base_path]
 
     for search_dir in search_dirs:
-        if search_dir.exists():
-            for sql_file in search_dir.rglob("create.sql"):
-                sql_files.append(str(sql_file))
+        sql_files.extend(walk_files(search_dir, "create.sql"))
 
     return sql_files
 
 
+def create_from_files(
+    sql_files: list[str],
+    concurrent: bool = False,
+    contents: Optional[dict[str, str]] = None,
+) -> tuple[int, dict[str, str]]:
+    """
+    Run create.sql files, each behind its own savepoint
+
+    @param sql_files (list[str]): Paths to create.sql files
+    @param concurrent (bool): Files are independent and may run on several async connections
+    @param contents (Optional[dict[str, str]]): Already-read SQL by file path (others are read)
+    @returns tuple - (tables created, {file_path: error} for failed files)
+    """
+    failed: dict[str, str] = {}
+    contents = contents or {}
+
+    # Read each script (unless its content is already known)
+    scripts: list[str] = []
+    script_files: list[str] = []
+    for sql_file in sql_files:
+        if sql_file in contents:
+            scripts.append(contents[sql_file])
+            script_files.append(sql_file)
+            continue
+
+        try:
+            with open(sql_file) as f:
+                scripts.append(f.read())
+            script_files.append(sql_file)
+        except Exception as e:
+            failed[sql_file] = str(e)
+
+    if concurrent:
+        script_failures = execute_async_batch(scripts)
+
+        # Retry failures serially (concurrent FK creation can deadlock on shared parents)
+        if script_failures:
+            retry_indexes = sorted(script_failures)
+            retry_failures = execute_script([scripts[i] for i in retry_indexes])
+            script_failures = {retry_indexes[i]: error for i, error in retry_failures.items()}
+    else:
+        script_failures = execute_script(scripts)
+
+    for index, error in script_failures.items():
+        failed[script_files[index]] = error
+
+    return len(scripts) - len(script_failures), failed
+
+
+def batch_layers(
+    layers: list[list[str]], unordered_files: list[str]
+) -> list[tuple[list[str], bool]]:
+    """
+    Group dependency layers into create_from_files() batches
+
+    Consecutive single-file layers (and the unordered files, which run last) are merged
+    into one serial batch, so a chain of N dependent tables runs in one transaction
+    instead of N; wider layers stay concurrent batches of their own.
+
+    @param layers (list[list[str]]): create.sql files per dependency layer, in order
+    @param unordered_files (list[str]): Files without an extractable table name
+    @returns list[tuple] - (files, concurrent) batches in execution order
+    """
+    batches: list[tuple[list[str], bool]] = []
+
+    for layer_files in layers:
+        concurrent = len(layer_files) > 1
+
+        # Extend the previous serial batch (later statements see earlier tables)
+        if not concurrent and batches and not batches[-1][1]:
+            batches[-1][0].extend(layer_files)
+        elif layer_files:
+            batches.append((list(layer_files), concurrent))
+
+    if unordered_files:
+        if batches and not batches[-1][1]:
+            batches[-1][0].extend(unordered_files)
+        else:
+            batches.append((list(unordered_files), False))
+
+    return batches
+
+
 #
 # Handler Functions
 #
@@ -61,30 +157,42 @@ def create_table(usernames: Optional[list[str]] = None) -> dict[str, Any]:
     # Find all create.sql files
     sql_files = find_create_sql_files(str(tables_dir), usernames if usernames else None)
 
-    # Build dependency graph and get topological order
-    graph, file_map = build_dependency_graph(sql_files, extract_table_name_from_create_sql)
-    ordered = topological_sort(graph)
+    # Build dependency graph and split it into layers of independent tables
+    graph, file_map, content_map = build_dependency_graph(
+        sql_files, extract_table_name_from_create_sql
+    )
+    layers = [
+        [file_map[name] for name in layer if name in file_map]
+        for layer in topological_layers(graph)
+    ]
+
+    # Reuse SQL already read while building the graph
+    contents = {file_map[name]: content for name, content in content_map.items()}
 
     # Collect files not in the graph (no extractable table name)
-    ordered_files = [file_map[name] for name in ordered if name in file_map]
-    unordered_files = [f for f in sql_files if f not in set(ordered_files)]
+    ordered_files = {f for layer in layers for f in layer}
+    unordered_files = [f for f in sql_files if f not in ordered_files]
+
+    # Create schemas up front: concurrent CREATE SCHEMA IF NOT EXISTS calls race each other
+    schemas = sorted({name.split(".", 1)[0] for name in graph if "." in name})
+    execute_script(
+        [f"CREATE SCHEMA IF NOT EXISTS {quote_identifier(schema)};" for schema in schemas]
+    )
 
     # Track progress
     failed_tables: dict[str, str] = {}
     total_created = 0
 
-    # Single pass: create each table in dependency order, then unordered files
-    for sql_file in ordered_files + unordered_files:
-        try:
-            with open(sql_file) as f:
-                sql_content = f.read()
+    # One batch at a time: wide layers are created concurrently, runs of single-file
+    # layers serially in one transaction; each batch commits before the next one,
+    # whose tables may reference it
+    for batch_files, concurrent in batch_layers(layers, unordered_files):
+        created, failed = create_from_files(batch_files, concurrent=concurrent, contents=contents)
+        total_created += created
+        failed_tables.update(failed)
 
-            execute_query(sql_content)
-            total_created += 1
-
-        except Exception as e:
-            failed_tables[sql_file] = str(e)
-            logger.warning(f"Failed to create table from {sql_file}: {e}")
+    for sql_file, error in failed_tables.items():
+        logger.warning(f"Failed to create table from {sql_file}: {error}")
 
     logger.info(f"create_table completed: {total_created} tables created")
 
@@ -4,100 +4,182 @@
 
 # Standard library
 import logging
+import os
 import re
-from collections import deque
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Optional
 
+# Paths
+from dev.paths import LISTING_CACHE_MIN_AGE_NS
+
 # Logging
 logger = logging.getLogger(__name__)
 
 
+#
+# Constants
+#
+
+# Match schema.table after REFERENCES, each part quoted or unquoted
+FOREIGN_KEY_PATTERN = re.compile(
+    r'REFERENCES\s+'
+    r'(?:"([^"]+)"|(\w+))\.'      # Schema: "schema" or schema
+    r'(?:"([^"]+)"|(\w+))'         # Table: "table" (e.g. a reserved word) or table
+    r'\s*\(',                     # Opening paren for column list
+    re.IGNORECASE,
+)
+
+# SQL comments (stripped before FK parsing so commented-out REFERENCES are ignored)
+LINE_COMMENT_PATTERN = re.compile(r"--[^\n]*")
+BLOCK_COMMENT_PATTERN = re.compile(r"/\*.*?\*/", re.DOTALL)
+
+# Threads for reading create.sql files (I/O bound, so more threads than cores)
+READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Parsed files kept before the cache is cleared (one entry per create.sql path)
+PARSE_CACHE_MAX_ENTRIES = 1024
+
+# create.sql path -> (mtime_ns, size, extract_fn, table name, dependency tables)
+_parse_cache: dict[str, tuple[int, int, Callable, str, tuple[str, ...]]] = {}
+
+
 #
 # Helper Functions
 #
 
 
+def strip_sql_comments(sql_content: str) -> str:
+    """
+    Remove -- line comments and /* block */ comments from SQL content
+
+    @param sql_content (str): SQL file content
+    @returns str - SQL content without comments
+    """
+
+    if "/*" in sql_content:
+        sql_content = BLOCK_COMMENT_PATTERN.sub(" ", sql_content)
+    if "--" in sql_content:
+        sql_content = LINE_COMMENT_PATTERN.sub("", sql_content)
+
+    return sql_content
+
+
 def parse_foreign_keys(sql_content: str, table_name: Optional[str] = None) -> list[str]:
     """
     Extract referenced tables from REFERENCES clauses in SQL content
 
-    Handles two syntax variants:
+    Handles quoted and unquoted schema and table parts, e.g.:
       - Unquoted schema: REFERENCES meta.lucide_icon ("ID")
       - Quoted schema:   REFERENCES "test00000000000000000000".help__theme ("ID")
+      - Quoted table:    REFERENCES meta."order" ("ID")
 
-    Self-references (where referenced table == table_name) are excluded.
+    Self-references (where referenced table == table_name) are excluded, as are
+    references inside SQL comments.
 
     @param sql_content (str): SQL file content
     @param table_name (Optional[str]): Table name to exclude self-references
     @returns list[str] - Deduplicated list of schema.table dependency strings
     """
 
-    # Match both quoted and unquoted schema.table patterns after REFERENCES
-    pattern = re.compile(
-        r'REFERENCES\s+'
-        r'(?:"([^"]+)"\.(\w+)'       # Quoted schema: "schema".table
-        r'|(\w+)\.(\w+))'            # Unquoted schema: schema.table
-        r'\s*\(',                     # Opening paren for column list
-        re.IGNORECASE,
+    # Most tables have no FKs: a C-level substring test skips both regex passes for them
+    # (casefold so the gate is never stricter than the case-insensitive pattern)
+    if "references" not in sql_content.casefold():
+        return []
+
+    # findall returns plain group tuples ("" for the branch that didn't match), and
+    # dict.fromkeys dedupes them in first-seen order
+    references = dict.fromkeys(
+        f"{quoted_schema or schema}.{quoted_table or table}"
+        for quoted_schema, schema, quoted_table, table in FOREIGN_KEY_PATTERN.findall(
+            strip_sql_comments(sql_content)
+        )
     )
 
-    seen: set[str] = set()
-    result: list[str] = []
+    # Skip self-references
+    if table_name:
+        references.pop(table_name, None)
 
-    for match in pattern.finditer(sql_content):
-        # Extract schema and table from whichever group matched
-        if match.group(1) is not None:
-            ref_table = f"{match.group(1)}.{match.group(2)}"
-        else:
-            ref_table = f"{match.group(3)}.{match.group(4)}"
+    return list(references)
 
-        # Skip self-references
-        if table_name and ref_table == table_name:
-            continue
 
-        # Deduplicate
-        if ref_table not in seen:
-            seen.add(ref_table)
-            result.append(ref_table)
+def read_and_parse(
+    sql_file: str,
+    extract_fn: Callable[[str], Optional[str]],
+) -> Optional[tuple[str, tuple[str, ...], str]]:
+    """
+    Extract the table name from a create.sql file and parse its FKs
+
+    The table name and dependencies are reused while the file's mtime and size are
+    unchanged; the content itself is always read fresh and never cached.
+
+    @param sql_file (str): Path to a create.sql file
+    @param extract_fn (Callable): Function that takes a file path and returns schema.table or None
+    @returns Optional[tuple] - (table name, dependency tables, SQL content), or None if skipped
+    """
+
+    try:
+        stat = os.stat(sql_file)
+        with open(sql_file) as f:
+            content = f.read()
+    except (OSError, ValueError):
+        # Missing, unreadable or undecodable file
+        return None
+
+    # Reuse the parse if the file is unchanged and was parsed with the same extractor
+    cached = _parse_cache.get(sql_file)
+    if cached and cached[:3] == (stat.st_mtime_ns, stat.st_size, extract_fn):
+        return cached[3], cached[4], content
+
+    # Extract table name
+    name = extract_fn(sql_file)
+    if name is None:
+        return None
+    deps = tuple(parse_foreign_keys(content, table_name=name))
 
-    return result
+    # Files newer than the mtime granularity could change again unnoticed, so skip them
+    if time.time_ns() - stat.st_mtime_ns >= LISTING_CACHE_MIN_AGE_NS:
+        if len(_parse_cache) >= PARSE_CACHE_MAX_ENTRIES:
+            _parse_cache.clear()
+        _parse_cache[sql_file] = (stat.st_mtime_ns, stat.st_size, extract_fn, name, deps)
+
+    return name, deps, content
 
 
 def build_dependency_graph(
     sql_files: list[str],
     extract_fn: Callable[[str], Optional[str]],
-) -> tuple[dict[str, set[str]], dict[str, str]]:
+) -> tuple[dict[str, set[str]], dict[str, str], dict[str, str]]:
     """
     Build a dependency graph from create.sql files
 
-    For each file, extracts the table name via extract_fn and parses FKs.
+    For each file, extracts the table name via extract_fn and parses FKs. Files are
+    read on a thread pool; results are assembled in input order. The file content is
+    kept so callers can execute it without reading the file again.
 
     @param sql_files (list[str]): Paths to create.sql files
     @param extract_fn (Callable): Function that takes a file path and returns schema.table or None
-    @returns tuple - (graph: {table: set of dependency tables}, file_map: {table: file_path})
+    @returns tuple - (graph: {table: set of dependency tables}, file_map: {table: file_path},
+        content_map: {table: SQL content})
     """
 
     graph: dict[str, set[str]] = {}
     file_map: dict[str, str] = {}
+    content_map: dict[str, str] = {}
 
-    for sql_file in sql_files:
-        # Extract table name
-        name = extract_fn(sql_file)
-        if name is None:
-            continue
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as executor:
+        results = executor.map(lambda sql_file: read_and_parse(sql_file, extract_fn), sql_files)
 
-        # Read file and parse FKs
-        try:
-            with open(sql_file) as f:
-                content = f.read()
-        except Exception:
-            continue
+        for sql_file, parsed in zip(sql_files, results):
+            if parsed is None:
+                continue
 
-        deps = parse_foreign_keys(content, table_name=name)
-        graph[name] = set(deps)
-        file_map[name] = sql_file
+            name, deps, content = parsed
+            graph[name] = set(deps)
+            file_map[name] = sql_file
+            content_map[name] = content
 
-    return graph, file_map
+    return graph, file_map, content_map
 
 
 def topological_sort(graph: dict[str, set[str]]) -> list[str]:
@@ -112,38 +194,127 @@ def topological_sort(graph: dict[str, set[str]]) -> list[str]:
     @returns list[str] - Topologically ordered list of node names
     """
 
+    # Breadth-first Kahn order is exactly the layers concatenated: nodes freed while
+    # draining one frontier are only dequeued after the rest of that frontier
+    return [node for layer in topological_layers(graph) for node in layer]
+
+
+def topological_layers(graph: dict[str, set[str]]) -> list[list[str]]:
+    """
+    Partition the graph into dependency layers (Kahn's algorithm, one frontier at a time)
+
+    Every node in a layer depends only on nodes in earlier layers, so the nodes of
+    one layer can be processed concurrently. External dependencies are ignored and
+    nodes on (or behind) a cycle are left out with a warning. The reverse adjacency
+    is built in the same single pass over the edges that counts in-degrees, and
+    topological_sort reuses these layers, so each pipeline run walks the edges once.
+
+    @param graph (dict[str, set[str]]): {node: set of dependency nodes}
+    @returns list[list[str]] - Layers in dependency order, leaves first
+    """
+
     if not graph:
         return []
 
-    # Build in-degree map considering only edges within the graph
-    in_degree: dict[str, int] = dict.fromkeys(graph, 0)
-    for node in graph:
-        for dep in graph[node]:
-            if dep in graph:
-                in_degree[node] += 1
-
-    # Start with zero-dependency nodes
-    queue: deque[str] = deque()
-    for node, degree in in_degree.items():
-        if degree == 0:
-            queue.append(node)
-
-    # BFS
-    result: list[str] = []
-    while queue:
-        node = queue.popleft()
-        result.append(node)
-
-        # Decrement in-degree for nodes that depend on this one
-        for other, deps in graph.items():
-            if node in deps and other in in_degree:
-                in_degree[other] -= 1
-                if in_degree[other] == 0:
-                    queue.append(other)
-
-    # Check for cycles
-    if len(result) != len(graph):
-        missing = set(graph.keys()) - set(result)
+    # Intern nodes to integer ids; in-degrees and reverse adjacency become flat lists
+    # indexed by id, built from edges within the graph only (dependency sets are not mutated)
+    nodes = list(graph)
+    node_ids = {node: index for index, node in enumerate(nodes)}
+    in_degree = [0] * len(nodes)
+    dependents: list[list[int]] = [[] for _ in nodes]
+    for index, deps in enumerate(graph.values()):
+        for dep in deps:
+            dep_id = node_ids.get(dep)
+            if dep_id is not None:
+                in_degree[index] += 1
+                dependents[dep_id].append(index)
+
+    # Drain the whole zero-dependency frontier as one layer
+    layers: list[list[str]] = []
+    frontier = [index for index, degree in enumerate(in_degree) if degree == 0]
+    resolved = 0
+    while frontier:
+        layers.append([nodes[index] for index in frontier])
+        resolved += len(frontier)
+
+        next_frontier: list[int] = []
+        for index in frontier:
+            for dependent in dependents[index]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    next_frontier.append(dependent)
+        frontier = next_frontier
+
+    # Check for cycles (only then pay for the SCC pass that names them)
+    if resolved != len(graph):
+        missing = {nodes[index] for index, degree in enumerate(in_degree) if degree > 0}
         logger.warning(f"Cycle detected in dependency graph, unresolved nodes: {missing}")
+        for cycle in find_cycles({node: graph[node] for node in missing}):
+            logger.warning(f"Dependency cycle between: {', '.join(cycle)}")
+
+    return layers
+
+
+def find_cycles(graph: dict[str, set[str]]) -> list[list[str]]:
+    """
+    Find the cycles of a dependency graph as strongly connected components (Tarjan)
+
+    Iterative, so deep graphs don't hit the recursion limit. Every component with more
+    than one node, and every node that depends on itself, is reported. External
+    dependencies are ignored.
+
+    @param graph (dict[str, set[str]]): {node: set of dependency nodes}
+    @returns list[list[str]] - Nodes of each cycle (sorted), in discovery order
+    """
+
+    index_of: dict[str, int] = {}
+    lowlink: dict[str, int] = {}
+    on_stack: set[str] = set()
+    stack: list[str] = []
+    cycles: list[list[str]] = []
+
+    for root in graph:
+        if root in index_of:
+            continue
 
-    return result
+        # Each work item is (node, iterator over its in-graph dependencies)
+        index_of[root] = lowlink[root] = len(index_of)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph[root]))]
+
+        while work:
+            node, deps = work[-1]
+
+            # Descend into the next unvisited dependency, if any
+            for dep in deps:
+                if dep not in graph:
+                    continue
+                if dep not in index_of:
+                    index_of[dep] = lowlink[dep] = len(index_of)
+                    stack.append(dep)
+                    on_stack.add(dep)
+                    work.append((dep, iter(graph[dep])))
+                    break
+                if dep in on_stack:
+                    lowlink[node] = min(lowlink[node], index_of[dep])
+            else:
+                # All dependencies done: pop the node, closing its component if it is a root
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+
+                    if len(component) > 1 or node in graph[node]:
+                        cycles.append(sorted(component))
+
+    return cycles
@@ -7,14 +7,76 @@ import argparse
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Optional
 
 # Storage client
-from dev.storage import get_s3_client
+from dev.storage import get_s3_client, list_bucket_names, record_bucket_deleted
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+#
+# Constants
+#
+
+# Maximum keys per DeleteObjects request (S3/MinIO limit)
+DELETE_BATCH_SIZE = 1000
+
+# Buckets emptied and deleted concurrently
+DROP_WORKERS = int(os.getenv("S3_DROP_WORKERS", "8"))
+
+#
+# Helper Functions
+#
+
+
+def delete_all_objects(client, bucket_name: str) -> list[dict[str, Any]]:
+    """
+    Delete every object in a bucket using batched DeleteObjects requests
+
+    @param client: boto3 S3 client
+    @param bucket_name (str): Bucket to empty
+    @returns list[dict] - Per-key errors reported by the server (empty on success)
+    """
+    errors = []
+
+    paginator = client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket_name):
+        keys = [{"Key": obj["Key"]} for obj in page.get("Contents", [])]
+
+        # Pages hold at most 1000 keys by default, but split in case MaxKeys is raised
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            response = client.delete_objects(
+                Bucket=bucket_name,
+                Delete={"Objects": keys[start : start + DELETE_BATCH_SIZE], "Quiet": True},
+            )
+            errors.extend(response.get("Errors", []))
+
+    return errors
+
+
+def drop_single_bucket(client, bucket_name: str) -> Optional[str]:
+    """
+    Empty a bucket and delete it
+
+    @param client: boto3 S3 client
+    @param bucket_name (str): Bucket to drop
+    @returns Optional[str] - Failure message if the bucket could not be emptied, else None
+    """
+
+    # Delete all objects first (a bucket must be empty before it can be deleted)
+    errors = delete_all_objects(client, bucket_name)
+    if errors:
+        logger.warning(f"Failed to empty bucket {bucket_name}: {errors[0]}")
+        return f"{len(errors)} object(s) could not be deleted"
+
+    # Delete the bucket
+    client.delete_bucket(Bucket=bucket_name)
+    record_bucket_deleted(client, bucket_name)
+    return None
+
+
 #
 # Handler Functions
 #
@@ -38,30 +100,33 @@ def drop_bucket(buckets: Optional[list[str]] = None) -> dict[str, Any]:
     client = get_s3_client(endpoint_url=endpoint_url)
 
     # Get existing buckets (single call instead of two)
-    list_response = client.list_buckets()
-    existing_buckets = {bucket["Name"] for bucket in list_response.get("Buckets", [])}
+    existing_buckets = list_bucket_names(client)
 
-    # Get buckets to drop
-    target_buckets = buckets if buckets is not None else list(existing_buckets)
+    # Get buckets to drop (requested ones that exist, else all; sorted for stable logs)
+    if buckets is None:
+        target_buckets = sorted(existing_buckets)
+    else:
+        target_buckets = [name for name in buckets if name in existing_buckets]
 
     if not target_buckets:
         return {"status": "success", "message": "No buckets to drop", "buckets_dropped": 0}
 
-    # Drop each bucket
-    dropped_count = 0
-    for bucket_name in target_buckets:
-        if bucket_name not in existing_buckets:
-            continue
-
-        # Delete all objects first
-        paginator = client.get_paginator("list_objects_v2")
-        for page in paginator.paginate(Bucket=bucket_name):
-            for obj in page.get("Contents", []):
-                client.delete_object(Bucket=bucket_name, Key=obj["Key"])
-
-        # Delete the bucket
-        client.delete_bucket(Bucket=bucket_name)
-        dropped_count += 1
+    # Drop buckets concurrently (each one is independent, IO-bound work)
+    workers = min(DROP_WORKERS, len(target_buckets))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(
+            executor.map(lambda name: drop_single_bucket(client, name), target_buckets)
+        )
+
+    failed_buckets = {
+        name: error for name, error in zip(target_buckets, results) if error is not None
+    }
+    dropped_count = len(target_buckets) - len(failed_buckets)
+
+    # Fail once every bucket was attempted, so a partial drop never reports success
+    if failed_buckets:
+        details = ", ".join(f"{name} ({error})" for name, error in failed_buckets.items())
+        raise RuntimeError(f"Failed to drop {len(failed_buckets)} bucket(s): {details}")
 
     logger.info(f"drop_bucket completed: {dropped_count} buckets dropped")
     return {
@@ -4,33 +4,64 @@
 
 # Standard library
 import argparse
+import functools
 import json
 import logging
+import re
 from typing import Any, Optional
 
 # Database
-from dev.db import execute_query
+from dev.db import execute_query, execute_script, execute_script_concurrently
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+#
+# Constants
+#
+
+# Identifiers that PostgreSQL accepts unquoted (lowercase, not starting with a digit)
+SAFE_IDENTIFIER_PATTERN = re.compile(r"[a-z_][a-z0-9_]*")
+
+# Keywords PostgreSQL reserves as table/column names (these need quotes despite the pattern)
+RESERVED_KEYWORDS = frozenset(
+    """
+    all analyse analyze and any array as asc asymmetric authorization binary both case cast
+    check collate collation column concurrently constraint create cross current_catalog
+    current_date current_role current_schema current_time current_timestamp current_user
+    default deferrable desc distinct do else end except false fetch for foreign freeze from
+    full grant group having ilike in initially inner intersect into is isnull join lateral
+    leading left like limit localtime localtimestamp natural not notnull null offset on
+    only or order outer overlaps placing primary references returning right select
+    session_user similar some symmetric system_user table tablesample then to trailing true
+    union unique user using variadic verbose when where window with
+    """.split()
+)
+
 #
 # Helper Functions
 #
 
 
+@functools.lru_cache(maxsize=1024)
 def quote_identifier(identifier: str) -> str:
-    """Quote a PostgreSQL identifier if needed"""
+    """Quote a PostgreSQL identifier if needed (embedded double quotes are escaped)"""
     if identifier.startswith('"') and identifier.endswith('"'):
         return identifier
 
-    needs_quote = (
-        identifier[0].isdigit()
-        or any(c.isupper() for c in identifier)
-        or not identifier.replace("_", "").isalnum()
-    )
+    if SAFE_IDENTIFIER_PATTERN.fullmatch(identifier) and identifier not in RESERVED_KEYWORDS:
+        return identifier
 
-    return f'"{identifier}"' if needs_quote else identifier
+    escaped = identifier.replace('"', '""')
+    return f'"{escaped}"'
+
+
+def quote_schema_table(table_name: str) -> str:
+    """Quote schema.table identifier"""
+    if "." in table_name:
+        schema, table = table_name.split(".", 1)
+        return f"{quote_identifier(schema)}.{quote_identifier(table)}"
+    return quote_identifier(table_name)
 
 
 #
@@ -55,18 +86,35 @@ def drop_table(schemas: Optional[list[str]] = None) -> dict[str, Any]:
         )
         schemas = [row[0] for row in result["rows"]]
 
-    # Drop each schema
-    for schema in schemas:
-        quoted_schema = quote_identifier(schema)
-        execute_query(f"DROP SCHEMA IF EXISTS {quoted_schema} CASCADE;")
+    # Drop schemas concurrently, each worker on its own pooled connection
+    # (identifiers can't be bound as parameters, so they are quoted client-side)
+    statements = [
+        f"DROP SCHEMA IF EXISTS {quote_identifier(schema)} CASCADE;" for schema in schemas
+    ]
+    failures = execute_script_concurrently(statements)
+
+    # Retry failures serially (cross-schema FKs can deadlock concurrent drops)
+    if failures:
+        retry_indexes = sorted(failures)
+        retry_failures = execute_script([statements[i] for i in retry_indexes])
+        failures = {retry_indexes[i]: error for i, error in retry_failures.items()}
 
-    logger.info(f"drop_table completed: {len(schemas)} schemas dropped")
-    return {
+    for index, error in failures.items():
+        logger.warning(f"Failed to drop schema {schemas[index]}: {error}")
+
+    schemas_dropped = len(schemas) - len(failures)
+
+    logger.info(f"drop_table completed: {schemas_dropped} schemas dropped")
+    response: dict[str, Any] = {
         "status": "success",
-        "message": f"Dropped {len(schemas)} schema(s)",
-        "schemas_dropped": len(schemas),
+        "message": f"Dropped {schemas_dropped} schema(s)",
+        "schemas_dropped": schemas_dropped,
     }
 
+    if failures:
+        response["failed_schemas"] = len(failures)
+
+    return response
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Drop database schemas")
@@ -13,6 +13,9 @@ from .create_all import create_all
 from .drop_all import drop_all
 from .seed_all import seed_all
 
+# Storage
+from dev.storage import bucket_cache
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -30,10 +33,11 @@ def reset_all() -> dict[str, Any]:
 
     logger.info("reset_all called")
 
-    # Drop, create, and seed all
-    drop_result = drop_all()
-    create_result = create_all()
-    seed_result = seed_all()
+    # Drop, create, and seed all (sharing one bucket listing across the steps)
+    with bucket_cache():
+        drop_result = drop_all()
+        create_result = create_all()
+        seed_result = seed_all()
 
     logger.info("reset_all completed successfully")
     return {
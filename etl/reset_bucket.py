@@ -12,6 +12,9 @@ from typing import Any
 from .drop_bucket import drop_bucket
 from .seed_bucket import seed_bucket
 
+# Storage
+from dev.storage import bucket_cache
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -29,11 +32,14 @@ def reset_bucket() -> dict[str, Any]:
 
     logger.info("reset_bucket called")
 
-    # Drop all buckets
-    drop_result = drop_bucket()
+    # Share one bucket listing across both steps
+    with bucket_cache():
+
+        # Drop all buckets
+        drop_result = drop_bucket()
 
-    # Seed all buckets
-    seed_result = seed_bucket()
+        # Seed all buckets
+        seed_result = seed_bucket()
 
     logger.info("reset_bucket completed successfully")
     return {
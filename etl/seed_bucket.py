@@ -8,14 +8,40 @@ import json
 import logging
 import mimetypes
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Optional
 
 # Storage client
-from dev.storage import get_s3_client
+from dev.storage import get_s3_client, list_bucket_names
+
+# Paths
+from dev.paths import walk_relative_files
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+#
+# Constants
+#
+
+# Concurrent uploads per bucket (boto3 clients are thread-safe for upload_file)
+UPLOAD_WORKERS = int(os.getenv("S3_UPLOAD_WORKERS", "16"))
+
+# Local bookkeeping files that are never uploaded
+IGNORED_FILES = {".DS_Store", ".objects", ".buckets", ".etags"}
+
+#
+# Helper Functions
+#
+
+
+def upload_file(client, file_path: str, bucket_name: str, object_key: str) -> None:
+    """Upload a single file with a content type detected from its extension"""
+    content_type, _ = mimetypes.guess_type(file_path)
+    extra_args = {"ContentType": content_type} if content_type else {}
+    client.upload_file(file_path, bucket_name, object_key, ExtraArgs=extra_args)
+
+
 #
 # Handler Functions
 #
@@ -43,8 +69,7 @@ def seed_bucket(buckets: Optional[list[str]] = None) -> dict[str, Any]:
     client = get_s3_client(endpoint_url=endpoint_url)
 
     # List buckets, apply filter if provided (skip non-existent buckets)
-    list_response = client.list_buckets()
-    existing_buckets = {bucket["Name"] for bucket in list_response.get("Buckets", [])}
+    existing_buckets = list_bucket_names(client)
     target_buckets = (
         [b for b in buckets if b in existing_buckets]
         if buckets is not None
@@ -57,6 +82,7 @@ def seed_bucket(buckets: Optional[list[str]] = None) -> dict[str, Any]:
     # Seed each bucket
     buckets_seeded = []
     total_files_uploaded = 0
+    failed_uploads: dict[str, str] = {}
 
     for bucket_name in target_buckets:
         uploaded_count = 0
@@ -66,24 +92,36 @@ def seed_bucket(buckets: Optional[list[str]] = None) -> dict[str, Any]:
         if not bucket_dir.exists():
             continue
 
-        for file_path in bucket_dir.rglob("*"):
-            if (
-                file_path.is_file()
-                and file_path.name != ".DS_Store"
-                and file_path.name != ".objects"
-                and file_path.name != ".buckets"
-            ):
-                relative_path = file_path.relative_to(bucket_dir)
-                object_key = str(relative_path).replace("\\", "/")
-                # Detect content type from file extension
-                content_type, _ = mimetypes.guess_type(str(file_path))
-                extra_args = {"ContentType": content_type} if content_type else {}
-                client.upload_file(str(file_path), bucket_name, object_key, ExtraArgs=extra_args)
-                uploaded_count += 1
+        # Collect (file, key) pairs up front, then upload them concurrently
+        uploads = [
+            (file_path, object_key)
+            for file_path, object_key in walk_relative_files(bucket_dir)
+            if os.path.basename(object_key) not in IGNORED_FILES
+        ]
+
+        with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+            futures = {
+                executor.submit(upload_file, client, file_path, bucket_name, object_key): object_key
+                for file_path, object_key in uploads
+            }
+            for future in as_completed(futures):
+                object_key = futures[future]
+                try:
+                    future.result()
+                    uploaded_count += 1
+                except Exception as e:
+                    failed_uploads[f"{bucket_name}/{object_key}"] = str(e)
+                    logger.warning(f"Failed to upload {bucket_name}/{object_key}: {e}")
 
         buckets_seeded.append({"bucket": bucket_name, "files_uploaded": uploaded_count})
         total_files_uploaded += uploaded_count
 
+    # Fail once every upload was attempted, so a partial seed never reports success
+    if failed_uploads:
+        raise RuntimeError(
+            f"Failed to upload {len(failed_uploads)} file(s): {', '.join(sorted(failed_uploads))}"
+        )
+
     logger.info(
         f"seed_bucket completed: {len(buckets_seeded)} buckets seeded, {total_files_uploaded} files uploaded"
     )
@@ -5,21 +5,56 @@
 # Standard library
 import argparse
 import csv
+import functools
+import io
 import json
 import logging
+import os
 import re
+import time
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
 # Database
-from dev.db import get_connection
+from dev.db import get_pooled_connection, map_with_connections
+
+# Identifier quoting
+from dev.etl.drop_tables import quote_schema_table
 
 # DAG
-from dev.etl.dependency_graph import build_dependency_graph, topological_sort
+from dev.etl.dependency_graph import parse_foreign_keys, topological_layers
+
+# Paths
+from dev.paths import LISTING_CACHE_MIN_AGE_NS, walk_files
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+#
+# Constants
+#
+
+# CREATE TABLE schema.table, "schema"."table" or a mix of quoted and bare parts
+CREATE_TABLE_PATTERN = re.compile(
+    r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?"
+    r'(?:(?:"([^"]+)"|([a-zA-Z_][a-zA-Z0-9_]*))\.)?'
+    r'(?:"([^"]+)"|([a-zA-Z_][a-zA-Z0-9_]*))',
+    re.IGNORECASE,
+)
+
+# SERIAL, SMALLSERIAL or BIGSERIAL anywhere in a create.sql file
+SERIAL_PATTERN = re.compile(r"SERIAL", re.IGNORECASE)
+
+# NULL marker in the normalized catalog CSV (keeps empty strings distinct from NULL)
+CATALOG_NULL = "\\N"
+
+# COPY into meta.catalog from the normalized CSV written by seed_catalog_files
+CATALOG_COPY_SQL = (
+    'COPY meta.catalog ("Table", "Column", "Order", "Type", "Nullable?", "Primary Key?", '
+    '"Foreign Key", "Description", "Sample Values") '
+    "FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+)
+
 #
 # Helper Functions
 #
@@ -27,102 +62,128 @@ logger = logging.getLogger(__name__)
 
 def find_seed_csv_files(base_path: str, usernames: Optional[list[str]] = None) -> list[str]:
     """Find all seed.csv files, excluding meta/catalog/seed.csv"""
-    base = Path(base_path)
     csv_files = []
 
-    # Search in specific usernames or all directories
-    search_dirs = [base / u for u in usernames] if usernames else [base]
+    # Search in specific usernames (each once) or all directories; listings are cached
+    # per directory by walk_files, so repeated scans only re-stat each directory
+    if usernames:
+        search_dirs = [os.path.join(base_path, u) for u in dict.fromkeys(usernames)]
+    else:
+        search_dirs = [base_path]
 
     for search_dir in search_dirs:
-        if search_dir.exists():
-            for csv_file in search_dir.rglob("seed.csv"):
-                if "meta/catalog/seed.csv" not in str(csv_file):
-                    csv_files.append(str(csv_file))
+        for csv_file in walk_files(search_dir, "seed.csv"):
+            if "meta/catalog/seed.csv" not in csv_file:
+                csv_files.append(csv_file)
 
     return csv_files
 
 
+def discover_seeds(
+    base_path: str, usernames: Optional[list[str]] = None
+) -> Iterator[tuple[str, str, str, bool, tuple[str, ...]]]:
+    """
+    Find seedable tables in one walk, reading each sibling create.sql once
+
+    @param base_path (str): Tables directory
+    @param usernames (Optional[list[str]]): Filter by specific usernames/schemas
+    @returns Iterator[tuple] - (csv path, create.sql path, table name, has SERIAL column,
+        FK dependency tables) for every seed.csv next to a create.sql that declares a table
+    """
+    for csv_file in find_seed_csv_files(base_path, usernames):
+        create_sql_path = os.path.join(os.path.dirname(csv_file), "create.sql")
+
+        # A missing or unparsable create.sql yields no table name
+        table_name, has_serial, dependencies = parse_create_sql(create_sql_path)
+        if table_name:
+            yield csv_file, create_sql_path, table_name, has_serial, dependencies
+
+
 def find_catalog_csv_files(base_path: str, schemas: Optional[list[str]] = None) -> list[str]:
     """Find all catalog.csv files in specified schemas"""
     if schemas is None:
         schemas = ["meta", "test00000000000000000000"]
 
-    base = Path(base_path)
     csv_files = []
 
-    for schema in schemas:
-        schema_dir = base / schema
-        if schema_dir.exists():
-            for csv_file in schema_dir.rglob("catalog.csv"):
-                csv_files.append(str(csv_file))
+    for schema in dict.fromkeys(schemas):
+        csv_files.extend(walk_files(os.path.join(base_path, schema), "catalog.csv"))
 
     return csv_files
 
 
-def extract_table_name_from_create_sql(create_sql_path: str) -> Optional[str]:
-    """Extract table name from create.sql file"""
-    try:
-        with open(create_sql_path) as f:
-            content = f.read()
-
-        # Match CREATE TABLE schema.table or "schema"."table"
-        match = re.search(
-            r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?"
-            r'(?:"([^"]+)"\.)?'
-            r'(?:"([^"]+)"|([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)*))',
-            content,
-            re.IGNORECASE,
-        )
+def table_name_from_sql(content: str) -> Optional[str]:
+    """Extract the schema.table name from the CREATE TABLE statement in SQL content"""
+    # Match CREATE TABLE schema.table, "schema"."table" or mixed (e.g. meta."order")
+    match = CREATE_TABLE_PATTERN.search(content)
 
-        if match:
-            schema = match.group(1)
-            quoted_table = match.group(2)
-            unquoted_table = match.group(3)
-            table_name = quoted_table or unquoted_table
+    if match:
+        quoted_schema, unquoted_schema, quoted_table, unquoted_table = match.groups()
+        schema = quoted_schema or unquoted_schema
+        table_name = quoted_table or unquoted_table
 
-            if schema and table_name:
-                return f"{schema}.{table_name}"
-            return table_name
+        if schema and table_name:
+            return f"{schema}.{table_name}"
+        return table_name
 
-        return None
-    except Exception:
-        return None
+    return None
 
 
-def quote_identifier(identifier: str) -> str:
-    """Quote a PostgreSQL identifier if needed"""
-    if identifier.startswith('"') and identifier.endswith('"'):
-        return identifier
+@functools.lru_cache(maxsize=4096)
+def _parse_create_sql_cached(
+    create_sql_path: str, mtime_ns: int, size: int
+) -> tuple[Optional[str], bool, tuple[str, ...]]:
+    """Read a create.sql once; cached per (path, mtime, size) so edits are picked up"""
+    with open(create_sql_path) as f:
+        content = f.read()
 
-    # Quote if starts with digit, has uppercase, or special chars
-    needs_quote = (
-        identifier[0].isdigit()
-        or any(c.isupper() for c in identifier)
-        or not identifier.replace("_", "").isalnum()
-    )
-
-    return f'"{identifier}"' if needs_quote else identifier
+    table_name = table_name_from_sql(content)
+    has_serial = SERIAL_PATTERN.search(content) is not None
+    dependencies = tuple(parse_foreign_keys(content, table_name=table_name)) if table_name else ()
 
+    return table_name, has_serial, dependencies
 
-def quote_schema_table(table_name: str) -> str:
-    """Quote schema.table identifier"""
-    if "." in table_name:
-        schema, table = table_name.split(".", 1)
-        return f"{quote_identifier(schema)}.{quote_identifier(table)}"
-    return quote_identifier(table_name)
 
+def parse_create_sql(create_sql_path: str) -> tuple[Optional[str], bool, tuple[str, ...]]:
+    """
+    Get the table name, SERIAL flag and FK dependencies of a create.sql file from a single read
 
-def has_serial_column(create_sql_path: str) -> bool:
-    """Check if create.sql contains SERIAL columns"""
+    @param create_sql_path (str): Path to a create.sql file
+    @returns tuple - (schema.table name or None, whether it has a SERIAL column,
+        referenced schema.table names)
+    """
     try:
-        with open(create_sql_path) as f:
-            return "SERIAL" in f.read().upper()
+        stat = os.stat(create_sql_path)
+        # A file this fresh could still change without moving its mtime, so skip the cache
+        if time.time_ns() - stat.st_mtime_ns < LISTING_CACHE_MIN_AGE_NS:
+            return _parse_create_sql_cached.__wrapped__(
+                create_sql_path, stat.st_mtime_ns, stat.st_size
+            )
+        return _parse_create_sql_cached(create_sql_path, stat.st_mtime_ns, stat.st_size)
     except Exception:
-        return False
+        return None, False, ()
+
+
+def extract_table_name_from_create_sql(create_sql_path: str) -> Optional[str]:
+    """Extract table name from create.sql file (cached per path, mtime and size)"""
+    return parse_create_sql(create_sql_path)[0]
+
+
+def has_serial_column(create_sql_path: str) -> bool:
+    """Check if create.sql contains SERIAL columns (cached per path, mtime and size)"""
+    return parse_create_sql(create_sql_path)[1]
+
 
+def reset_serial_sequence(
+    table_name: str, cursor, has_id_column: Optional[bool] = None
+) -> None:
+    """
+    Reset SERIAL sequence so nextval returns MAX(ID) + 1
 
-def reset_serial_sequence(table_name: str, cursor) -> None:
-    """Reset SERIAL sequence so nextval returns MAX(ID) + 1"""
+    @param table_name (str): schema.table name
+    @param cursor: Open database cursor
+    @param has_id_column (Optional[bool]): Whether the table has an "ID" column (looked up if None)
+    """
     # Parse schema and table (all tables use schema.table format)
     schema, table = table_name.split(".", 1)
     schema = schema.strip('"')
@@ -131,31 +192,143 @@ def reset_serial_sequence(table_name: str, cursor) -> None:
     quoted_table = f'"{schema}"."{table}"'
     sequence_name = f'"{schema}"."{table}_ID_seq"'
 
-    # Check if ID column exists
-    cursor.execute(
-        """
-        SELECT column_name FROM information_schema.columns
-        WHERE table_schema = %s AND table_name = %s AND column_name = 'ID'
-        """,
-        (schema, table),
-    )
+    # Check if ID column exists (skipped when the caller already knows)
+    if has_id_column is None:
+        cursor.execute(
+            """
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = %s AND table_name = %s AND column_name = 'ID'
+            """,
+            (schema, table),
+        )
+        has_id_column = cursor.fetchone() is not None
 
-    if cursor.fetchone() is None:
+    if not has_id_column:
         return
 
-    # Get max ID and reset sequence
+    # Get max ID and reset sequence in one round trip
     # setval(seq, val) sets last_value so nextval returns val + 1
-    cursor.execute(f'SELECT COALESCE(MAX("ID"), 0) AS max_id FROM {quoted_table}')
+    # MAX("ID") on a SERIAL primary key is answered from the index, not a table scan
+    cursor.execute(
+        f"SELECT setval('{sequence_name}', "
+        f'GREATEST(1, (SELECT COALESCE(MAX("ID"), 0) FROM {quoted_table}))) AS seq_val'
+    )
     result = cursor.fetchone()
-    max_id = result["max_id"] if result else 0
-    seq_val = max(1, max_id)
-
-    cursor.execute(f"SELECT setval('{sequence_name}', {seq_val})")
+    seq_val = result["seq_val"] if result else 1
     logger.info(f"Reset sequence {sequence_name} to {seq_val}")
 
 
+def find_tables_with_id_column(conn, schemas: set[str]) -> set[str]:
+    """
+    List the tables in the given schemas that have an "ID" column, in one catalog query
+
+    @param conn: Open database connection
+    @param schemas (set[str]): Schemas to search
+    @returns set[str] - schema.table names (unquoted)
+    """
+    if not schemas:
+        return set()
+
+    with conn.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT table_schema, table_name FROM information_schema.columns
+            WHERE column_name = 'ID' AND table_schema = ANY(%s)
+            """,
+            (sorted(schemas),),
+        )
+        rows = cursor.fetchall()
+    conn.commit()
+
+    return {f"{row['table_schema']}.{row['table_name']}" for row in rows}
+
+
+def seed_one_table(
+    conn, table_name: str, csv_file: str, reset_sequence: bool
+) -> Optional[str]:
+    """
+    Truncate a table and COPY its seed.csv into it as one transaction
+
+    @param conn: Open database connection (left usable on failure)
+    @param table_name (str): schema.table name
+    @param csv_file (str): Path to the table's seed.csv
+    @param reset_sequence (bool): Whether the table has a SERIAL "ID" sequence to reset
+    @returns Optional[str] - Error message, or None on success
+    """
+    try:
+        # TRUNCATE, COPY and sequence reset commit together as one transaction
+        quoted_table = quote_schema_table(table_name)
+        with conn.cursor() as cursor:
+            # Truncate table first to ensure clean seed (skipped when already empty, which
+            # avoids the ACCESS EXCLUSIVE lock cascading over every referencing table)
+            cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {quoted_table}) AS has_rows")
+            if cursor.fetchone()["has_rows"]:
+                cursor.execute(f"TRUNCATE {quoted_table} CASCADE")
+
+            # Import CSV using COPY (raw bytes; the server skips the header row)
+            with open(csv_file, "rb") as f:
+                options = "FORMAT csv, HEADER true, NULL ''"
+                cursor.copy_expert(f"COPY {quoted_table} FROM STDIN WITH ({options})", f)
+
+            # Reset SERIAL sequence if needed
+            if reset_sequence:
+                reset_serial_sequence(table_name, cursor, has_id_column=True)
+
+        conn.commit()
+        return None
+
+    except Exception as e:
+        # Undo this table only so the connection can seed the next one
+        conn.rollback()
+        return f"{table_name}: {str(e)}"
+
+
+def parse_catalog_row(row: list[str], columns: dict[str, int]) -> tuple:
+    """
+    Convert one catalog.csv row into a meta.catalog value tuple
+
+    @param row (list[str]): Row from csv.reader
+    @param columns (dict[str, int]): Header name -> position in row
+    @returns tuple - Values in meta.catalog column order
+    """
+
+    def field(name: str, default: Optional[str] = "") -> Optional[str]:
+        index = columns.get(name)
+        return row[index] if index is not None and index < len(row) else default
+
+    # Parse booleans
+    nullable_str = field("Nullable?").strip().upper()
+    nullable = True if nullable_str == "TRUE" else (False if nullable_str == "FALSE" else None)
+
+    pk_str = field("Primary Key?").strip().upper()
+    pk = True if pk_str == "TRUE" else (False if pk_str == "FALSE" else None)
+
+    # Parse other fields
+    order_val = int(field("Order", 0))
+    column_val = field("Column").strip()
+    column_val = None if column_val.upper() == "NULL" or column_val == "" else column_val
+    fk_val = field("Foreign Key").strip() or None
+
+    return (
+        field("Table", None),
+        column_val,
+        order_val,
+        field("Type", None),
+        nullable,
+        pk,
+        fk_val,
+        field("Description") or None,
+        field("Sample Values") or None,
+    )
+
+
 def seed_catalog_files(tables_dir: Path) -> int:
-    """Seed meta.catalog from catalog.csv files"""
+    """
+    Seed meta.catalog from catalog.csv files
+
+    @param tables_dir (Path): Tables directory to search for catalog.csv files
+    @returns int - Number of catalog files seeded
+    """
     catalog_files = find_catalog_csv_files(str(tables_dir))
     if not catalog_files:
         return 0
@@ -163,69 +336,42 @@ def seed_catalog_files(tables_dir: Path) -> int:
     # Sort for deterministic insertion order
     catalog_files.sort()
 
-    # Clear meta.catalog first (table always exists in normal operation)
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM meta.catalog")
-    conn.commit()
-    cursor.close()
-    conn.close()
-
+    # Normalize every file's rows into one in-memory CSV buffer
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
     catalogs_seeded = 0
 
     for catalog_file in catalog_files:
+        row_count = 0
         with open(catalog_file, newline="") as f:
-            rows = list(csv.DictReader(f))
-
-        if not rows:
-            continue
-
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        # Insert each row
-        insert_query = """
-            INSERT INTO meta.catalog
-            ("Table", "Column", "Order", "Type", "Nullable?", "Primary Key?",
-             "Foreign Key", "Description", "Sample Values")
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-
-        for row in rows:
-            # Parse booleans
-            nullable_str = row.get("Nullable?", "").strip().upper()
-            nullable = (
-                True if nullable_str == "TRUE" else (False if nullable_str == "FALSE" else None)
-            )
+            reader = csv.reader(f)
+            header = next(reader, [])
+            columns = {name: index for index, name in enumerate(header)}
 
-            pk_str = row.get("Primary Key?", "").strip().upper()
-            pk = True if pk_str == "TRUE" else (False if pk_str == "FALSE" else None)
-
-            # Parse other fields
-            order_val = int(row.get("Order", 0))
-            column_val = row.get("Column", "").strip()
-            column_val = None if column_val.upper() == "NULL" or column_val == "" else column_val
-            fk_val = row.get("Foreign Key", "").strip() or None
-
-            cursor.execute(
-                insert_query,
-                (
-                    row.get("Table"),
-                    column_val,
-                    order_val,
-                    row.get("Type"),
-                    nullable,
-                    pk,
-                    fk_val,
-                    row.get("Description") or None,
-                    row.get("Sample Values") or None,
-                ),
-            )
+            for row in reader:
+                # Skip blank lines, as DictReader did
+                if not row:
+                    continue
 
+                values = parse_catalog_row(row, columns)
+                writer.writerow([CATALOG_NULL if v is None else v for v in values])
+                row_count += 1
+
+        if row_count:
+            catalogs_seeded += 1
+
+    with get_pooled_connection() as conn:
+        with conn.cursor() as cursor:
+            # Clear meta.catalog first (table always exists in normal operation)
+            cursor.execute("DELETE FROM meta.catalog")
+
+            # Load every catalog in a single COPY
+            if catalogs_seeded:
+                buffer.seek(0)
+                cursor.copy_expert(CATALOG_COPY_SQL, buffer)
+
+        # Commit the DELETE and the COPY together
         conn.commit()
-        cursor.close()
-        conn.close()
-        catalogs_seeded += 1
 
     return catalogs_seeded
 
@@ -248,76 +394,70 @@ def seed_table(usernames: Optional[list[str]] = None) -> dict[str, Any]:
     from dev.paths import TABLES_DIR
     tables_dir = TABLES_DIR
 
-    # Find seed.csv files
-    csv_files = find_seed_csv_files(str(tables_dir), usernames if usernames else None)
-
-    # Build table_name -> csv_file mapping and collect create.sql paths
+    # Find seed.csv files and build the dependency graph in a single pass
+    # (built from seedable tables only, so every node has a seed.csv)
     csv_by_table: dict[str, str] = {}
-    create_sql_paths: list[str] = []
-    for csv_file in csv_files:
-        csv_path = Path(csv_file)
-        create_sql_path = csv_path.parent / "create.sql"
-        if not create_sql_path.exists():
-            continue
-
-        table_name = extract_table_name_from_create_sql(str(create_sql_path))
-        if table_name:
-            csv_by_table[table_name] = csv_file
-            create_sql_paths.append(str(create_sql_path))
-
-    # Build dependency graph and get topological order
-    graph, _ = build_dependency_graph(create_sql_paths, extract_table_name_from_create_sql)
-    ordered = topological_sort(graph)
-
-    # Tables in the graph that have csv files, plus any csv tables not in the graph
-    ordered_tables = [name for name in ordered if name in csv_by_table]
-    unordered_tables = [name for name in csv_by_table if name not in set(ordered_tables)]
+    serial_tables: set[str] = set()
+    graph: dict[str, set[str]] = {}
+    for csv_file, _, table_name, has_serial, dependencies in discover_seeds(
+        str(tables_dir), usernames if usernames else None
+    ):
+        csv_by_table[table_name] = csv_file
+        graph[table_name] = set(dependencies)
+        if has_serial:
+            serial_tables.add(table_name)
+
+    # Split the graph into layers of mutually independent tables
+    layers = topological_layers(graph)
+
+    # Tables left out of the layers (FK cycles) keep their discovery order
+    layered_tables = {name for layer in layers for name in layer}
+    unordered_tables = [name for name in csv_by_table if name not in layered_tables]
+
+    # Find which SERIAL tables have an "ID" sequence with one query instead of one per table
+    serial_schemas = {name.split(".", 1)[0] for name in serial_tables if "." in name}
+    id_tables: set[str] = set()
+    if serial_schemas:
+        with get_pooled_connection() as conn:
+            id_tables = find_tables_with_id_column(conn, serial_schemas)
+    sequence_tables = serial_tables & id_tables
 
     # Track progress
     failed_tables: dict[str, str] = {}
-    total_seeded = 0
-
-    # Single pass: seed each table in dependency order
-    for table_name in ordered_tables + unordered_tables:
-        csv_file = csv_by_table[table_name]
-        create_sql_path = str(Path(csv_file).parent / "create.sql")
-
-        try:
-            # Import CSV using COPY
-            quoted_table = quote_schema_table(table_name)
-            conn = get_connection()
-            cursor = conn.cursor()
-
-            # Truncate table first to ensure clean seed
-            cursor.execute(f"TRUNCATE {quoted_table} CASCADE")
-            conn.commit()
-
-            with open(csv_file) as f:
-                next(f)  # Skip header
-                cursor.copy_expert(
-                    f"COPY {quoted_table} FROM STDIN WITH (FORMAT csv, HEADER false, NULL '')",
-                    f,
-                )
-
-            conn.commit()
-            cursor.close()
-            conn.close()
 
-            # Reset SERIAL sequence if needed
-            if has_serial_column(create_sql_path):
-                reset_conn = get_connection()
-                reset_cursor = reset_conn.cursor()
-                reset_serial_sequence(table_name, reset_cursor)
-                reset_conn.commit()
-                reset_cursor.close()
-                reset_conn.close()
-
-            total_seeded += 1
-            failed_tables.pop(table_name, None)
-
-        except Exception as e:
-            failed_tables[table_name] = f"{table_name}: {str(e)}"
-            logger.warning(f"Failed to seed {table_name}: {e}")
+    def seed(conn, table_name: str) -> Optional[str]:
+        return seed_one_table(
+            conn, table_name, csv_by_table[table_name], table_name in sequence_tables
+        )
+
+    def seed_serially(table_names: list[str]) -> None:
+        with get_pooled_connection() as conn:
+            for table_name in table_names:
+                error = seed(conn, table_name)
+                if error is None:
+                    failed_tables.pop(table_name, None)
+                else:
+                    failed_tables[table_name] = error
+                    logger.warning(f"Failed to seed {error}")
+
+    # Seed each layer concurrently; a layer only starts once the previous one finished
+    for layer in layers:
+        layer_failures = [
+            table_name
+            for table_name, error in zip(layer, map_with_connections(seed, layer))
+            if error is not None
+        ]
+
+        # Retry failures (e.g. deadlocks between cascading TRUNCATEs) one at a time before
+        # the next layer, so a late TRUNCATE ... CASCADE can't wipe already seeded children
+        if layer_failures:
+            seed_serially(layer_failures)
+
+    # Tables outside the graph (cycles) go last, one at a time
+    if unordered_tables:
+        seed_serially(unordered_tables)
+
+    total_seeded = len(csv_by_table) - len(failed_tables)
 
     # Seed catalog files
     catalogs_seeded = seed_catalog_files(tables_dir)
@@ -4,18 +4,34 @@
 
 # Standard library
 import argparse
+import hashlib
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any, Optional
 
 # Storage client
-from dev.storage import get_s3_client
+from dev.storage import get_s3_client, list_bucket_names
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+#
+# Constants
+#
+
+# Local bookkeeping files that never correspond to MinIO objects
+SYSTEM_FILES = {".objects", ".buckets", ".etags", ".DS_Store"}
+
+# Per-bucket manifests of the MinIO ETag each local file was last synced from
+# (in paths.CACHE_DIR; .etags stays in SYSTEM_FILES for manifests left by older versions)
+ETAGS_DIR = "etags"
+
+# Concurrent downloads per bucket (boto3 clients are thread-safe for download_file)
+DOWNLOAD_WORKERS = int(os.getenv("S3_DOWNLOAD_WORKERS", "16"))
+
 #
 # Helper Functions
 #
@@ -51,17 +67,58 @@ def save_objects_file(directory: Path, filenames: set[str]):
             f.write(f"{filename}\n")
 
 
-def get_local_files(bucket_dir: Path) -> set[str]:
-    """Get all local files for a bucket (excluding system files)"""
-    if not bucket_dir.exists():
-        return set()
+def get_etags_path(bucket_name: str) -> Path:
+    """Get the path to a bucket's ETag manifest"""
+    import dev.paths as paths
+    return paths.CACHE_DIR / ETAGS_DIR / f"{bucket_name}.json"
+
+
+def load_etags(bucket_name: str) -> dict[str, str]:
+    """Load the bucket's ETag manifest (empty if missing or unreadable)"""
+    try:
+        with open(get_etags_path(bucket_name)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_etags(bucket_name: str, etags: dict[str, str]):
+    """Save the bucket's ETag manifest"""
+    etags_path = get_etags_path(bucket_name)
+    etags_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(etags_path, "w") as f:
+        json.dump(etags, f, indent=2, sort_keys=True)
+        f.write("\n")
 
-    local_files = set()
-    for file_path in bucket_dir.rglob("*"):
-        if file_path.is_file() and file_path.name not in [".objects", ".buckets", ".DS_Store"]:
-            relative_path = file_path.relative_to(bucket_dir)
-            local_files.add(str(relative_path))
-    return local_files
+
+def file_md5(file_path: Path) -> str:
+    """Hex MD5 of a local file (the ETag of a single-part upload)"""
+    digest = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_local_file_sizes(bucket_dir: Path) -> dict[str, int]:
+    """Get the size of every local file in a bucket by relative path (excluding system files)"""
+    local_sizes = {}
+
+    # One os.scandir() per directory; DirEntry caches the stat so each file costs one call
+    stack = [(str(bucket_dir), "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, f"{prefix}{entry.name}/"))
+                    elif entry.is_file() and entry.name not in SYSTEM_FILES:
+                        local_sizes[f"{prefix}{entry.name}"] = entry.stat().st_size
+        except OSError:
+            continue
+
+    return local_sizes
 
 
 #
@@ -90,8 +147,7 @@ def snapshot_bucket(buckets: Optional[list[str]] = None) -> dict[str, Any]:
     client = get_s3_client(endpoint_url=endpoint_url)
 
     # List all buckets, apply filter if provided (skip non-existent buckets)
-    list_response = client.list_buckets()
-    existing_buckets = {bucket["Name"] for bucket in list_response.get("Buckets", [])}
+    existing_buckets = list_bucket_names(client)
 
     target_buckets = (
         [b for b in buckets if b in existing_buckets]
@@ -107,6 +163,7 @@ def snapshot_bucket(buckets: Optional[list[str]] = None) -> dict[str, Any]:
     total_deleted = 0
     buckets_snapshotted = []
     all_usernames = set()
+    failed_downloads: dict[str, str] = {}
 
     # Process each bucket
     for bucket_name in target_buckets:
@@ -116,54 +173,84 @@ def snapshot_bucket(buckets: Optional[list[str]] = None) -> dict[str, Any]:
         paginator = client.get_paginator("list_objects_v2")
         for page in paginator.paginate(Bucket=bucket_name):
             for obj in page.get("Contents", []):
-                minio_objects[obj["Key"]] = obj.get("Size", 0)
+                minio_objects[obj["Key"]] = (obj.get("Size", 0), obj.get("ETag", "").strip('"'))
 
         bucket_dir = buckets_dir / bucket_name
-        local_files = get_local_files(bucket_dir)
-        minio_keys = set(minio_objects.keys())
-        directory_files: dict[Path, set[str]] = {}
+        local_sizes = get_local_file_sizes(bucket_dir)
+        known_etags = load_etags(bucket_name)
+        synced_etags: dict[str, str] = {}
+        directory_files: dict[str, set[str]] = {}
         bucket_downloaded = 0
         bucket_deleted = 0
-
-        # Download missing or changed files
-        for object_key in minio_keys:
+        downloads: list[tuple[str, Path]] = []
+
+        # Find missing or changed files
+        for object_key, (minio_size, etag) in minio_objects.items():
+            # Track file in its parent directory ("" is the bucket directory itself)
+            directory, _, filename = object_key.rpartition("/")
+            directory_files.setdefault(directory, set()).add(filename)
+
+            # Track every intermediate directory up to bucket_dir, stopping at the first
+            # one already recorded (its ancestors were recorded along with it)
+            while directory:
+                parent, _, directory_name = directory.rpartition("/")
+                siblings = directory_files.setdefault(parent, set())
+                if directory_name in siblings:
+                    break
+                siblings.add(directory_name)
+                directory = parent
+
+            # Download if missing (no local size), size differs or content changed
             local_path = bucket_dir / object_key
-            minio_size = minio_objects[object_key]
-
-            # Track file in its parent directory
-            if local_path.parent not in directory_files:
-                directory_files[local_path.parent] = set()
-            directory_files[local_path.parent].add(local_path.name)
-
-            # Track every intermediate directory up to bucket_dir
-            current = local_path.parent
-            while current != bucket_dir:
-                parent = current.parent
-                if parent not in directory_files:
-                    directory_files[parent] = set()
-                directory_files[parent].add(current.name)
-                current = parent
-
-            # Download if missing or size differs
-            should_download = not local_path.exists()
-            if local_path.exists() and local_path.stat().st_size != minio_size:
-                should_download = True
-
-            if should_download:
-                local_path.parent.mkdir(parents=True, exist_ok=True)
-                client.download_file(bucket_name, object_key, str(local_path))
-                bucket_downloaded += 1
+            if local_sizes.get(object_key) != minio_size:
+                downloads.append((object_key, local_path))
+            elif not etag or known_etags.get(object_key) == etag:
+                synced_etags[object_key] = etag
+            elif object_key in known_etags:
+                downloads.append((object_key, local_path))
+            elif "-" in etag or file_md5(local_path) == etag:
+                # Unknown file: verify by MD5 (multipart ETags aren't MD5s, so trust size)
+                synced_etags[object_key] = etag
+            else:
+                downloads.append((object_key, local_path))
+
+        # Create parent directories up front so download threads never race on mkdir
+        for parent in {local_path.parent for _, local_path in downloads}:
+            parent.mkdir(parents=True, exist_ok=True)
+
+        # Download concurrently
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            futures = {
+                executor.submit(
+                    client.download_file, bucket_name, object_key, str(local_path)
+                ): object_key
+                for object_key, local_path in downloads
+            }
+            for future in as_completed(futures):
+                object_key = futures[future]
+                try:
+                    future.result()
+                    bucket_downloaded += 1
+                    synced_etags[object_key] = minio_objects[object_key][1]
+                except Exception as e:
+                    failed_downloads[f"{bucket_name}/{object_key}"] = str(e)
+                    logger.warning(f"Failed to download {bucket_name}/{object_key}: {e}")
+
+        # Record the ETag of every file now in sync with MinIO
+        if synced_etags or known_etags:
+            save_etags(bucket_name, synced_etags)
 
         # Update .objects files at every directory level
         for directory, filenames in directory_files.items():
-            save_objects_file(directory, filenames)
+            save_objects_file(bucket_dir / directory, filenames)
 
         # Delete files not in MinIO
-        for object_key in local_files - minio_keys:
-            local_path = bucket_dir / object_key
-            if local_path.exists():
-                local_path.unlink()
+        for object_key in local_sizes.keys() - minio_objects.keys():
+            try:
+                (bucket_dir / object_key).unlink()
                 bucket_deleted += 1
+            except FileNotFoundError:
+                pass
 
         all_usernames.add(bucket_name)
 
@@ -180,6 +267,13 @@ def snapshot_bucket(buckets: Optional[list[str]] = None) -> dict[str, Any]:
     # Update .buckets file (merges with existing so filtered snapshots are safe)
     save_buckets_file(buckets_dir, all_usernames)
 
+    # Fail once every bucket was synced, so a partial snapshot never reports success
+    if failed_downloads:
+        raise RuntimeError(
+            f"Failed to download {len(failed_downloads)} object(s): "
+            f"{', '.join(sorted(failed_downloads))}"
+        )
+
     logger.info(
         f"snapshot_bucket completed: {total_downloaded} downloaded, {total_deleted} deleted"
     )
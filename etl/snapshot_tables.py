@@ -5,19 +5,129 @@
 # Standard library
 import argparse
 import csv
+import io
+import itertools
 import json
 import logging
+import os
 import re
 from collections import defaultdict
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional, Union
 
 # Database functions
-from dev.db import execute_query
+from dev.db import execute_query, map_with_connections
+
+# Identifier quoting and create.sql parsing
+from dev.etl.drop_tables import quote_identifier, quote_schema_table
+from dev.etl.seed_tables import table_name_from_sql
+
+# Paths
+from dev.paths import walk_files
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+#
+# Constants
+#
+
+# Characters dropped from Mermaid identifiers (\W keeps exactly str.isalnum() plus "_")
+NON_IDENTIFIER_PATTERN = re.compile(r"\W")
+
+# Bytes read from the top of a create.sql before falling back to the whole file
+# (generated files put CREATE TABLE within the first few lines)
+CREATE_SQL_PREFIX_BYTES = 2048
+
+# Manifest of the table version each seed.csv was last exported from (in paths.CACHE_DIR)
+VERSIONS_FILE = "snapshot_versions.json"
+
+# Per-table content version: row count, newest row xmin (changes on every insert/update),
+# relfilenode (changes on TRUNCATE/rewrite) and the column list (changes on DDL).
+# One subquery per table is combined with UNION ALL so all tables cost one round trip
+TABLE_VERSION_SQL = (
+    "SELECT {index} AS i, md5(concat_ws('|', count(*), max(xmin::text::bigint), "
+    "pg_relation_filenode(%s::regclass), "
+    "(SELECT string_agg(attname || ':' || atttypid, ',' ORDER BY attnum) FROM pg_attribute "
+    "WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped))) AS version "
+    "FROM {table}"
+)
+
+# Write buffer for exported seed.csv and catalog.csv files (fewer write syscalls than 8 KiB)
+EXPORT_BUFFER_SIZE = 1 << 20
+
+# Columns ("c"), primary key ("p"), single-column unique ("u") and foreign key ("f") rows
+# for every requested (schema, table) pair, tagged by kind so all lookups for all tables
+# share a single round trip. Reads pg_catalog directly: the information_schema views are
+# evaluated row by row on every call. Column payloads keep the information_schema shape
+# (data_type, udt_name, is_nullable, ...) with type modifiers decoded from atttypmod;
+# like column_default, generated columns report no default expression.
+# The target pairs arrive as two array parameters and are unnested, so the statement text
+# (and its parse/plan cost) is the same for 1 table or 1000, unlike an inlined VALUES list
+TABLE_METADATA_QUERY = """
+    WITH targets AS (
+        SELECT c.oid, n.nspname::text AS table_schema, c.relname::text AS table_name
+        FROM unnest(%(schemas)s::text[], %(tables)s::text[]) AS t(table_schema, table_name)
+        JOIN pg_namespace n ON n.nspname = t.table_schema
+        JOIN pg_class c ON c.relnamespace = n.oid AND c.relname = t.table_name
+    ),
+    table_columns AS (
+        SELECT 'c'::text AS kind, t.table_schema, t.table_name, a.attnum::bigint AS ord,
+               jsonb_build_array(
+                   a.attname,
+                   format_type(a.atttypid, NULL),
+                   ty.typname,
+                   CASE WHEN a.attnotnull THEN 'NO' ELSE 'YES' END,
+                   pg_get_expr(d.adbin, d.adrelid),
+                   CASE WHEN a.atttypid IN (1042, 1043) AND a.atttypmod > 0
+                        THEN a.atttypmod - 4 END,
+                   CASE WHEN a.atttypid = 1700 AND a.atttypmod > 0
+                        THEN ((a.atttypmod - 4) >> 16) & 65535 END,
+                   CASE WHEN a.atttypid = 1700 AND a.atttypmod > 0
+                        THEN (a.atttypmod - 4) & 65535 END
+               ) AS payload
+        FROM targets t
+        JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum > 0 AND NOT a.attisdropped
+        JOIN pg_type ty ON ty.oid = a.atttypid
+        LEFT JOIN pg_attrdef d
+               ON d.adrelid = a.attrelid AND d.adnum = a.attnum AND a.attgenerated = ''
+    ),
+    keys AS (
+        SELECT CASE con.contype WHEN 'p' THEN 'p' ELSE 'u' END AS kind,
+               t.table_schema, t.table_name, k.ord AS ord,
+               jsonb_build_array(a.attname) AS payload
+        FROM targets t
+        JOIN pg_constraint con ON con.conrelid = t.oid
+        CROSS JOIN LATERAL unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+        JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum
+        WHERE con.contype = 'p' OR (con.contype = 'u' AND cardinality(con.conkey) = 1)
+    ),
+    fks AS (
+        SELECT 'f'::text AS kind, t.table_schema, t.table_name,
+               row_number() OVER (ORDER BY con.conname, cols.ord) AS ord,
+               jsonb_build_array(
+                   a_src.attname, n_ref.nspname, c_ref.relname, a_ref.attname
+               ) AS payload
+        FROM targets t
+        JOIN pg_constraint con ON con.conrelid = t.oid AND con.contype = 'f'
+        JOIN pg_class c_ref ON con.confrelid = c_ref.oid
+        JOIN pg_namespace n_ref ON c_ref.relnamespace = n_ref.oid
+        CROSS JOIN LATERAL unnest(con.conkey, con.confkey)
+            WITH ORDINALITY AS cols(src_attnum, ref_attnum, ord)
+        JOIN pg_attribute a_src ON a_src.attrelid = t.oid AND a_src.attnum = cols.src_attnum
+        JOIN pg_attribute a_ref ON a_ref.attrelid = c_ref.oid AND a_ref.attnum = cols.ref_attnum
+    )
+    SELECT kind, table_schema, table_name, payload FROM (
+        SELECT * FROM table_columns
+        UNION ALL SELECT * FROM keys
+        UNION ALL SELECT * FROM fks
+    ) metadata
+    ORDER BY kind, ord;
+"""
+
+# Discriminator values in TABLE_METADATA_QUERY and the metadata keys they map to
+METADATA_KINDS = {"c": "columns", "p": "pk", "u": "uniques", "f": "fks"}
+
 #
 # Helper Functions
 #
@@ -25,8 +135,7 @@ logger = logging.getLogger(__name__)
 
 def sanitize_name(name: str) -> str:
     """Convert names with spaces/special chars to valid Mermaid identifiers"""
-    sanitized = name.replace(" ", "_")
-    return "".join(c if c.isalnum() or c == "_" else "" for c in sanitized)
+    return NON_IDENTIFIER_PATTERN.sub("", name.replace(" ", "_"))
 
 
 def format_column_type(col: dict[str, Any]) -> str:
@@ -39,56 +148,79 @@ def format_column_type(col: dict[str, Any]) -> str:
     return col_type
 
 
+def write_entity_definition(
+    write: Callable[[str], Any], schema: str, table: str, columns: list[dict[str, Any]]
+):
+    """Write a Mermaid entity definition, one newline-terminated line per write"""
+    write(f"    {schema}_{table} {{\n")
+    for col in columns:
+        write(f"        {format_column_type(col)} {sanitize_name(col['name'])}\n")
+    write("    }\n")
+
+
 def generate_entity_definition(schema: str, table: str, columns: list[dict[str, Any]]) -> str:
     """Generate Mermaid entity definition"""
-    entity_name = f"{schema}_{table}"
-    lines = [f"    {entity_name} {{"]
-    for col in columns:
-        col_name = sanitize_name(col["name"])
-        col_type = format_column_type(col)
-        lines.append(f"        {col_type} {col_name}")
-    lines.append("    }")
-    return "\n".join(lines)
+    buf = io.StringIO()
+    write_entity_definition(buf.write, schema, table, columns)
+    return buf.getvalue()[:-1]
 
 
-def parse_catalog_csv(catalog_path: Path) -> Optional[dict[str, Any]]:
+def parse_catalog_csv(catalog_path: Union[str, Path]) -> Optional[dict[str, Any]]:
     """Parse catalog.csv to extract table definition"""
     with open(catalog_path, newline="") as f:
-        rows = list(csv.DictReader(f))
-
-    if not rows:
-        return None
-
-    # First row (Order=0) contains table name
-    table_full_name = rows[0].get("Table", "")
-    if not table_full_name or "." not in table_full_name:
-        return None
-
-    schema, table_name = table_full_name.split(".", 1)
-
-    columns = []
-    primary_keys = []
-    foreign_keys_map = {}
+        reader = csv.reader(f)
+        header = next(reader, [])
+
+        # Header name -> position; columns missing from the header point at a padding slot
+        width = len(header)
+        index = {name: i for i, name in enumerate(header)}
+        table_i = index.get("Table", width)
+        column_i = index.get("Column", width)
+        order_i = index.get("Order", width)
+        type_i = index.get("Type", width)
+        pk_i = index.get("Primary Key?", width)
+        fk_i = index.get("Foreign Key", width)
+        has_order = order_i < width
+        padding = [""] * (width + 1)
+
+        # First row (Order=0) contains table name; csv.reader yields [] for blank lines
+        first = next((row for row in reader if row), None)
+        if first is None:
+            return None
+        first.extend(padding[len(first) :])
+
+        table_full_name = first[table_i]
+        if not table_full_name or "." not in table_full_name:
+            return None
+
+        schema, table_name = table_full_name.split(".", 1)
+
+        columns = []
+        primary_keys = []
+        foreign_keys_map = {}
+
+        # Parse column rows (Order >= 1) as they are read
+        for row in itertools.chain((first,), reader):
+            if not row:
+                continue
+            row.extend(padding[len(row) :])
 
-    # Parse column rows (Order >= 1)
-    for row in rows:
-        if row.get("Order", "0") == "0":
-            continue
+            if not has_order or row[order_i] == "0":
+                continue
 
-        col_name = row.get("Column", "")
-        col_type = row.get("Type", "TEXT")
+            col_name = row[column_i]
+            col_type = row[type_i] if type_i < width else "TEXT"
 
-        # Parse Primary Key
-        pk_str = row.get("Primary Key?", "").strip().upper()
-        if pk_str == "TRUE":
-            primary_keys.append(col_name)
+            # Parse Primary Key
+            if row[pk_i].strip().upper() == "TRUE":
+                primary_keys.append(col_name)
 
-        # Parse Foreign Key (format: schema.table.column)
-        fk_str = row.get("Foreign Key", "").strip()
-        if fk_str:
-            foreign_keys_map[col_name] = fk_str
+            # Parse Foreign Key (format: schema.table.column)
+            fk_str = row[fk_i].strip()
+            if fk_str:
+                foreign_keys_map[col_name] = fk_str
 
-        columns.append({"name": col_name, "type": col_type})
+            columns.append({"name": col_name, "type": col_type})
 
     # Build foreign_keys list
     foreign_keys = []
@@ -121,11 +253,7 @@ def load_schema_tables_from_catalogs(tables_dir: Path, schemas: list[str]) -> di
     schema_tables = {schema: [] for schema in schemas}
 
     for schema in schemas:
-        schema_dir = tables_dir / schema
-        if not schema_dir.exists():
-            continue
-
-        for catalog_path in schema_dir.rglob("catalog.csv"):
+        for catalog_path in walk_files(tables_dir / schema, "catalog.csv"):
             table_def = parse_catalog_csv(catalog_path)
             if table_def and table_def.get("schema") == schema:
                 schema_tables[schema].append(table_def)
@@ -135,14 +263,14 @@ def load_schema_tables_from_catalogs(tables_dir: Path, schemas: list[str]) -> di
 
 def generate_er_diagram(schema_tables: dict[str, list[dict]]) -> str:
     """Generate Mermaid ER diagram from table definitions"""
-    lines = ["erDiagram", ""]
+    buf = io.StringIO()
+    write = buf.write
+    write("erDiagram\n\n")
     all_tables = {}
-    relationship_keys = set()
 
     # Generate entity definitions
     for schema, tables in schema_tables.items():
-        lines.append(f"    %% {schema.capitalize()} Schema")
-        lines.append("")
+        write(f"    %% {schema.capitalize()} Schema\n\n")
 
         for table_def in tables:
             schema_name = table_def.get("schema", schema)
@@ -152,9 +280,8 @@ def generate_er_diagram(schema_tables: dict[str, list[dict]]) -> str:
             if not table_name:
                 continue
 
-            entity_def = generate_entity_definition(schema_name, table_name, columns)
-            lines.append(entity_def)
-            lines.append("")
+            write_entity_definition(write, schema_name, table_name, columns)
+            write("\n")
 
             full_table_name = f"{schema_name}_{table_name}"
             all_tables[full_table_name] = {
@@ -165,89 +292,62 @@ def generate_er_diagram(schema_tables: dict[str, list[dict]]) -> str:
             }
 
     # Generate relationships
-    lines.append("    %% Relationships")
-    lines.append("")
+    write("    %% Relationships\n\n")
 
-    for full_table_name, table_info in all_tables.items():
-        for fk in table_info.get("foreign_keys", []):
-            ref_schema = fk["references"].get("schema")
-            ref_table = fk["references"].get("table")
-            fk_cols = fk.get("columns", [])
+    # Index primary keys once so each FK costs one lookup
+    pk_by_table = {name: set(info["primary_keys"]) for name, info in all_tables.items()}
 
+    # (source, target, label) -> cardinality; the first FK for a key wins
+    edges = {}
+    for full_table_name, table_info in all_tables.items():
+        for fk in table_info["foreign_keys"]:
+            references = fk["references"]
+            ref_table = references.get("table")
             if not ref_table:
                 continue
 
-            ref_full_name = (
-                f"{ref_schema}_{ref_table}" if ref_schema else f"{table_info['schema']}_{ref_table}"
-            )
-
-            if ref_full_name not in all_tables:
+            ref_full_name = f"{references.get('schema') or table_info['schema']}_{ref_table}"
+            ref_primary_keys = pk_by_table.get(ref_full_name)
+            if ref_primary_keys is None:
                 continue
 
+            fk_cols = fk.get("columns")
             label = fk_cols[0] if fk_cols else "references"
-            ref_primary_keys = all_tables[ref_full_name].get("primary_keys", [])
-            ref_cols = fk["references"].get("columns", [])
-            is_primary = len(ref_cols) > 0 and ref_cols[0] in ref_primary_keys
+            ref_cols = references.get("columns")
+            is_primary = bool(ref_cols) and ref_cols[0] in ref_primary_keys
             cardinality = "||--o{" if is_primary else "}o--||"
 
-            relationship_key = (full_table_name, ref_full_name, label)
-            if relationship_key not in relationship_keys:
-                relationship_keys.add(relationship_key)
-                lines.append(f'    {full_table_name} {cardinality} {ref_full_name} : "{label}"')
+            edges.setdefault((full_table_name, ref_full_name, label), cardinality)
+
+    for (source, target, label), cardinality in edges.items():
+        write(f'    {source} {cardinality} {target} : "{label}"\n')
 
-    return "\n".join(lines)
+    # Drop the final newline (the diagram is newline-joined, not newline-terminated)
+    return buf.getvalue()[:-1]
 
 
 def extract_table_name(sql_file: str) -> Optional[str]:
     """Extract table name from create.sql file"""
-    with open(sql_file) as f:
-        content = f.read()
-
-    match = re.search(
-        r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?"
-        r'(?:"([^"]+)"\.)?'
-        r'(?:"([^"]+)"|([a-zA-Z_][a-zA-Z0-9_]*(?:\.[a-zA-Z_][a-zA-Z0-9_]*)*))',
-        content,
-        re.IGNORECASE,
-    )
-
-    if match:
-        schema = match.group(1)
-        quoted_table = match.group(2)
-        unquoted_table = match.group(3)
-        table_name = quoted_table or unquoted_table
+    with open(sql_file, "rb") as f:
+        content = f.read(CREATE_SQL_PREFIX_BYTES)
+        truncated = len(content) == CREATE_SQL_PREFIX_BYTES
 
-        if schema and table_name:
-            return f"{schema}.{table_name}"
-        return table_name
+        # Only search complete lines so a name cut off by the prefix is never matched
+        text = content.decode("utf-8", "replace")
+        if truncated:
+            text = text[: text.rfind("\n") + 1]
+        table_name = table_name_from_sql(text)
 
-    return None
+        # CREATE TABLE sits further down: read the rest
+        if not table_name and truncated:
+            content += f.read()
+            table_name = table_name_from_sql(content.decode("utf-8", "replace"))
 
+    return table_name
 
-def quote_identifier(identifier: str) -> str:
-    """Quote a PostgreSQL identifier if needed"""
-    if identifier.startswith('"') and identifier.endswith('"'):
-        return identifier
 
-    needs_quote = (
-        identifier[0].isdigit()
-        or any(c.isupper() for c in identifier)
-        or not identifier.replace("_", "").isalnum()
-    )
-
-    return f'"{identifier}"' if needs_quote else identifier
-
-
-def quote_schema_table(table_name: str) -> str:
-    """Quote schema.table identifier"""
-    if "." in table_name:
-        schema, table = table_name.split(".", 1)
-        return f"{quote_identifier(schema)}.{quote_identifier(table)}"
-    return quote_identifier(table_name)
-
-
-def list_all_tables() -> set[str]:
-    """Query PostgreSQL to get all tables (schema.table format)"""
+def list_all_tables() -> set[tuple[str, str]]:
+    """Query PostgreSQL to get all tables as (schema, table) pairs"""
     query = """
         SELECT schemaname, tablename
         FROM pg_tables
@@ -256,14 +356,7 @@ def list_all_tables() -> set[str]:
     """
 
     result = execute_query(query)
-    tables = set()
-
-    for row in result["rows"]:
-        schema = row[0]
-
-        tables.add(f"{schema}.{row[1]}")
-
-    return tables
+    return {(row[0], row[1]) for row in result["rows"]}
 
 
 def table_to_file_path(table_name: str, tables_dir: Path) -> Path:
@@ -272,69 +365,140 @@ def table_to_file_path(table_name: str, tables_dir: Path) -> Path:
         raise ValueError(f"Table name must include schema: {table_name}")
 
     schema, table = table_name.split(".", 1)
-    path_parts = table.split("__")
+    return table_file_paths((schema, table), tables_dir)[0]
 
-    file_path = tables_dir / schema
-    for part in path_parts:
-        file_path = file_path / part
-    file_path = file_path / "create.sql"
 
-    return file_path
+def table_file_paths(table: tuple[str, str], tables_dir: Path) -> tuple[Path, Path]:
+    """Return the (create.sql, seed.csv) paths for a (schema, table) pair"""
+    schema, name = table
+    table_dir = tables_dir.joinpath(schema, *name.split("__"))
+    return table_dir / "create.sql", table_dir / "seed.csv"
 
 
-def get_local_tables(tables_dir: Path) -> set[str]:
-    """Scan filesystem for all create.sql files and extract table names"""
+def get_local_tables(tables_dir: Path) -> set[tuple[str, str]]:
+    """Scan filesystem for all create.sql files and extract (schema, table) pairs"""
     local_tables = set()
 
-    for sql_file in tables_dir.rglob("create.sql"):
-        table_name = extract_table_name(str(sql_file))
-        if table_name:
-            local_tables.add(table_name)
+    for sql_file in walk_files(str(tables_dir), "create.sql"):
+        table_name = extract_table_name(sql_file)
+
+        # Skip files without a schema-qualified CREATE TABLE (no path to map them back to)
+        if table_name and "." in table_name:
+            schema, table = table_name.split(".", 1)
+            local_tables.add((schema, table))
 
     return local_tables
 
 
+def export_table_to_csv(conn, table: tuple[str, str], seed_csv_path: Path) -> None:
+    """
+    Stream a table's rows into seed.csv with COPY TO STDOUT
+
+    The server sends one CSV line per row and each is written to the file as it arrives,
+    so client memory stays flat however large the table is (no server-side cursor needed).
+
+    @param conn: Database connection
+    @param table (tuple[str, str]): (schema, table) pair
+    @param seed_csv_path (Path): Destination CSV file
+    """
+    quoted_table = f"{quote_identifier(table[0])}.{quote_identifier(table[1])}"
+
+    # Order catalog rows for consistency
+    if table == ("meta", "catalog"):
+        source = f'(SELECT * FROM {quoted_table} ORDER BY "Table", "Order")'
+    else:
+        source = quoted_table
+
+    with conn.cursor() as cursor, open(seed_csv_path, "wb", buffering=EXPORT_BUFFER_SIZE) as f:
+        cursor.copy_expert(f"COPY {source} TO STDOUT WITH (FORMAT csv, HEADER true)", f)
+    conn.commit()
+
+
+def load_versions() -> dict[str, list]:
+    """Load the seed.csv version manifest (empty if missing or unreadable)"""
+    from dev.paths import CACHE_DIR
+    try:
+        with open(CACHE_DIR / VERSIONS_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_versions(versions: dict[str, list]):
+    """Save the seed.csv version manifest"""
+    from dev.paths import CACHE_DIR
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_DIR / VERSIONS_FILE, "w") as f:
+        json.dump(versions, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def fetch_table_versions(tables: list[tuple[str, str]]) -> dict[tuple[str, str], str]:
+    """
+    Fetch a content version for each table in a single query
+
+    @param tables (list[tuple[str, str]]): (schema, table) pairs
+    @returns dict[tuple[str, str], str] - Version hash per table
+    """
+    if not tables:
+        return {}
+
+    subqueries = []
+    params = []
+    for index, table in enumerate(tables):
+        quoted_table = f"{quote_identifier(table[0])}.{quote_identifier(table[1])}"
+        subqueries.append(TABLE_VERSION_SQL.format(index=index, table=quoted_table))
+        params.extend([quoted_table, quoted_table])
+
+    result = execute_query("\nUNION ALL\n".join(subqueries), tuple(params))
+    return {tables[row[0]]: row[1] for row in result["rows"]}
+
+
+def file_signature(path: Path) -> Optional[list[int]]:
+    """[size, mtime_ns] of a file, or None if it is missing"""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
 def export_catalogs_to_csv(tables_dir: Path) -> int:
     """Export catalog data from meta.catalog to catalog.csv files"""
 
-    # Check if meta.catalog exists
-    check_result = execute_query(
-        """
-        SELECT 1 FROM information_schema.tables
-        WHERE table_schema = 'meta' AND table_name = 'catalog'
-        """
-    )
-    if not check_result["rows"]:
+    # Check if meta.catalog exists (one catalog lookup instead of an information_schema scan)
+    check_result = execute_query("SELECT to_regclass('meta.catalog') IS NOT NULL")
+    if not check_result["rows"][0][0]:
         return 0
 
     catalogs_updated = 0
 
+    # Fetch every catalog row once and group by table (rows arrive in "Order" per table)
+    result = execute_query(
+        """
+        SELECT "Table", "Column", "Order", "Type", "Nullable?", "Primary Key?",
+               "Foreign Key", "Description", "Sample Values"
+        FROM meta.catalog ORDER BY "Table", "Order"
+        """
+    )
+    rows_by_table = defaultdict(list)
+    for row in result["rows"]:
+        rows_by_table[row[0]].append(row)
+
     # Find all create.sql files in meta and test schemas
     meta_test_sql_files = []
     for schema in ["meta", "test00000000000000000000"]:
-        schema_dir = tables_dir / schema
-        if schema_dir.exists():
-            for sql_file in schema_dir.rglob("create.sql"):
-                meta_test_sql_files.append(str(sql_file))
+        meta_test_sql_files.extend(walk_files(tables_dir / schema, "create.sql"))
 
     for sql_file in meta_test_sql_files:
         table_name = extract_table_name(sql_file)
         if not table_name:
             continue
 
-        sql_path = Path(sql_file)
-        catalog_csv_path = sql_path.parent / "catalog.csv"
-
-        # Query meta.catalog for this table's rows
-        query = """
-            SELECT "Table", "Column", "Order", "Type", "Nullable?", "Primary Key?",
-                   "Foreign Key", "Description", "Sample Values"
-            FROM meta.catalog WHERE "Table" = %s ORDER BY "Order"
-        """
-        result = execute_query(query, (table_name,))
+        catalog_csv_path = os.path.join(os.path.dirname(sql_file), "catalog.csv")
 
         # Write catalog.csv
-        with open(catalog_csv_path, "w", newline="") as f:
+        with open(catalog_csv_path, "w", newline="", buffering=EXPORT_BUFFER_SIZE) as f:
             writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
             writer.writerow(
                 [
@@ -349,7 +513,7 @@ def export_catalogs_to_csv(tables_dir: Path) -> int:
                     "Sample Values",
                 ]
             )
-            for row in result["rows"]:
+            for row in rows_by_table.get(table_name, []):
                 nullable_str = "TRUE" if row[4] is True else ("FALSE" if row[4] is False else "")
                 pk_str = "TRUE" if row[5] is True else ("FALSE" if row[5] is False else "")
                 column_str = "NULL" if row[1] is None else row[1]
@@ -373,92 +537,68 @@ def export_catalogs_to_csv(tables_dir: Path) -> int:
     return catalogs_updated
 
 
-def generate_create_table_statement(schema: str, table: str) -> str:
-    """Generate CREATE TABLE statement from information_schema"""
+def fetch_table_metadata(
+    tables: list[tuple[str, str]],
+) -> dict[tuple[str, str], dict[str, list]]:
+    """
+    Fetch columns, primary key, unique and foreign key rows for many tables in a single query
 
-    # Query columns
-    columns_result = execute_query(
-        """
-        SELECT column_name, data_type, udt_name, is_nullable, column_default,
-               character_maximum_length, numeric_precision, numeric_scale
-        FROM information_schema.columns
-        WHERE table_schema = %s AND table_name = %s
-        ORDER BY ordinal_position;
-        """,
-        (schema, table),
-    )
+    @param tables (list[tuple[str, str]]): (schema, table) pairs
+    @returns dict[tuple[str, str], dict[str, list]] - Rows keyed by (schema, table), then by
+        kind ("columns", "pk", "uniques", "fks")
+    """
+    metadata = {table: {kind: [] for kind in METADATA_KINDS.values()} for table in tables}
+    if not metadata:
+        return metadata
 
-    # Query primary key
-    pk_result = execute_query(
-        """
-        SELECT kcu.column_name
-        FROM information_schema.table_constraints tc
-        JOIN information_schema.key_column_usage kcu ON tc.constraint_name = kcu.constraint_name
-        WHERE tc.constraint_type = 'PRIMARY KEY' AND tc.table_schema = %s AND tc.table_name = %s
-        ORDER BY kcu.ordinal_position;
-        """,
-        (schema, table),
+    result = execute_query(
+        TABLE_METADATA_QUERY,
+        {"schemas": [table[0] for table in tables], "tables": [table[1] for table in tables]},
     )
-    pk_columns = list(dict.fromkeys([row[0] for row in pk_result["rows"]]))
 
-    # Query unique constraints (single-column only)
-    unique_result = execute_query(
-        """
-        SELECT kcu.column_name
-        FROM information_schema.table_constraints tc
-        JOIN information_schema.key_column_usage kcu ON tc.constraint_name = kcu.constraint_name
-        WHERE tc.constraint_type = 'UNIQUE' AND tc.table_schema = %s AND tc.table_name = %s
-        AND (SELECT COUNT(*) FROM information_schema.key_column_usage kcu2
-             WHERE kcu2.constraint_name = tc.constraint_name) = 1;
-        """,
-        (schema, table),
-    )
-    unique_columns = {row[0] for row in unique_result["rows"]}
+    # Group the combined result by table, then by its discriminator column
+    for kind, schema, table, payload in result["rows"]:
+        metadata[(schema, table)][METADATA_KINDS[kind]].append(payload)
 
-    # Query foreign keys using pg_catalog for accurate column pairing
-    # (information_schema.constraint_column_usage doesn't pair source/target columns correctly)
-    fk_result = execute_query(
-        """
-        SELECT
-            a_src.attname AS source_column,
-            n_ref.nspname AS ref_schema,
-            c_ref.relname AS ref_table,
-            a_ref.attname AS ref_column
-        FROM pg_constraint con
-        JOIN pg_class c_src ON con.conrelid = c_src.oid
-        JOIN pg_namespace n_src ON c_src.relnamespace = n_src.oid
-        JOIN pg_class c_ref ON con.confrelid = c_ref.oid
-        JOIN pg_namespace n_ref ON c_ref.relnamespace = n_ref.oid
-        CROSS JOIN LATERAL unnest(con.conkey, con.confkey) WITH ORDINALITY AS cols(src_attnum, ref_attnum, ord)
-        JOIN pg_attribute a_src ON a_src.attrelid = c_src.oid AND a_src.attnum = cols.src_attnum
-        JOIN pg_attribute a_ref ON a_ref.attrelid = c_ref.oid AND a_ref.attnum = cols.ref_attnum
-        WHERE con.contype = 'f' AND n_src.nspname = %s AND c_src.relname = %s
-        ORDER BY con.conname, cols.ord;
-        """,
-        (schema, table),
-    )
+    return metadata
+
+
+def generate_create_table_statement(
+    schema: str, table: str, metadata: Optional[dict[str, list]] = None
+) -> str:
+    """
+    Generate CREATE TABLE statement from information_schema
 
-    # Deduplicate foreign keys
-    fks_by_column = defaultdict(list)
-    for fk_row in fk_result["rows"]:
-        fks_by_column[fk_row[0]].append((fk_row[1], fk_row[2], fk_row[3]))
+    @param schema (str): Schema name
+    @param table (str): Table name
+    @param metadata (Optional[dict[str, list]]): Pre-fetched rows from fetch_table_metadata
+    @returns str - CREATE TABLE statement
+    """
+
+    # Query columns, primary key, unique constraints and foreign keys unless pre-fetched
+    if metadata is None:
+        metadata = fetch_table_metadata([(schema, table)])[(schema, table)]
+    column_rows = metadata["columns"]
+    fk_rows = metadata["fks"]
+    pk_columns = list(dict.fromkeys([row[0] for row in metadata["pk"]]))
+    unique_columns = {row[0] for row in metadata["uniques"]}
 
     # Build CREATE TABLE statement
-    lines = []
+    buf = io.StringIO()
+    write = buf.write
     quoted_schema = quote_identifier(schema)
     full_table_name = quote_schema_table(f"{schema}.{table}")
 
-    lines.append("-- Schema Creation")
-    lines.append(f"CREATE SCHEMA IF NOT EXISTS {quoted_schema};")
-    lines.append("")
-    lines.append("-- Table Creation")
-    lines.append(f"CREATE TABLE {full_table_name} (")
-    lines.append("")
-    lines.append("    -- Columns")
+    write("-- Schema Creation\n")
+    write(f"CREATE SCHEMA IF NOT EXISTS {quoted_schema};\n")
+    write("\n")
+    write("-- Table Creation\n")
+    write(f"CREATE TABLE {full_table_name} (\n")
+    write("\n")
+    write("    -- Columns\n")
 
     # Build column definitions
-    column_defs = []
-    for col_row in columns_result["rows"]:
+    for col_row in column_rows:
         col_name, data_type, udt_name, is_nullable, col_default = col_row[:5]
         char_max_len, num_precision, num_scale = col_row[5:8]
 
@@ -492,48 +632,37 @@ def generate_create_table_statement(schema: str, table: str) -> str:
         if col_default and not is_serial:
             col_def += f" DEFAULT {col_default}"
 
-        col_def += ","
-        column_defs.append(col_def)
+        write(f"{col_def},\n")
 
-    lines.extend(column_defs)
-    lines.append("")
-    lines.append("    -- Primary Key")
+    write("\n")
+    write("    -- Primary Key\n")
 
     if pk_columns:
         quoted_pk_cols = [quote_identifier(col) for col in pk_columns]
         pk_def = f'    PRIMARY KEY ({", ".join(quoted_pk_cols)})'
-        if fk_result["rows"]:
+        if fk_rows:
             pk_def += ","
-        lines.append(pk_def)
+        write(f"{pk_def}\n")
 
     # Foreign keys
-    if fk_result["rows"]:
-        lines.append("")
-        lines.append("    -- Foreign Keys")
-        fk_defs = []
-        seen_fks = set()
-
-        for fk_row in fk_result["rows"]:
-            col_name, fk_schema, fk_table, fk_col = fk_row
-            quoted_col = quote_identifier(col_name)
-            quoted_fk_schema = quote_identifier(fk_schema)
-            quoted_fk_table = quote_identifier(fk_table)
-            quoted_fk_col = quote_identifier(fk_col)
-
-            fk_def = f"    FOREIGN KEY ({quoted_col}) REFERENCES {quoted_fk_schema}.{quoted_fk_table} ({quoted_fk_col})"
-            if fk_def not in seen_fks:
-                seen_fks.add(fk_def)
-                fk_defs.append(fk_def)
+    if fk_rows:
+        write("\n")
+        write("    -- Foreign Keys\n")
 
-        for i, fk_def in enumerate(fk_defs):
-            if i < len(fk_defs) - 1:
-                fk_defs[i] = fk_def + ","
-        lines.extend(fk_defs)
+        # Deduplicate (column, schema, table, column) rows in order, then quote each once
+        fk_defs = (
+            f"    FOREIGN KEY ({quote_identifier(col_name)}) REFERENCES "
+            f"{quote_identifier(fk_schema)}.{quote_identifier(fk_table)} "
+            f"({quote_identifier(fk_col)})"
+            for col_name, fk_schema, fk_table, fk_col in dict.fromkeys(map(tuple, fk_rows))
+        )
+        write(",\n".join(fk_defs))
+        write("\n")
 
-    lines.append("")
-    lines.append(");")
+    write("\n")
+    write(");\n")
 
-    return "\n".join(lines) + "\n"
+    return buf.getvalue()
 
 
 #
@@ -558,6 +687,7 @@ def snapshot_table(usernames: Optional[list[str]] = None) -> dict[str, Any]:
     files_created = 0
     files_deleted = 0
     files_updated = 0
+    exports_skipped = 0
 
     # Get tables from database and filesystem
     db_tables = list_all_tables()
@@ -565,17 +695,19 @@ def snapshot_table(usernames: Optional[list[str]] = None) -> dict[str, Any]:
 
     # Filter by usernames if specified
     if usernames:
-        db_tables = {t for t in db_tables if t.split(".")[0] in usernames}
-        local_tables = {t for t in local_tables if t.split(".")[0] in usernames}
+        db_tables = {t for t in db_tables if t[0] in usernames}
+        local_tables = {t for t in local_tables if t[0] in usernames}
 
     tables_to_delete = local_tables - db_tables
     tables_to_create = db_tables - local_tables
     tables_to_update = db_tables & local_tables
 
+    # Resolve each table's create.sql and seed.csv paths once
+    file_paths = {table: table_file_paths(table, tables_dir) for table in db_tables | local_tables}
+
     # Delete orphaned files
-    for table_name in tables_to_delete:
-        create_sql_path = table_to_file_path(table_name, tables_dir)
-        seed_csv_path = create_sql_path.parent / "seed.csv"
+    for table in tables_to_delete:
+        create_sql_path, seed_csv_path = file_paths[table]
 
         if create_sql_path.exists():
             create_sql_path.unlink()
@@ -584,57 +716,59 @@ def snapshot_table(usernames: Optional[list[str]] = None) -> dict[str, Any]:
             seed_csv_path.unlink()
             files_deleted += 1
 
+    # Tables whose seed.csv gets exported once the files are laid out
+    exports: list[tuple[tuple[str, str], Path]] = []
+
+    # Fetch metadata for every new table in one query
+    create_metadata = fetch_table_metadata(sorted(tables_to_create))
+
     # Create new files for missing tables
-    for table_name in tables_to_create:
-        schema, table = table_name.split(".", 1)
-        create_sql_path = table_to_file_path(table_name, tables_dir)
-        seed_csv_path = create_sql_path.parent / "seed.csv"
+    for table in tables_to_create:
+        create_sql_path, seed_csv_path = file_paths[table]
 
         create_sql_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Generate CREATE TABLE
-        create_statement = generate_create_table_statement(schema, table)
+        create_statement = generate_create_table_statement(*table, create_metadata[table])
         with open(create_sql_path, "w") as f:
             f.write(create_statement)
 
-        # Export data to seed.csv (order catalog for consistency)
-        quoted_table = quote_schema_table(table_name)
-        if table_name == "meta.catalog":
-            result = execute_query(f'SELECT * FROM {quoted_table} ORDER BY "Table", "Order";')
-        else:
-            result = execute_query(f"SELECT * FROM {quoted_table};")
-
-        with open(seed_csv_path, "w", newline="") as f:
-            if result["columns"]:
-                writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
-                writer.writerow(result["columns"])
-                for row in result["rows"]:
-                    writer.writerow(row)
-
+        exports.append((table, seed_csv_path))
         files_created += 1
 
-    # Update existing tables (export data to seed.csv)
-    for table_name in tables_to_update:
-        create_sql_path = table_to_file_path(table_name, tables_dir)
-        seed_csv_path = create_sql_path.parent / "seed.csv"
+    # Version every exported table before its COPY, so a concurrent change reads as stale
+    versions = load_versions()
+    table_versions = fetch_table_versions(sorted(tables_to_create | tables_to_update))
+
+    # Update existing tables (export data to seed.csv unless unchanged since the last export)
+    for table in tables_to_update:
+        create_sql_path, seed_csv_path = file_paths[table]
 
         # Ensure directory exists (table name in SQL may not match file path)
         create_sql_path.parent.mkdir(parents=True, exist_ok=True)
 
-        quoted_table = quote_schema_table(table_name)
-        if table_name == "meta.catalog":
-            result = execute_query(f'SELECT * FROM {quoted_table} ORDER BY "Table", "Order";')
+        # Skip when both the table and the file are as they were at the last export
+        signature = file_signature(seed_csv_path)
+        recorded = versions.get(f"{table[0]}.{table[1]}")
+        if signature and recorded == [table_versions[table], *signature]:
+            exports_skipped += 1
         else:
-            result = execute_query(f"SELECT * FROM {quoted_table};")
+            exports.append((table, seed_csv_path))
+        files_updated += 1
 
-        with open(seed_csv_path, "w", newline="") as f:
-            if result["columns"]:
-                writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
-                writer.writerow(result["columns"])
-                for row in result["rows"]:
-                    writer.writerow(row)
+    # Export data to seed.csv for new and existing tables across pooled connections
+    map_with_connections(lambda conn, export: export_table_to_csv(conn, *export), exports)
 
-        files_updated += 1
+    # Record what each new seed.csv was exported from; forget deleted tables
+    for table, seed_csv_path in exports:
+        versions[f"{table[0]}.{table[1]}"] = [
+            table_versions[table],
+            *file_signature(seed_csv_path),
+        ]
+    for table in tables_to_delete:
+        versions.pop(f"{table[0]}.{table[1]}", None)
+    if exports or tables_to_delete:
+        save_versions(versions)
 
     # Export catalog data (only if no filter - full snapshot)
     catalogs_updated = 0
@@ -655,8 +789,8 @@ def snapshot_table(usernames: Optional[list[str]] = None) -> dict[str, Any]:
         schema_updated = True
 
     logger.info(
-        f"snapshot_table completed: {files_created} created, {files_updated} updated, "
-        f"{files_deleted} deleted, {catalogs_updated} catalogs"
+        f"snapshot_table completed: {files_created} created, {files_updated} updated "
+        f"({exports_skipped} unchanged), {files_deleted} deleted, {catalogs_updated} catalogs"
     )
 
     return {
@@ -666,6 +800,7 @@ def snapshot_table(usernames: Optional[list[str]] = None) -> dict[str, Any]:
         "files_created": files_created,
         "files_updated": files_updated,
         "files_deleted": files_deleted,
+        "exports_skipped": exports_skipped,
         "catalogs_updated": catalogs_updated,
         "schema_updated": schema_updated,
         "total_tables": len(db_tables),
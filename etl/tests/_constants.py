@@ -0,0 +1,22 @@
+#
+# Imports
+#
+
+# Standard library
+import os
+from pathlib import Path
+
+
+#
+# Constants
+#
+
+# Suffix for isolated resource names, unique per pytest-xdist worker (gw0 when run serially)
+WORKER = os.getenv("PYTEST_XDIST_WORKER", "gw0")
+
+# Real data/tables directory (absolute, no '..' parts); the tables_dir fixture returns it
+REAL_TABLES_DIR = (Path(__file__).parent.parent.parent.parent / "data" / "tables").resolve()
+
+# Real create.sql files read by some tests (skipped when the data checkout lacks them)
+THEME_SQL = REAL_TABLES_DIR / "meta" / "theme" / "create.sql"
+CATALOG_SQL = REAL_TABLES_DIR / "meta" / "catalog" / "create.sql"
@@ -10,17 +10,36 @@ import psycopg2
 import pytest
 from psycopg2.extras import RealDictCursor
 
+# Database
+import dev.db as db
+
+# Shared test constants
+from dev.etl.tests._constants import REAL_TABLES_DIR
+
 # ETL functions
+import dev.etl.drop_bucket as drop_bucket_module
 from dev.etl.create_bucket import create_bucket
 from dev.etl.drop_bucket import drop_bucket
 from dev.etl.reset_all import reset_all
 from dev.etl.seed_bucket import seed_bucket
+from dev.storage import bucket_cache, get_s3_client, list_bucket_names
 
 # Environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
 
+#
+# Constants
+#
+
+# MinIO endpoint the bucket ETL functions use (port set by run_tests.sh via env var)
+MINIO_ENDPOINT = (
+    f"http://{os.getenv('MINIO_EXTERNAL_HOST', 'localhost')}"
+    f":{os.getenv('MINIO_INTERNAL_PORT', '3462')}"
+)
+
+
 #
 # RollbackConnection
 #
@@ -77,10 +96,40 @@ class RollbackConnection:
         self._release_savepoint()
         self._create_savepoint()
 
+    def rollback(self):
+        """Roll back to the active savepoint (undo uncommitted work) and create a new one"""
+        if self._active_sp is not None:
+            self._run(f"ROLLBACK TO SAVEPOINT {self._active_sp}")
+            self._run(f"RELEASE SAVEPOINT {self._active_sp}")
+            self._active_sp = None
+        self._create_savepoint()
+
     def close(self):
         """Roll back to active savepoint and release it (undo uncommitted work)"""
         self._release_savepoint()
 
+    @property
+    def closed(self):
+        """Report the real connection state (checked by the pool on putconn)"""
+        return self._conn.closed
+
+    @property
+    def info(self):
+        """Expose the real connection info (checked by the pool on putconn)"""
+        return self._conn.info
+
+
+#
+# Hooks
+#
+
+
+def pytest_configure(config):
+    """Register the slow_etl marker (every test that needs a live database or MinIO)"""
+    config.addinivalue_line(
+        "markers", "slow_etl: needs a live database or MinIO (ETL entry points, DB cursors)"
+    )
+
 
 #
 # Fixtures
@@ -88,20 +137,60 @@ class RollbackConnection:
 
 
 @pytest.fixture(scope="session", autouse=True)
-def setup_database():
+def setup_database(request):
     """Seed database and buckets once at the start of the test session"""
-    reset_all()
 
+    # Skip the full reset when only fast tests were selected (e.g. pytest -m "not slow_etl")
+    if not any(item.get_closest_marker("slow_etl") for item in request.session.items):
+        return None
+    return reset_all()
 
-@pytest.fixture(autouse=True)
-def db_rollback():
-    """Wrap each test in a DB transaction that gets rolled back after"""
 
-    # Save original connect function
-    original_connect = psycopg2.connect
+@pytest.fixture(scope="session")
+def reset_all_result(setup_database):
+    """Response of the session-start reset_all() call (avoids resetting everything again)"""
+    return setup_database
+
+
+@pytest.fixture(scope="session")
+def tables_dir():
+    """The real data/tables directory (absolute, no '..' parts)"""
+    return REAL_TABLES_DIR
+
 
-    # Create real connection before patching
-    real_conn = original_connect(
+@pytest.fixture(scope="session")
+def bad_seed_tables_dir(tmp_path_factory):
+    """Build the malformed seed trees once per session (seed.csv without create.sql, bad CSV)"""
+    root = tmp_path_factory.mktemp("bad_seed_tables")
+
+    # seed.csv with no matching create.sql
+    no_create_dir = root / "etl_test_no_create" / "test_table"
+    no_create_dir.mkdir(parents=True)
+    (no_create_dir / "seed.csv").write_text("col1,col2\na,b\n")
+
+    # create.sql matches the DB table, but seed.csv is missing a required column
+    fail_dir = root / "etl_test_fail" / "bad_table"
+    fail_dir.mkdir(parents=True)
+    (fail_dir / "create.sql").write_text(
+        'CREATE TABLE etl_test_fail.bad_table ("Name" TEXT NOT NULL, "Required" TEXT NOT NULL);'
+    )
+    (fail_dir / "seed.csv").write_text("Name\ntest_value\n")
+
+    return root
+
+
+@pytest.fixture
+def redirect_bad_seed_tables(monkeypatch, bad_seed_tables_dir):
+    """Point paths.TABLES_DIR at the session's malformed seed trees for one test"""
+    import dev.paths as paths
+    monkeypatch.setattr(paths, "TABLES_DIR", bad_seed_tables_dir)
+    return bad_seed_tables_dir
+
+
+@pytest.fixture(scope="session")
+def real_connection():
+    """Open one real database connection shared by every test in the session"""
+    conn = psycopg2.connect(
         host=os.getenv("POSTGRES_HOST"),
         port=os.getenv("POSTGRES_PORT"),
         database=os.getenv("POSTGRES_DB"),
@@ -110,47 +199,107 @@ def db_rollback():
         cursor_factory=RealDictCursor,
     )
 
+    yield conn
+
+    conn.close()
+
+
+@pytest.fixture(autouse=True)
+def db_rollback(monkeypatch, real_connection):
+    """Wrap each test in a DB transaction that gets rolled back after"""
+
+    # Every pooled connection shares one real connection, so run DB work on one thread
+    monkeypatch.setattr(db, "db_workers", lambda: 1)
+
+    # Save original connect function
+    original_connect = psycopg2.connect
+
     # Patch psycopg2.connect to return our rollback wrapper
-    wrapper = RollbackConnection(real_conn)
+    # (drop pooled connections first so the pool reconnects through the patch)
+    db.close_pool()
+    wrapper = RollbackConnection(real_connection)
     psycopg2.connect = lambda *args, **kwargs: wrapper
 
     yield
 
-    # Rollback all DB changes and close
-    real_conn.rollback()
-    real_conn.close()
+    # Discard pooled wrappers, then rollback all DB changes (the connection is reused)
+    db.close_pool()
+    real_connection.rollback()
 
     # Restore original connect
     psycopg2.connect = original_connect
 
 
 @pytest.fixture
-def restore_buckets():
-    """Restore MinIO buckets to seeded state after test"""
+def db_cursor(db_rollback):
+    """Connection and cursor on the test's rollback wrapper, closed after"""
+
+    # Not checked out of the pool: every pooled connection is this same wrapper, so a
+    # borrow held across ETL calls would be released by their own putconn()
+    conn = psycopg2.connect()
+    cursor = conn.cursor()
+    yield conn, cursor
+    cursor.close()
+
+
+@pytest.fixture(scope="session")
+def s3_client():
+    """One S3 client (and HTTP connection pool) for the whole session"""
+    return get_s3_client(endpoint_url=MINIO_ENDPOINT)
+
+
+@pytest.fixture
+def restore_buckets(monkeypatch, s3_client):
+    """Restore MinIO buckets to seeded state after test (only the buckets it touched)"""
+    client = s3_client
+    buckets_before = list_bucket_names(client)
+
+    # Record every bucket drop_bucket() deletes (it may be recreated empty later on)
+    dropped: set[str] = set()
+    original_record_deleted = drop_bucket_module.record_bucket_deleted
+
+    def record_deleted(client, bucket_name):
+        dropped.add(bucket_name)
+        original_record_deleted(client, bucket_name)
+
+    monkeypatch.setattr(drop_bucket_module, "record_bucket_deleted", record_deleted)
+
     yield
-    drop_bucket()
-    create_bucket()
-    seed_bucket()
+
+    # Drop what the test added or deleted, then recreate and reseed the missing seeded buckets
+    buckets_after = list_bucket_names(client)
+    added = buckets_after - buckets_before
+    deleted = (buckets_before - buckets_after) | (dropped & buckets_before)
+    if not added and not deleted:
+        return
+
+    with bucket_cache():
+        drop_bucket(buckets=sorted(added | (deleted & buckets_after)))
+        created = create_bucket()["buckets_created"]
+        if created:
+            seed_bucket(buckets=created)
 
 
 @pytest.fixture
-def redirect_tables_dir(tmp_path):
-    """Swap paths.TABLES_DIR to a tmp_path directory, restore after test"""
+def redirect_tables_dir(tmp_path, tmp_path_factory):
+    """Swap paths.TABLES_DIR (and CACHE_DIR) to a tmp_path directory, restore after test"""
     import dev.paths as paths
-    original = paths.TABLES_DIR
+    original, original_cache = paths.TABLES_DIR, paths.CACHE_DIR
     paths.TABLES_DIR = tmp_path
+    paths.CACHE_DIR = tmp_path_factory.mktemp("cache")
     yield tmp_path
-    paths.TABLES_DIR = original
+    paths.TABLES_DIR, paths.CACHE_DIR = original, original_cache
 
 
 @pytest.fixture
-def redirect_buckets_dir(tmp_path):
-    """Swap paths.BUCKETS_DIR to a tmp_path directory, restore after test"""
+def redirect_buckets_dir(tmp_path, tmp_path_factory):
+    """Swap paths.BUCKETS_DIR (and CACHE_DIR) to a tmp_path directory, restore after test"""
     import dev.paths as paths
-    original = paths.BUCKETS_DIR
+    original, original_cache = paths.BUCKETS_DIR, paths.CACHE_DIR
     paths.BUCKETS_DIR = tmp_path
+    paths.CACHE_DIR = tmp_path_factory.mktemp("cache")
     yield tmp_path
-    paths.BUCKETS_DIR = original
+    paths.BUCKETS_DIR, paths.CACHE_DIR = original, original_cache
 
 
 @pytest.fixture
@@ -164,6 +313,7 @@ def redirect_all_paths(tmp_path):
     orig_tables = paths.TABLES_DIR
     orig_buckets = paths.BUCKETS_DIR
     orig_mmd = paths.SCHEMA_MMD_PATH
+    orig_cache = paths.CACHE_DIR
 
     # Copy real tables to tmp_path
     shutil.copytree(orig_tables, tmp_path / "tables")
@@ -174,6 +324,7 @@ def redirect_all_paths(tmp_path):
     paths.TABLES_DIR = tmp_path / "tables"
     paths.BUCKETS_DIR = tmp_path / "buckets"
     paths.SCHEMA_MMD_PATH = tmp_path / "schema.mmd"
+    paths.CACHE_DIR = tmp_path / ".cache"
 
     yield tmp_path
 
@@ -181,6 +332,7 @@ def redirect_all_paths(tmp_path):
     paths.TABLES_DIR = orig_tables
     paths.BUCKETS_DIR = orig_buckets
     paths.SCHEMA_MMD_PATH = orig_mmd
+    paths.CACHE_DIR = orig_cache
 
 
 @pytest.fixture
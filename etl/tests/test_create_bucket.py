@@ -14,7 +14,7 @@ from dev.etl.drop_bucket import drop_bucket
 # Fixtures
 #
 
-pytestmark = pytest.mark.usefixtures("restore_buckets")
+pytestmark = [pytest.mark.slow_etl, pytest.mark.usefixtures("restore_buckets")]
 
 
 #
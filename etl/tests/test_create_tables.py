@@ -2,12 +2,14 @@
 # Imports
 #
 
-# Standard library
-import os
-import shutil
+# Third party
+import pytest
+
+# Local
+from dev.etl.tests._constants import WORKER
 
 # Source module
-from dev.etl.create_tables import create_table, find_create_sql_files
+from dev.etl.create_tables import batch_layers, create_table, find_create_sql_files
 from dev.etl.drop_tables import drop_table
 
 #
@@ -15,7 +17,7 @@ from dev.etl.drop_tables import drop_table
 #
 
 
-def test_find_create_sql_files_all():
+def test_find_create_sql_files_all(tables_dir):
     """
     Story: Find all create.sql files in tables directory
 
@@ -23,13 +25,12 @@ def test_find_create_sql_files_all():
     When we call find_create_sql_files with no filter
     Then all create.sql files are returned
     """
-    tables_dir = os.path.join(os.path.dirname(__file__), "../../../data/tables")
     files = find_create_sql_files(tables_dir)
     assert len(files) > 0
     assert all(f.endswith("create.sql") for f in files)
 
 
-def test_find_create_sql_files_with_usernames():
+def test_find_create_sql_files_with_usernames(tables_dir):
     """
     Story: Find create.sql files only for specific usernames
 
@@ -37,13 +38,24 @@ def test_find_create_sql_files_with_usernames():
     When we call find_create_sql_files with a username filter
     Then only create.sql files for that username are returned
     """
-    tables_dir = os.path.join(os.path.dirname(__file__), "../../../data/tables")
     files = find_create_sql_files(tables_dir, usernames=["meta"])
     assert len(files) > 0
     assert all("meta" in f for f in files)
 
 
-def test_find_create_sql_files_nonexistent_username():
+def test_find_create_sql_files_duplicate_usernames(tables_dir):
+    """
+    Story: Scan each username directory once
+
+    Given a username filter that repeats the same username
+    When we call find_create_sql_files with that filter
+    Then each create.sql file is returned once
+    """
+    files = find_create_sql_files(tables_dir, usernames=["meta", "meta"])
+    assert files == find_create_sql_files(tables_dir, usernames=["meta"])
+
+
+def test_find_create_sql_files_nonexistent_username(tables_dir):
     """
     Story: Return empty list for nonexistent username
 
@@ -51,23 +63,48 @@ def test_find_create_sql_files_nonexistent_username():
     When we call find_create_sql_files with that username
     Then an empty list is returned
     """
-    tables_dir = os.path.join(os.path.dirname(__file__), "../../../data/tables")
     files = find_create_sql_files(tables_dir, usernames=["nonexistent_user_xyz"])
     assert files == []
 
 
+#
+# Tests for batch_layers
+#
+
+
+def test_batch_layers_merges_single_file_layers():
+    """
+    Story: Run chains of dependent tables in one transaction
+
+    Given layers where single-file layers surround a wide layer, plus unordered files
+    When we call batch_layers
+    Then consecutive single-file layers and the unordered files share a serial batch
+    And the wide layer stays a concurrent batch of its own
+    """
+    layers = [["a.sql"], ["b.sql"], ["c.sql", "d.sql"], ["e.sql"]]
+
+    batches = batch_layers(layers, ["u.sql"])
+
+    assert batches == [
+        (["a.sql", "b.sql"], False),
+        (["c.sql", "d.sql"], True),
+        (["e.sql", "u.sql"], False),
+    ]
+
+
 #
 # Constants
 #
 
 # Use a non-existent schema to avoid modifying real data
-TEST_SCHEMA = "etl_test_nonexistent"
+TEST_SCHEMA = f"etl_test_nonexistent_{WORKER}"
 
 #
 # Tests for create_table function
 #
 
 
+@pytest.mark.slow_etl
 def test_create_table_success():
     """
     Story: Create table creates tables from SQL files
@@ -82,6 +119,7 @@ def test_create_table_success():
     assert "tables_created" in data
 
 
+@pytest.mark.slow_etl
 def test_create_table_response_structure():
     """
     Story: Create table returns proper response structure
@@ -97,7 +135,8 @@ def test_create_table_response_structure():
     assert "tables_created" in data
 
 
-def test_create_table_with_invalid_sql():
+@pytest.mark.slow_etl
+def test_create_table_with_invalid_sql(redirect_tables_dir):
     """
     Story: Permanently invalid SQL is reported in failed_tables
 
@@ -105,25 +144,19 @@ def test_create_table_with_invalid_sql():
     When we call create_table targeting that directory
     Then the response includes failed_tables
     """
-    # Create temp directory with invalid SQL
-    tables_dir = os.path.join(os.path.dirname(__file__), "../../../data/tables")
-    test_dir = os.path.join(tables_dir, "_etl_test_invalid")
-    table_dir = os.path.join(test_dir, "bad_table")
-    os.makedirs(table_dir, exist_ok=True)
-
-    try:
-        # Write syntactically invalid SQL (not a dependency error, a permanent failure)
-        with open(os.path.join(table_dir, "create.sql"), "w") as f:
-            f.write("THIS IS NOT VALID SQL AT ALL;")
+    # Write syntactically invalid SQL (not a dependency error, a permanent failure)
+    # under a tmp_path tables directory, so data/tables is never modified
+    table_dir = redirect_tables_dir / "_etl_test_invalid" / "bad_table"
+    table_dir.mkdir(parents=True)
+    (table_dir / "create.sql").write_text("THIS IS NOT VALID SQL AT ALL;")
 
-        data = create_table(usernames=["_etl_test_invalid"])
+    data = create_table(usernames=["_etl_test_invalid"])
 
-        assert "failed_tables" in data
-        assert data["failed_tables"] > 0
-    finally:
-        shutil.rmtree(test_dir)
+    assert "failed_tables" in data
+    assert data["failed_tables"] > 0
 
 
+@pytest.mark.slow_etl
 def test_create_table_with_usernames_filter():
     """
     Story: Create table can filter by usernames
@@ -137,7 +170,8 @@ def test_create_table_with_usernames_filter():
     assert data["status"] == "success"
 
 
-def test_create_table_dependency_order():
+@pytest.mark.slow_etl
+def test_create_table_dependency_order(tables_dir):
     """
     Story: Tables with FKs are created after their dependencies
 
@@ -158,6 +192,5 @@ def test_create_table_dependency_order():
     assert "failed_tables" not in data
 
     # Verify count matches available SQL files
-    tables_dir = os.path.join(os.path.dirname(__file__), "../../../data/tables")
     sql_files = find_create_sql_files(tables_dir, usernames=["meta"])
     assert data["tables_created"] == len(sql_files)
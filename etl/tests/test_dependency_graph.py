@@ -10,7 +10,9 @@ import tempfile
 from dev.etl.create_tables import find_create_sql_files
 from dev.etl.dependency_graph import (
     build_dependency_graph,
+    find_cycles,
     parse_foreign_keys,
+    topological_layers,
     topological_sort,
 )
 from dev.etl.seed_tables import extract_table_name_from_create_sql
@@ -85,6 +87,30 @@ def test_parse_foreign_keys_single_quoted_schema():
     assert result == ["test00000000000000000000.help__theme"]
 
 
+def test_parse_foreign_keys_quoted_table():
+    """
+    Story: FKs to quoted table names are parsed
+
+    Given SQL referencing a reserved-word table (meta."order") and a fully quoted one
+    When I parse foreign keys
+    Then both referenced tables are returned without quotes
+    """
+
+    # Arrange
+    sql = """
+    CREATE TABLE meta.line (
+        "Order ID" INTEGER REFERENCES meta."order" ("ID"),
+        "Item ID" INTEGER REFERENCES "meta"."Item" ("ID")
+    );
+    """
+
+    # Act
+    result = parse_foreign_keys(sql)
+
+    # Assert
+    assert result == ["meta.order", "meta.Item"]
+
+
 def test_parse_foreign_keys_multiple_different_tables():
     """
     Story: Multiple FKs to different tables are all returned
@@ -235,6 +261,51 @@ def test_parse_foreign_keys_composite_columns():
     assert result == ["test.pages__recipes__containers"]
 
 
+def test_parse_foreign_keys_mixed_case_keyword():
+    """
+    Story: The REFERENCES keyword is matched in any letter case
+
+    Given SQL that spells the keyword "References"
+    When I parse foreign keys
+    Then the referenced table is still extracted
+    """
+
+    # Arrange
+    sql = 'CREATE TABLE meta.pages ("Icon ID" INTEGER References meta.lucide_icon ("ID"));'
+
+    # Act
+    result = parse_foreign_keys(sql)
+
+    # Assert
+    assert result == ["meta.lucide_icon"]
+
+
+def test_parse_foreign_keys_ignores_comments():
+    """
+    Story: REFERENCES inside SQL comments are ignored
+
+    Given SQL with a live FK plus commented-out FKs in line and block comments
+    When I parse foreign keys
+    Then only the live reference is returned
+    """
+
+    # Arrange
+    sql = """
+    -- Foreign Keys (old: REFERENCES meta.legacy_icon ("ID"))
+    CREATE TABLE meta.pages (
+        "Avatar ID" INTEGER,
+        /* FOREIGN KEY ("Theme ID") REFERENCES meta.theme ("ID"), */
+        FOREIGN KEY ("Avatar ID") REFERENCES meta.lucide_icon ("ID")
+    );
+    """
+
+    # Act
+    result = parse_foreign_keys(sql)
+
+    # Assert
+    assert result == ["meta.lucide_icon"]
+
+
 #
 # Tests for build_dependency_graph
 #
@@ -246,15 +317,16 @@ def test_build_dependency_graph_empty_list():
 
     Given an empty list of SQL files
     When I build the dependency graph
-    Then both graph and file_map are empty
+    Then graph, file_map, and content_map are all empty
     """
 
     # Act
-    graph, file_map = build_dependency_graph([], lambda f: None)
+    graph, file_map, content_map = build_dependency_graph([], lambda f: None)
 
     # Assert
     assert graph == {}
     assert file_map == {}
+    assert content_map == {}
 
 
 def test_build_dependency_graph_no_fks():
@@ -280,7 +352,7 @@ def test_build_dependency_graph_no_fks():
 
     try:
         # Act
-        graph, _file_map = build_dependency_graph(files, lambda p: name_map.get(p))
+        graph, _file_map, _content_map = build_dependency_graph(files, lambda p: name_map.get(p))
 
         # Assert
         assert "meta.table_a" in graph
@@ -299,6 +371,7 @@ def test_build_dependency_graph_linear_chain():
     Given three SQL files where C depends on B, B depends on A
     When I build the dependency graph
     Then the dependencies are correctly represented
+    And each table's SQL content is kept
     """
 
     # Arrange
@@ -318,18 +391,56 @@ def test_build_dependency_graph_linear_chain():
 
     try:
         # Act
-        graph, _file_map = build_dependency_graph(files, lambda p: name_map.get(p))
+        graph, _file_map, content_map = build_dependency_graph(files, lambda p: name_map.get(p))
 
         # Assert
         assert graph["meta.a"] == set()
         assert graph["meta.b"] == {"meta.a"}
         assert graph["meta.c"] == {"meta.b"}
+        assert content_map == sqls
     finally:
         for path in files:
             os.unlink(path)
 
 
-def test_build_dependency_graph_real_files():
+def test_build_dependency_graph_sees_edited_file():
+    """
+    Story: Rebuilding the graph picks up an edited create.sql
+
+    Given a create.sql file whose graph has already been built once
+    When the file gains a new FK and the graph is rebuilt
+    Then the new dependency and content are returned instead of the cached ones
+    """
+
+    # Arrange
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".sql", delete=False) as f:
+        f.write('CREATE TABLE meta.b ("ID" SERIAL);')
+        path = f.name
+
+    def extract(p):
+        return "meta.b"
+
+    try:
+        first_graph, _file_map, _content_map = build_dependency_graph([path], extract)
+
+        edited = 'CREATE TABLE meta.b ("ID" SERIAL, "AID" INT REFERENCES meta.a ("ID"));'
+        with open(path, "w") as f:
+            f.write(edited)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        # Act
+        graph, _file_map, content_map = build_dependency_graph([path], extract)
+
+        # Assert
+        assert first_graph["meta.b"] == set()
+        assert graph["meta.b"] == {"meta.a"}
+        assert content_map["meta.b"] == edited
+    finally:
+        os.unlink(path)
+
+
+def test_build_dependency_graph_real_files(tables_dir):
     """
     Story: Real create.sql files produce a valid graph
 
@@ -339,11 +450,12 @@ def test_build_dependency_graph_real_files():
     """
 
     # Arrange
-    tables_dir = os.path.join(os.path.dirname(__file__), "../../../data/tables")
     sql_files = find_create_sql_files(tables_dir, usernames=["meta"])
 
     # Act
-    graph, _file_map = build_dependency_graph(sql_files, extract_table_name_from_create_sql)
+    graph, _file_map, _content_map = build_dependency_graph(
+        sql_files, extract_table_name_from_create_sql
+    )
 
     # Assert — graph should have nodes
     assert len(graph) > 0
@@ -356,6 +468,13 @@ def test_build_dependency_graph_real_files():
     if "meta.lucide_icon" in graph:
         assert graph["meta.lucide_icon"] == set()
 
+    # Sorted order puts every in-graph dependency before its dependent
+    position = {node: i for i, node in enumerate(topological_sort(graph))}
+    for node, deps in graph.items():
+        for dep in deps:
+            if dep in position and node in position:
+                assert position[dep] < position[node]
+
 
 #
 # Tests for topological_sort
@@ -413,8 +532,9 @@ def test_topological_sort_linear_chain():
     result = topological_sort(graph)
 
     # Assert
-    assert result.index("a") < result.index("b")
-    assert result.index("b") < result.index("c")
+    position = {node: i for i, node in enumerate(result)}
+    assert position["a"] < position["b"]
+    assert position["b"] < position["c"]
 
 
 def test_topological_sort_diamond():
@@ -433,10 +553,11 @@ def test_topological_sort_diamond():
     result = topological_sort(graph)
 
     # Assert
-    assert result.index("a") < result.index("b")
-    assert result.index("a") < result.index("c")
-    assert result.index("b") < result.index("d")
-    assert result.index("c") < result.index("d")
+    position = {node: i for i, node in enumerate(result)}
+    assert position["a"] < position["b"]
+    assert position["a"] < position["c"]
+    assert position["b"] < position["d"]
+    assert position["c"] < position["d"]
 
 
 def test_topological_sort_cycle():
@@ -459,6 +580,84 @@ def test_topological_sort_cycle():
     assert len(result) < len(graph)
 
 
+#
+# Tests for topological_layers
+#
+
+
+def test_topological_layers_empty_graph():
+    """
+    Story: Empty graph produces no layers
+
+    Given an empty dependency graph
+    When I split it into layers
+    Then an empty list is returned
+    """
+
+    # Act
+    result = topological_layers({})
+
+    # Assert
+    assert result == []
+
+
+def test_topological_layers_diamond():
+    """
+    Story: Diamond dependency shape is split into three layers
+
+    Given a diamond: d depends on b and c, both depend on a
+    When I split it into layers
+    Then a is alone first, b and c share a layer, and d comes last
+    """
+
+    # Arrange
+    graph = {"a": set(), "b": {"a"}, "c": {"a"}, "d": {"b", "c"}}
+
+    # Act
+    result = topological_layers(graph)
+
+    # Assert
+    assert result == [["a"], ["b", "c"], ["d"]]
+
+
+def test_topological_layers_external_dependency_ignored():
+    """
+    Story: Dependencies outside the graph don't delay a node
+
+    Given a node that depends only on a table not in the graph
+    When I split it into layers
+    Then the node is placed in the first layer
+    """
+
+    # Arrange
+    graph = {"a": {"other.table"}, "b": {"a"}}
+
+    # Act
+    result = topological_layers(graph)
+
+    # Assert
+    assert result == [["a"], ["b"]]
+
+
+def test_topological_layers_cycle():
+    """
+    Story: Cyclic nodes are left out of the layers
+
+    Given a graph with a cycle (a -> b -> a) and an independent node c
+    When I split it into layers
+    Then only c is placed in a layer
+    """
+
+    # Arrange
+    graph = {"a": {"b"}, "b": {"a"}, "c": set()}
+
+    # Act
+    result = topological_layers(graph)
+
+    # Assert
+    assert result == [["c"]]
+
+
 def test_build_dependency_graph_unreadable_file():
     """
     Story: Unreadable file is skipped during graph building
@@ -482,7 +681,7 @@ def test_build_dependency_graph_unreadable_file():
 
     try:
         # Act
-        graph, file_map = build_dependency_graph([good_file, bad_file], extract)
+        graph, file_map, _content_map = build_dependency_graph([good_file, bad_file], extract)
 
         # Assert — good file is in graph, bad file is skipped
         assert "meta.good" in graph
@@ -490,3 +689,46 @@ def test_build_dependency_graph_unreadable_file():
         assert good_file in file_map.values()
     finally:
         os.unlink(good_file)
+
+
+#
+# Tests for find_cycles
+#
+
+
+def test_find_cycles_reports_each_cycle():
+    """
+    Story: Cycles are named exactly, not just their blocked dependents
+
+    Given a two-node cycle, a self-reference, a node behind the cycle and a free node
+    When I find cycles
+    Then only the cycle members and the self-referencing node are reported
+    """
+
+    # Arrange — d depends on the a/b cycle but is not part of it
+    graph = {"a": {"b"}, "b": {"a"}, "c": set(), "d": {"a"}, "e": {"e"}}
+
+    # Act
+    cycles = find_cycles(graph)
+
+    # Assert
+    assert sorted(cycles) == [["a", "b"], ["e"]]
+
+
+def test_find_cycles_acyclic():
+    """
+    Story: Acyclic graphs have no cycles
+
+    Given a diamond-shaped graph with an external dependency
+    When I find cycles
+    Then no cycles are returned
+    """
+
+    # Arrange
+    graph = {"a": {"external"}, "b": {"a"}, "c": {"a"}, "d": {"b", "c"}}
+
+    # Act
+    cycles = find_cycles(graph)
+
+    # Assert
+    assert cycles == []
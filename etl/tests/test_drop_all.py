@@ -13,7 +13,7 @@ from dev.etl.drop_all import drop_all
 # Fixtures
 #
 
-pytestmark = pytest.mark.usefixtures("restore_buckets")
+pytestmark = [pytest.mark.slow_etl, pytest.mark.usefixtures("restore_buckets")]
 
 
 #
@@ -2,30 +2,23 @@
 # Imports
 #
 
-# Standard library
-import os
-
 # Third party
 import pytest
 
+# Local
+from dev.etl.tests._constants import WORKER
+
 # Source module
+import dev.etl.drop_bucket as drop_bucket_module
 from dev.etl.drop_bucket import drop_bucket
-from dev.storage import get_s3_client
 
 
 #
 # Fixtures
 #
 
-pytestmark = pytest.mark.usefixtures("restore_buckets")
-
-
-#
-# Constants
-#
+pytestmark = [pytest.mark.slow_etl, pytest.mark.usefixtures("restore_buckets")]
 
-# MinIO endpoint (port set by run_tests.sh via env var)
-MINIO_ENDPOINT = f"http://{os.getenv('MINIO_EXTERNAL_HOST', 'localhost')}:{os.getenv('MINIO_INTERNAL_PORT', '3462')}"
 
 #
 # Tests for drop_bucket function
@@ -77,7 +70,7 @@ def test_drop_bucket_nonexistent():
     assert data["buckets_dropped"] == 0
 
 
-def test_drop_bucket_actual_bucket():
+def test_drop_bucket_actual_bucket(s3_client):
     """
     Story: Create a bucket directly and drop it via function
 
@@ -85,10 +78,10 @@ def test_drop_bucket_actual_bucket():
     When we call drop_bucket with that bucket name
     Then the bucket is deleted
     """
-    bucket_name = "test-drop-temp-xyz"
+    bucket_name = f"test-drop-temp-xyz-{WORKER}"
 
     # Create the bucket directly via storage client (drop first to ensure clean state)
-    client = get_s3_client(endpoint_url=MINIO_ENDPOINT)
+    client = s3_client
     drop_bucket(buckets=[bucket_name])
     client.create_bucket(Bucket=bucket_name)
 
@@ -109,7 +102,7 @@ def test_drop_bucket_actual_bucket():
     assert bucket_name not in bucket_names
 
 
-def test_drop_bucket_with_contents():
+def test_drop_bucket_with_contents(s3_client):
     """
     Story: Drop a bucket that contains objects
 
@@ -117,10 +110,10 @@ def test_drop_bucket_with_contents():
     When we call drop_bucket
     Then objects are deleted first, then the bucket
     """
-    bucket_name = "test-drop-with-contents"
+    bucket_name = f"test-drop-with-contents-{WORKER}"
 
     # Create bucket and add an object (drop first to ensure clean state)
-    client = get_s3_client(endpoint_url=MINIO_ENDPOINT)
+    client = s3_client
     drop_bucket(buckets=[bucket_name])
     client.create_bucket(Bucket=bucket_name)
     client.put_object(Bucket=bucket_name, Key="test-file.txt", Body=b"test content")
@@ -137,7 +130,7 @@ def test_drop_bucket_with_contents():
     assert bucket_name not in bucket_names
 
 
-def test_drop_multiple_buckets():
+def test_drop_multiple_buckets(s3_client):
     """
     Story: Drop multiple buckets at once
 
@@ -146,8 +139,8 @@ def test_drop_multiple_buckets():
     Then all specified buckets are dropped
     """
     # Create test buckets (drop first to ensure clean state)
-    client = get_s3_client(endpoint_url=MINIO_ENDPOINT)
-    test_buckets = ["test-drop-multi-a", "test-drop-multi-b"]
+    client = s3_client
+    test_buckets = [f"test-drop-multi-a-{WORKER}", f"test-drop-multi-b-{WORKER}"]
     drop_bucket(buckets=test_buckets)
     for bucket in test_buckets:
         client.create_bucket(Bucket=bucket)
@@ -163,3 +156,37 @@ def test_drop_multiple_buckets():
     bucket_names = [b["Name"] for b in list_response.get("Buckets", [])]
     for bucket in test_buckets:
         assert bucket not in bucket_names
+
+
+def test_drop_bucket_failure_raises(monkeypatch, s3_client):
+    """
+    Story: A bucket that cannot be emptied is not reported as dropped
+
+    Given two test buckets, one of which rejects its object deletes
+    When we call drop_bucket with both
+    Then it raises naming the failed bucket
+    And the other bucket is still dropped
+    """
+    # Arrange
+    client = s3_client
+    failing, healthy = f"test-drop-fail-a-{WORKER}", f"test-drop-fail-b-{WORKER}"
+    drop_bucket(buckets=[failing, healthy])
+    for bucket in (failing, healthy):
+        client.create_bucket(Bucket=bucket)
+
+    original_delete_all_objects = drop_bucket_module.delete_all_objects
+
+    def delete_all_objects(client, bucket_name):
+        if bucket_name == failing:
+            return [{"Key": "file.txt", "Code": "AccessDenied"}]
+        return original_delete_all_objects(client, bucket_name)
+
+    # Act / Assert (patch scoped to the call so restore_buckets can drop the leftover)
+    with monkeypatch.context() as patch:
+        patch.setattr(drop_bucket_module, "delete_all_objects", delete_all_objects)
+        with pytest.raises(RuntimeError, match=failing):
+            drop_bucket(buckets=[failing, healthy])
+
+    bucket_names = [b["Name"] for b in client.list_buckets().get("Buckets", [])]
+    assert failing in bucket_names
+    assert healthy not in bucket_names
@@ -90,11 +90,37 @@ def test_quote_identifier_no_quoting_needed():
     assert quote_identifier("test123") == "test123"
 
 
+def test_quote_identifier_escapes_embedded_quotes():
+    """
+    Story: Embedded double quotes are escaped
+
+    Given an identifier containing a double quote
+    When we call quote_identifier
+    Then the identifier is quoted and the embedded quote is doubled
+    """
+    assert quote_identifier('my"table') == '"my""table"'
+
+
+def test_quote_identifier_reserved_keywords():
+    """
+    Story: Reserved keywords are quoted even though they look safe
+
+    Given lowercase identifiers that PostgreSQL reserves (order, user, table)
+    When we call quote_identifier
+    Then each one is quoted, while a non-reserved word stays bare
+    """
+    assert quote_identifier("order") == '"order"'
+    assert quote_identifier("user") == '"user"'
+    assert quote_identifier("table") == '"table"'
+    assert quote_identifier("users") == "users"
+
+
 #
 # Tests for drop_table function
 #
 
 
+@pytest.mark.slow_etl
 def test_drop_tables_with_empty_schemas_list():
     """
     Story: Dropping with empty schemas list drops all schemas from data/tables
@@ -110,6 +136,7 @@ def test_drop_tables_with_empty_schemas_list():
     assert data["schemas_dropped"] >= 1
 
 
+@pytest.mark.slow_etl
 def test_drop_tables_with_nonexistent_schema():
     """
     Story: Dropping nonexistent schema succeeds (IF EXISTS)
@@ -124,6 +151,7 @@ def test_drop_tables_with_nonexistent_schema():
     assert data["schemas_dropped"] == 1
 
 
+@pytest.mark.slow_etl
 def test_drop_tables_no_schemas_specified():
     """
     Story: Empty body drops all schemas from data/tables
@@ -139,6 +167,7 @@ def test_drop_tables_no_schemas_specified():
     assert data["schemas_dropped"] >= 1
 
 
+@pytest.mark.slow_etl
 def test_drop_tables_response_structure():
     """
     Story: Endpoint returns proper response structure
@@ -5,15 +5,12 @@
 # Third party
 import pytest
 
-# Module under test
-from dev.etl.reset_all import reset_all
-
 
 #
-# Fixtures
+# Markers
 #
 
-pytestmark = pytest.mark.usefixtures("restore_buckets")
+pytestmark = pytest.mark.slow_etl
 
 
 #
@@ -21,15 +18,15 @@ pytestmark = pytest.mark.usefixtures("restore_buckets")
 #
 
 
-def test_reset_all_success():
+def test_reset_all_success(reset_all_result):
     """
     Story: Reset all drops, creates, and seeds everything
 
     Given the database and MinIO are running
-    When we call reset_all
+    When reset_all has run (once, at session start)
     Then it returns success
     """
-    data = reset_all()
+    data = reset_all_result
 
     assert data["status"] == "success"
     assert "drop" in data
@@ -37,15 +34,15 @@ def test_reset_all_success():
     assert "seed" in data
 
 
-def test_reset_all_response_structure():
+def test_reset_all_response_structure(reset_all_result):
     """
     Story: Reset all returns proper response structure
 
     Given a valid request
-    When we call reset_all
+    When reset_all has run (once, at session start)
     Then it returns expected fields
     """
-    data = reset_all()
+    data = reset_all_result
 
     assert "status" in data
     assert "message" in data
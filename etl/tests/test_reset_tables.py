@@ -2,9 +2,20 @@
 # Imports
 #
 
+# Third party
+import pytest
+
 # Module under test
 from dev.etl.reset_tables import reset_table
 
+
+#
+# Markers
+#
+
+pytestmark = pytest.mark.slow_etl
+
+
 #
 # Tests for reset_table function
 #
@@ -16,27 +27,11 @@ def test_reset_table_success():
 
     Given the database is running
     When we call reset_table
-    Then it returns success
+    Then it returns success with the expected response fields
     """
     data = reset_table()
 
     assert data["status"] == "success"
-    assert "drop" in data
-    assert "create" in data
-    assert "seed" in data
-
-
-def test_reset_table_response_structure():
-    """
-    Story: Reset table returns proper response structure
-
-    Given a valid request
-    When we call reset_table
-    Then it returns expected fields
-    """
-    data = reset_table()
-
-    assert "status" in data
     assert "message" in data
     assert "drop" in data
     assert "create" in data
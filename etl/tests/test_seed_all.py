@@ -13,7 +13,7 @@ from dev.etl.seed_all import seed_all
 # Fixtures
 #
 
-pytestmark = pytest.mark.usefixtures("restore_buckets")
+pytestmark = [pytest.mark.slow_etl, pytest.mark.usefixtures("restore_buckets")]
 
 
 #
@@ -27,26 +27,11 @@ def test_seed_all_success():
 
     Given the database and MinIO are running with tables/buckets created
     When we call seed_all
-    Then it returns success
+    Then it returns success with the expected response fields
     """
     data = seed_all()
 
     assert data["status"] == "success"
-    assert "bucket" in data
-    assert "tables" in data
-
-
-def test_seed_all_response_structure():
-    """
-    Story: Seed all returns proper response structure
-
-    Given a valid request
-    When we call seed_all
-    Then it returns expected fields
-    """
-    data = seed_all()
-
-    assert "status" in data
     assert "message" in data
     assert "bucket" in data
     assert "tables" in data
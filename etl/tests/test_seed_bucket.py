@@ -5,7 +5,11 @@
 # Third party
 import pytest
 
+# Local
+from dev.etl.tests._constants import WORKER
+
 # Module under test
+import dev.etl.seed_bucket as seed_bucket_module
 from dev.etl.create_bucket import create_bucket
 from dev.etl.seed_bucket import seed_bucket
 
@@ -14,7 +18,7 @@ from dev.etl.seed_bucket import seed_bucket
 # Fixtures
 #
 
-pytestmark = pytest.mark.usefixtures("restore_buckets")
+pytestmark = [pytest.mark.slow_etl, pytest.mark.usefixtures("restore_buckets")]
 
 
 #
@@ -66,3 +70,28 @@ def test_seed_bucket_response_structure():
 
     assert "status" in data
     assert "message" in data
+
+
+def test_seed_bucket_upload_failure_raises(monkeypatch, redirect_buckets_dir, s3_client):
+    """
+    Story: A failed upload is not reported as success
+
+    Given a bucket with a local file whose upload fails
+    When we call seed_bucket
+    Then it raises naming the object that failed
+    """
+    # Arrange
+    bucket_name = f"etl-test-seed-fail-{WORKER}"
+    s3_client.create_bucket(Bucket=bucket_name)
+    bucket_dir = redirect_buckets_dir / bucket_name
+    bucket_dir.mkdir()
+    (bucket_dir / "a.txt").write_text("a")
+
+    def fail_upload(client, file_path, bucket_name, object_key):
+        raise OSError("connection reset")
+
+    # Act / Assert (patch scoped to the call so restore_buckets can reseed afterwards)
+    with monkeypatch.context() as patch:
+        patch.setattr(seed_bucket_module, "upload_file", fail_upload)
+        with pytest.raises(RuntimeError, match=f"{bucket_name}/a.txt"):
+            seed_bucket(buckets=[bucket_name])
@@ -2,24 +2,24 @@
 # Imports
 #
 
-# Standard library
-import os
-import tempfile
-from pathlib import Path
+# Third party
+import pytest
+
+# Local
+from dev.etl.tests._constants import CATALOG_SQL, THEME_SQL, WORKER
 
 # Source module
-from dev.db import get_connection
-from dev.etl.create_tables import create_table, find_create_sql_files
-from dev.etl.drop_tables import drop_table
+from dev.etl.create_tables import create_table
+from dev.etl.drop_tables import drop_table, quote_identifier
 from dev.etl.seed_tables import (
     extract_table_name_from_create_sql,
     find_catalog_csv_files,
     find_seed_csv_files,
     has_serial_column,
-    quote_identifier,
     quote_schema_table,
     reset_serial_sequence,
     seed_catalog_files,
+    seed_one_table,
     seed_table,
 )
 
@@ -28,7 +28,7 @@ from dev.etl.seed_tables import (
 #
 
 
-def test_find_seed_csv_files_all():
+def test_find_seed_csv_files_all(tables_dir):
     """
     Story: Find all seed.csv files in tables directory
 
@@ -36,7 +36,6 @@ def test_find_seed_csv_files_all():
     When we call find_seed_csv_files with no filter
     Then all seed.csv files are returned except meta/catalog
     """
-    tables_dir = os.path.join(os.path.dirname(__file__), "../../../data/tables")
     files = find_seed_csv_files(tables_dir)
     assert len(files) > 0
     assert all(f.endswith("seed.csv") for f in files)
@@ -44,7 +43,7 @@ def test_find_seed_csv_files_all():
     assert not any("meta/catalog/seed.csv" in f for f in files)
 
 
-def test_find_seed_csv_files_with_usernames():
+def test_find_seed_csv_files_with_usernames(tables_dir):
     """
     Story: Find seed.csv files only for specific usernames
 
@@ -52,13 +51,24 @@ def test_find_seed_csv_files_with_usernames():
     When we call find_seed_csv_files with a username filter
     Then only seed.csv files for that username are returned
     """
-    tables_dir = os.path.join(os.path.dirname(__file__), "../../../data/tables")
     files = find_seed_csv_files(tables_dir, usernames=["meta"])
     assert len(files) > 0
     assert all("meta" in f for f in files)
 
 
-def test_find_seed_csv_files_nonexistent_username():
+def test_find_seed_csv_files_duplicate_usernames(tables_dir):
+    """
+    Story: Scan each username directory once
+
+    Given a username filter that repeats the same username
+    When we call find_seed_csv_files with that filter
+    Then each seed.csv file is returned once
+    """
+    files = find_seed_csv_files(tables_dir, usernames=["meta", "meta"])
+    assert files == find_seed_csv_files(tables_dir, usernames=["meta"])
+
+
+def test_find_seed_csv_files_nonexistent_username(tables_dir):
     """
     Story: Return empty list for nonexistent username
 
@@ -66,7 +76,6 @@ def test_find_seed_csv_files_nonexistent_username():
     When we call find_seed_csv_files with that username
     Then an empty list is returned
     """
-    tables_dir = os.path.join(os.path.dirname(__file__), "../../../data/tables")
     files = find_seed_csv_files(tables_dir, usernames=["nonexistent_user_xyz"])
     assert files == []
 
@@ -76,7 +85,7 @@ def test_find_seed_csv_files_nonexistent_username():
 #
 
 
-def test_find_catalog_csv_files_default_schemas():
+def test_find_catalog_csv_files_default_schemas(tables_dir):
     """
     Story: Find catalog.csv files in default schemas
 
@@ -84,13 +93,12 @@ def test_find_catalog_csv_files_default_schemas():
     When we call find_catalog_csv_files with no filter
     Then catalog.csv files from default schemas are returned
     """
-    tables_dir = os.path.join(os.path.dirname(__file__), "../../../data/tables")
     files = find_catalog_csv_files(tables_dir)
     assert len(files) > 0
     assert all(f.endswith("catalog.csv") for f in files)
 
 
-def test_find_catalog_csv_files_specific_schema():
+def test_find_catalog_csv_files_specific_schema(tables_dir):
     """
     Story: Find catalog.csv files in specific schema
 
@@ -98,13 +106,12 @@ def test_find_catalog_csv_files_specific_schema():
     When we call find_catalog_csv_files with a schema filter
     Then only catalog.csv files for that schema are returned
     """
-    tables_dir = os.path.join(os.path.dirname(__file__), "../../../data/tables")
     files = find_catalog_csv_files(tables_dir, schemas=["meta"])
     assert len(files) > 0
     assert all("meta" in f for f in files)
 
 
-def test_find_catalog_csv_files_nonexistent_schema():
+def test_find_catalog_csv_files_nonexistent_schema(tables_dir):
     """
     Story: Return empty list for nonexistent schema
 
@@ -112,7 +119,6 @@ def test_find_catalog_csv_files_nonexistent_schema():
     When we call find_catalog_csv_files with that schema
     Then an empty list is returned
     """
-    tables_dir = os.path.join(os.path.dirname(__file__), "../../../data/tables")
     files = find_catalog_csv_files(tables_dir, schemas=["nonexistent_schema_xyz"])
     assert files == []
 
@@ -122,6 +128,7 @@ def test_find_catalog_csv_files_nonexistent_schema():
 #
 
 
+@pytest.mark.skipif(not THEME_SQL.exists(), reason="meta/theme/create.sql not in data/tables")
 def test_extract_table_name_from_create_sql():
     """
     Story: Extract table name from a real create.sql file
@@ -130,12 +137,9 @@ def test_extract_table_name_from_create_sql():
     When we call extract_table_name_from_create_sql
     Then the schema.table name is extracted from the SQL
     """
-    tables_dir = os.path.join(os.path.dirname(__file__), "../../../data/tables")
-    sql_files = find_create_sql_files(tables_dir, usernames=["meta"])
-    if sql_files:
-        table_name = extract_table_name_from_create_sql(sql_files[0])
-        assert table_name is not None
-        assert "." in table_name  # Should be schema.table format
+    table_name = extract_table_name_from_create_sql(str(THEME_SQL))
+    assert table_name is not None
+    assert "." in table_name  # Should be schema.table format
 
 
 def test_extract_table_name_nonexistent_file():
@@ -150,7 +154,7 @@ def test_extract_table_name_nonexistent_file():
     assert table_name is None
 
 
-def test_extract_table_name_quoted_schema():
+def test_extract_table_name_quoted_schema(tmp_path):
     """
     Story: Extract table name from SQL with quoted schema.table
 
@@ -158,15 +162,14 @@ def test_extract_table_name_quoted_schema():
     When we call extract_table_name_from_create_sql
     Then the schema.table name is extracted without quotes
     """
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".sql", delete=False) as f:
-        f.write('CREATE TABLE "meta"."users" (id SERIAL);')
-        f.flush()
-        table_name = extract_table_name_from_create_sql(f.name)
-        assert table_name == "meta.users"
-        os.unlink(f.name)
+    sql_path = tmp_path / "create.sql"
+    sql_path.write_text('CREATE TABLE "meta"."users" (id SERIAL);')
 
+    table_name = extract_table_name_from_create_sql(str(sql_path))
+    assert table_name == "meta.users"
 
-def test_extract_table_name_no_match():
+
+def test_extract_table_name_no_match(tmp_path):
     """
     Story: Return None when SQL has no CREATE TABLE
 
@@ -174,12 +177,11 @@ def test_extract_table_name_no_match():
     When we call extract_table_name_from_create_sql
     Then None is returned
     """
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".sql", delete=False) as f:
-        f.write("SELECT * FROM users;")
-        f.flush()
-        table_name = extract_table_name_from_create_sql(f.name)
-        assert table_name is None
-        os.unlink(f.name)
+    sql_path = tmp_path / "create.sql"
+    sql_path.write_text("SELECT * FROM users;")
+
+    table_name = extract_table_name_from_create_sql(str(sql_path))
+    assert table_name is None
 
 
 #
@@ -291,11 +293,24 @@ def test_quote_schema_table_no_dot():
     assert quote_schema_table("users") == "users"
 
 
+def test_quote_schema_table_reserved_word_and_quote():
+    """
+    Story: Quote reserved words and embedded quotes in schema.table
+
+    Given a table named after a reserved word, and one containing a double quote
+    When we call quote_schema_table
+    Then the reserved word is quoted and the embedded quote is escaped
+    """
+    assert quote_schema_table("meta.order") == 'meta."order"'
+    assert quote_schema_table('meta.a"b') == 'meta."a""b"'
+
+
 #
 # Tests for has_serial_column
 #
 
 
+@pytest.mark.skipif(not THEME_SQL.exists(), reason="meta/theme/create.sql not in data/tables")
 def test_has_serial_column_with_serial():
     """
     Story: Detect SERIAL in create.sql
@@ -304,14 +319,12 @@ def test_has_serial_column_with_serial():
     When we call has_serial_column
     Then it returns True
     """
-    tables_dir = os.path.join(os.path.dirname(__file__), "../../../data/tables")
 
     # meta.theme has ID SERIAL
-    theme_sql = os.path.join(tables_dir, "meta/theme/create.sql")
-    if os.path.exists(theme_sql):
-        assert has_serial_column(theme_sql) is True
+    assert has_serial_column(str(THEME_SQL)) is True
 
 
+@pytest.mark.skipif(not CATALOG_SQL.exists(), reason="meta/catalog/create.sql not in data/tables")
 def test_has_serial_column_without_serial():
     """
     Story: Return False for files without SERIAL
@@ -320,12 +333,9 @@ def test_has_serial_column_without_serial():
     When we call has_serial_column
     Then it returns False
     """
-    tables_dir = os.path.join(os.path.dirname(__file__), "../../../data/tables")
 
     # meta.catalog has no SERIAL columns
-    catalog_sql = os.path.join(tables_dir, "meta/catalog/create.sql")
-    if os.path.exists(catalog_sql):
-        assert has_serial_column(catalog_sql) is False
+    assert has_serial_column(str(CATALOG_SQL)) is False
 
 
 def test_has_serial_column_nonexistent_file():
@@ -344,7 +354,8 @@ def test_has_serial_column_nonexistent_file():
 #
 
 
-def test_reset_serial_sequence():
+@pytest.mark.slow_etl
+def test_reset_serial_sequence(db_cursor):
     """
     Story: Reset SERIAL sequence so nextval returns MAX(ID) + 1
 
@@ -352,23 +363,21 @@ def test_reset_serial_sequence():
     When we call reset_serial_sequence
     Then the next sequence value is MAX(ID) + 1
     """
-    conn = get_connection()
-    cursor = conn.cursor()
+    conn, cursor = db_cursor
 
-    # Create a temp table with SERIAL
+    # Create a temp table with SERIAL and insert a row with a specific high ID
+    # (one multi-statement round trip)
     cursor.execute(
         """
         CREATE TABLE IF NOT EXISTS meta.test_serial_reset (
             "ID" SERIAL PRIMARY KEY,
             "Name" TEXT NOT NULL
-        )
-        """
+        );
+        TRUNCATE meta.test_serial_reset CASCADE;
+        INSERT INTO meta.test_serial_reset ("ID", "Name") VALUES (100, %s);
+        """,
+        ("test",),
     )
-    cursor.execute("TRUNCATE meta.test_serial_reset CASCADE")
-    conn.commit()
-
-    # Insert a row with specific high ID
-    cursor.execute('INSERT INTO meta.test_serial_reset ("ID", "Name") VALUES (100, %s)', ("test",))
     conn.commit()
 
     # Reset sequence
@@ -383,11 +392,10 @@ def test_reset_serial_sequence():
     # Cleanup
     cursor.execute("DROP TABLE IF EXISTS meta.test_serial_reset")
     conn.commit()
-    cursor.close()
-    conn.close()
 
 
-def test_reset_serial_sequence_no_id_column():
+@pytest.mark.slow_etl
+def test_reset_serial_sequence_no_id_column(db_cursor):
     """
     Story: Early return when table has no ID column
 
@@ -395,8 +403,7 @@ def test_reset_serial_sequence_no_id_column():
     When we call reset_serial_sequence
     Then it returns without error
     """
-    conn = get_connection()
-    cursor = conn.cursor()
+    conn, cursor = db_cursor
 
     # Create a temp table without an "ID" column
     cursor.execute(
@@ -415,8 +422,6 @@ def test_reset_serial_sequence_no_id_column():
     # Cleanup
     cursor.execute("DROP TABLE IF EXISTS meta.test_no_id_col")
     conn.commit()
-    cursor.close()
-    conn.close()
 
 
 #
@@ -424,6 +429,7 @@ def test_reset_serial_sequence_no_id_column():
 #
 
 
+@pytest.mark.slow_etl
 def test_seed_catalog_files_no_catalogs(temp_tables_dir):
     """
     Story: Return 0 when no catalog.csv files exist
@@ -439,6 +445,7 @@ def test_seed_catalog_files_no_catalogs(temp_tables_dir):
     assert result == 0
 
 
+@pytest.mark.slow_etl
 def test_seed_catalog_files_empty_catalog(empty_catalog_file):
     """
     Story: Skip catalog.csv files with no data rows
@@ -456,45 +463,33 @@ def test_seed_catalog_files_empty_catalog(empty_catalog_file):
 #
 
 # Use a non-existent schema to avoid modifying real data
-TEST_SCHEMA = "etl_test_nonexistent"
+TEST_SCHEMA = f"etl_test_nonexistent_{WORKER}"
 
 #
 # Tests for seed_table function
 #
 
 
+@pytest.mark.slow_etl
 def test_seed_table_success():
     """
     Story: Seed table populates tables from CSV files
 
     Given the database has tables created
     When we call seed_table with isolated schema
-    Then it returns success
-    """
-    data = seed_table(usernames=[TEST_SCHEMA])
-
-    assert data["status"] == "success"
-    assert "tables_seeded" in data
-
-
-def test_seed_table_response_structure():
-    """
-    Story: Seed table returns proper response structure
-
-    Given a valid request
-    When we call seed_table
-    Then it returns expected fields
+    Then it returns success with the expected response fields
     And the iterations key is not present (DAG replaced retry loop)
     """
     data = seed_table(usernames=[TEST_SCHEMA])
 
-    assert "status" in data
+    assert data["status"] == "success"
     assert "message" in data
     assert "tables_seeded" in data
     assert "catalogs_seeded" in data
     assert "iterations" not in data
 
 
+@pytest.mark.slow_etl
 def test_seed_table_with_usernames_filter():
     """
     Story: Seed table can filter by usernames
@@ -508,26 +503,8 @@ def test_seed_table_with_usernames_filter():
     assert data["status"] == "success"
 
 
-def test_seed_table_actually_seeds():
-    """
-    Story: Seed table successfully imports CSV data into database
-
-    Given the database has tables created for meta schema
-    When we call seed_table with meta
-    Then tables are populated from seed.csv files
-    """
-    # Ensure tables exist
-    drop_table(schemas=["meta"])
-    create_table(usernames=["meta"])
-
-    # Seed the tables
-    data = seed_table(usernames=["meta"])
-
-    assert data["status"] == "success"
-    assert data["tables_seeded"] > 0
-
-
-def test_seed_csv_without_create_sql_is_skipped():
+@pytest.mark.slow_etl
+def test_seed_csv_without_create_sql_is_skipped(redirect_bad_seed_tables):
     """
     Story: seed.csv files without matching create.sql are skipped
 
@@ -535,36 +512,26 @@ def test_seed_csv_without_create_sql_is_skipped():
     When we call seed_table
     Then it skips that file and returns success with 0 tables
     """
-    # Create a seed.csv in data/tables without create.sql
-    project_root = Path(__file__).parent.parent.parent.parent
-    tables_dir = project_root / "data" / "tables"
-    test_dir = tables_dir / "etl_test_no_create" / "test_table"
-    test_dir.mkdir(parents=True, exist_ok=True)
-    seed_file = test_dir / "seed.csv"
-    seed_file.write_text("col1,col2\na,b\n")
-
     # Call function - should skip the file without create.sql
     data = seed_table(usernames=["etl_test_no_create"])
 
     assert data["status"] == "success"
     assert data["tables_seeded"] == 0
 
-    # Cleanup
-    seed_file.unlink()
-    test_dir.rmdir()
-    (tables_dir / "etl_test_no_create").rmdir()
-
 
+@pytest.mark.slow_etl
 def test_seed_table_dependency_order():
     """
     Story: Tables are seeded in dependency order
 
-    Given meta tables with FK relationships
+    Given meta tables with FK relationships, freshly dropped and created
     When we call seed_table for meta
-    Then all tables are seeded successfully (no FK constraint errors)
+    Then tables are populated from seed.csv files
+    And all tables are seeded successfully (no FK constraint errors)
     """
 
-    # Arrange — ensure tables exist
+    # Arrange — ensure tables exist (kept in the test body: a module-scoped fixture would run
+    # before db_rollback patches the connection, committing empty meta tables for later tests)
     drop_table(schemas=["meta"])
     create_table(usernames=["meta"])
 
@@ -577,7 +544,8 @@ def test_seed_table_dependency_order():
     assert "failed_tables" not in data
 
 
-def test_seed_table_with_persistent_failure():
+@pytest.mark.slow_etl
+def test_seed_table_with_persistent_failure(db_cursor, redirect_bad_seed_tables):
     """
     Story: Tables that fail to seed are reported in response
 
@@ -586,33 +554,18 @@ def test_seed_table_with_persistent_failure():
     Then response includes failed_tables count
     """
     # Create a test schema and table with a required column
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("CREATE SCHEMA IF NOT EXISTS etl_test_fail")
+    # (create.sql and the short seed.csv come from the session's bad seed tree)
+    conn, cursor = db_cursor
     cursor.execute(
         """
+        CREATE SCHEMA IF NOT EXISTS etl_test_fail;
         CREATE TABLE IF NOT EXISTS etl_test_fail.bad_table (
             "Name" TEXT NOT NULL,
             "Required" TEXT NOT NULL
-        )
+        );
         """
     )
     conn.commit()
-    cursor.close()
-    conn.close()
-
-    # Create data files: create.sql matches DB, but seed.csv has wrong column count
-    project_root = Path(__file__).parent.parent.parent.parent
-    tables_dir = project_root / "data" / "tables"
-    test_dir = tables_dir / "etl_test_fail" / "bad_table"
-    test_dir.mkdir(parents=True, exist_ok=True)
-
-    create_sql = test_dir / "create.sql"
-    create_sql.write_text(
-        'CREATE TABLE etl_test_fail.bad_table ("Name" TEXT NOT NULL, "Required" TEXT NOT NULL);'
-    )
-    seed_csv = test_dir / "seed.csv"
-    seed_csv.write_text("Name\ntest_value\n")
 
     # Call function - should report failure
     data = seed_table(usernames=["etl_test_fail"])
@@ -620,17 +573,82 @@ def test_seed_table_with_persistent_failure():
     assert data["status"] == "success"
     assert "failed_tables" in data
 
-    # Cleanup files
-    create_sql.unlink()
-    seed_csv.unlink()
-    test_dir.rmdir()
-    (tables_dir / "etl_test_fail").rmdir()
+    # Cleanup database
+    cursor.execute(
+        "DROP TABLE IF EXISTS etl_test_fail.bad_table; DROP SCHEMA IF EXISTS etl_test_fail;"
+    )
+    conn.commit()
+
+
+@pytest.mark.slow_etl
+def test_seed_one_table_reports_copy_error(db_cursor, bad_seed_tables_dir):
+    """
+    Story: A failing COPY is reported without breaking the connection
+
+    Given a table whose seed.csv is missing a required column
+    When we call seed_one_table directly (no discovery or create.sql parsing)
+    Then it returns an error message prefixed with the table name
+    And the connection can still run the next statement
+    """
+    # Arrange
+    conn, cursor = db_cursor
+    cursor.execute(
+        """
+        CREATE SCHEMA IF NOT EXISTS etl_test_fail;
+        CREATE TABLE IF NOT EXISTS etl_test_fail.bad_table (
+            "Name" TEXT NOT NULL,
+            "Required" TEXT NOT NULL
+        );
+        """
+    )
+    conn.commit()
+    seed_csv = bad_seed_tables_dir / "etl_test_fail" / "bad_table" / "seed.csv"
+
+    # Act
+    error = seed_one_table(conn, "etl_test_fail.bad_table", str(seed_csv), False)
+
+    # Assert
+    assert error is not None
+    assert error.startswith("etl_test_fail.bad_table: ")
+    with conn.cursor() as check:
+        check.execute("SELECT 1 AS ok")
+        assert check.fetchone()["ok"] == 1
+
+
+@pytest.mark.slow_etl
+def test_seed_table_reserved_word_table_name(db_cursor, redirect_tables_dir):
+    """
+    Story: Tables named after reserved words can be seeded
+
+    Given a table "order" with a column "user" (both reserved words) and its seed.csv
+    When we call seed_table for its schema
+    Then the table is seeded without errors
+    """
+    # Arrange
+    conn, cursor = db_cursor
+    cursor.execute(
+        """
+        CREATE SCHEMA IF NOT EXISTS etl_test_reserved;
+        CREATE TABLE etl_test_reserved."order" ("user" TEXT NOT NULL);
+        """
+    )
+    conn.commit()
+    table_dir = redirect_tables_dir / "etl_test_reserved" / "order"
+    table_dir.mkdir(parents=True)
+    (table_dir / "create.sql").write_text(
+        'CREATE TABLE etl_test_reserved."order" ("user" TEXT NOT NULL);'
+    )
+    (table_dir / "seed.csv").write_text("user\nalice\n")
+
+    # Act
+    data = seed_table(usernames=["etl_test_reserved"])
+
+    # Assert
+    assert data["tables_seeded"] == 1
+    assert "failed_tables" not in data
+    cursor.execute('SELECT "user" FROM etl_test_reserved."order"')
+    assert [row["user"] for row in cursor.fetchall()] == ["alice"]
 
     # Cleanup database
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DROP TABLE IF EXISTS etl_test_fail.bad_table")
-    cursor.execute("DROP SCHEMA IF EXISTS etl_test_fail")
+    cursor.execute("DROP SCHEMA IF EXISTS etl_test_reserved CASCADE")
     conn.commit()
-    cursor.close()
-    conn.close()
@@ -13,7 +13,10 @@ from dev.etl.snapshot_all import snapshot_all
 # Fixtures
 #
 
-pytestmark = pytest.mark.usefixtures("restore_buckets", "redirect_all_paths")
+pytestmark = [
+    pytest.mark.slow_etl,
+    pytest.mark.usefixtures("restore_buckets", "redirect_all_paths"),
+]
 
 
 #
@@ -27,26 +30,11 @@ def test_snapshot_all_success():
 
     Given the database and MinIO are running
     When we call snapshot_all
-    Then it returns success
+    Then it returns success with the expected response fields
     """
     data = snapshot_all()
 
     assert data["status"] == "success"
-    assert "tables" in data
-    assert "bucket" in data
-
-
-def test_snapshot_all_response_structure():
-    """
-    Story: Snapshot all returns proper response structure
-
-    Given a valid request
-    When we call snapshot_all
-    Then it returns expected fields
-    """
-    data = snapshot_all()
-
-    assert "status" in data
     assert "message" in data
     assert "tables" in data
     assert "bucket" in data
@@ -2,25 +2,22 @@
 # Imports
 #
 
-# Standard library
-import os
-
 # Third party
 import pytest
 
+# Local
+from dev.etl.tests._constants import WORKER
+
 # Module under test
 from dev.etl.drop_bucket import drop_bucket
 from dev.etl.snapshot_buckets import snapshot_bucket
 
-# Storage client
-from dev.storage import get_s3_client
-
 
 #
 # Fixtures
 #
 
-pytestmark = pytest.mark.usefixtures("restore_buckets")
+pytestmark = [pytest.mark.slow_etl, pytest.mark.usefixtures("restore_buckets")]
 
 
 #
@@ -28,58 +25,13 @@ pytestmark = pytest.mark.usefixtures("restore_buckets")
 #
 
 # Use isolated test bucket names
-TEST_BUCKET = "etl-test-snapshot-bucket"
-MINIO_ENDPOINT = f"http://{os.getenv('MINIO_EXTERNAL_HOST', 'localhost')}:{os.getenv('MINIO_INTERNAL_PORT', '3462')}"
+TEST_BUCKET = f"etl-test-snapshot-bucket-{WORKER}"
 
 #
 # Tests for snapshot_bucket function
 #
 
 
-def test_snapshot_bucket_success(redirect_buckets_dir):
-    """
-    Story: Snapshot bucket saves bucket contents to filesystem
-
-    Given buckets exist in MinIO
-    When we call snapshot_bucket with isolated bucket
-    Then bucket contents are saved
-    """
-    # Create isolated test bucket
-    client = get_s3_client(endpoint_url=MINIO_ENDPOINT)
-    drop_bucket(buckets=[TEST_BUCKET])
-    client.create_bucket(Bucket=TEST_BUCKET)
-
-    # Snapshot only our test bucket
-    data = snapshot_bucket(buckets=[TEST_BUCKET])
-
-    assert data["status"] == "success"
-
-    # Cleanup
-    drop_bucket(buckets=[TEST_BUCKET])
-
-
-def test_snapshot_bucket_response_structure(redirect_buckets_dir):
-    """
-    Story: Snapshot bucket returns proper response structure
-
-    Given a valid request
-    When we call snapshot_bucket
-    Then it returns expected fields
-    """
-    # Create isolated test bucket
-    client = get_s3_client(endpoint_url=MINIO_ENDPOINT)
-    drop_bucket(buckets=[TEST_BUCKET])
-    client.create_bucket(Bucket=TEST_BUCKET)
-
-    data = snapshot_bucket(buckets=[TEST_BUCKET])
-
-    assert "status" in data
-    assert "message" in data
-
-    # Cleanup
-    drop_bucket(buckets=[TEST_BUCKET])
-
-
 def test_snapshot_bucket_empty_list():
     """
     Story: Snapshot with empty bucket list returns early
@@ -94,16 +46,17 @@ def test_snapshot_bucket_empty_list():
     assert data["buckets_snapshotted"] == []
 
 
-def test_snapshot_bucket_full_sync_cycle(redirect_buckets_dir):
+def test_snapshot_bucket_full_sync_cycle(redirect_buckets_dir, s3_client):
     """
     Story: Full sync cycle covers download, re-download, and delete
 
     Given a bucket with files in MinIO
     When we snapshot, modify local, snapshot again, delete from MinIO, snapshot again
-    Then downloads, re-downloads, and deletes are tracked
+    Then each snapshot reports success (with a message)
+    And downloads, re-downloads, and deletes are tracked
     """
-    client = get_s3_client(endpoint_url=MINIO_ENDPOINT)
-    bucket_name = "etl-test-snapshot-sync"
+    client = s3_client
+    bucket_name = TEST_BUCKET
     user_prefix = "etlsyncuser"
 
     # Filesystem writes go to tmp_path via redirect_buckets_dir
@@ -122,6 +75,8 @@ def test_snapshot_bucket_full_sync_cycle(redirect_buckets_dir):
 
         # Step 1: First snapshot — downloads both files
         data = snapshot_bucket(buckets=[bucket_name])
+        assert data["status"] == "success"
+        assert "message" in data
         assert data["buckets_snapshotted"][0]["downloaded"] == 2
 
         # Verify files were downloaded to tmp_path (under bucket_name subdirectory)
@@ -134,15 +89,41 @@ def test_snapshot_bucket_full_sync_cycle(redirect_buckets_dir):
         local_path_a.write_text("different size content that is much longer than before")
 
         data = snapshot_bucket(buckets=[bucket_name])
+        assert data["status"] == "success"
         assert data["buckets_snapshotted"][0]["downloaded"] == 1
 
         # Step 3: Delete file-a from MinIO (keep file-b so user loop still runs)
         client.delete_object(Bucket=bucket_name, Key=f"{user_prefix}/file-a.txt")
 
         data = snapshot_bucket(buckets=[bucket_name])
+        assert data["status"] == "success"
         assert data["buckets_snapshotted"][0]["deleted"] == 1
         assert not local_path_a.exists()
 
     finally:
         # Cleanup MinIO bucket only — filesystem is tmp_path, cleaned up automatically
         drop_bucket(buckets=[bucket_name])
+
+
+def test_snapshot_bucket_download_failure_raises(monkeypatch, redirect_buckets_dir, s3_client):
+    """
+    Story: A failed download is not reported as success
+
+    Given a bucket with an object whose download fails
+    When we call snapshot_bucket
+    Then it raises naming the object that failed
+    """
+    # Arrange
+    bucket_name = TEST_BUCKET
+    drop_bucket(buckets=[bucket_name])
+    s3_client.create_bucket(Bucket=bucket_name)
+    s3_client.put_object(Bucket=bucket_name, Key="etlsyncuser/file-a.txt", Body=b"hello")
+
+    def fail_download(bucket, key, filename, *args, **kwargs):
+        raise OSError("connection reset")
+
+    # Act / Assert (patch scoped to the call: the shared client outlives this test)
+    with monkeypatch.context() as patch:
+        patch.setattr(s3_client, "download_file", fail_download)
+        with pytest.raises(RuntimeError, match=f"{bucket_name}/etlsyncuser/file-a.txt"):
+            snapshot_bucket(buckets=[bucket_name])
@@ -3,13 +3,15 @@
 #
 
 # Standard library
-import os
 import tempfile
 from pathlib import Path
 
 # Third party
 import pytest
 
+# Local
+from dev.etl.tests._constants import THEME_SQL, WORKER
+
 # Module under test
 from dev.etl.snapshot_tables import (
     export_catalogs_to_csv,
@@ -23,8 +25,8 @@ from dev.etl.snapshot_tables import (
     table_to_file_path,
 )
 
-# Database
-from dev.db import get_connection
+# Paths
+import dev.paths as paths
 
 #
 # Tests for quote_identifier
@@ -184,6 +186,7 @@ def test_table_to_file_path_no_schema():
 #
 
 
+@pytest.mark.skipif(not THEME_SQL.exists(), reason="meta/theme/create.sql not in data/tables")
 def test_extract_table_name_from_real_file():
     """
     Story: Extract table name from a real create.sql file
@@ -192,14 +195,11 @@ def test_extract_table_name_from_real_file():
     When we call extract_table_name
     Then the schema.table name is extracted from the SQL
     """
-    tables_dir = os.path.join(os.path.dirname(__file__), "../../../data/tables")
 
     # Use meta/theme/create.sql as a known file
-    theme_sql = os.path.join(tables_dir, "meta/theme/create.sql")
-    if os.path.exists(theme_sql):
-        result = extract_table_name(theme_sql)
-        assert result is not None
-        assert "." in result  # Should be schema.table format
+    result = extract_table_name(str(THEME_SQL))
+    assert result is not None
+    assert "." in result  # Should be schema.table format
 
 
 #
@@ -207,40 +207,29 @@ def test_extract_table_name_from_real_file():
 #
 
 # Use a non-existent schema to avoid modifying real data
-TEST_SCHEMA = "etl_test_nonexistent"
+TEST_SCHEMA = f"etl_test_nonexistent_{WORKER}"
 
 #
 # Tests for snapshot_table function
 #
 
 
+@pytest.mark.slow_etl
 def test_snapshot_table_success():
     """
     Story: Snapshot table saves table data to CSV files
 
     Given tables exist in the database
     When we call snapshot_table with isolated schema
-    Then it returns success
+    Then it returns success with the expected response fields
     """
     data = snapshot_table(usernames=[TEST_SCHEMA])
 
     assert data["status"] == "success"
-
-
-def test_snapshot_table_response_structure():
-    """
-    Story: Snapshot table returns proper response structure
-
-    Given a valid request
-    When we call snapshot_table
-    Then it returns expected fields
-    """
-    data = snapshot_table(usernames=[TEST_SCHEMA])
-
-    assert "status" in data
     assert "message" in data
 
 
+@pytest.mark.slow_etl
 def test_snapshot_table_with_usernames_filter():
     """
     Story: Snapshot table can filter by usernames
@@ -259,7 +248,8 @@ def test_snapshot_table_with_usernames_filter():
 #
 
 
-def test_snapshot_table_full_sync_cycle(redirect_tables_dir):
+@pytest.mark.slow_etl
+def test_snapshot_table_full_sync_cycle(db_cursor, redirect_tables_dir):
     """
     Story: Snapshot table handles create, update, and delete lifecycle
 
@@ -271,8 +261,7 @@ def test_snapshot_table_full_sync_cycle(redirect_tables_dir):
     # Files go to tmp_path via redirect_tables_dir
     schema_dir = redirect_tables_dir / "etl_test_snap"
 
-    conn = get_connection()
-    cursor = conn.cursor()
+    conn, cursor = db_cursor
 
     try:
         # Setup: create schema and tables with various column types
@@ -361,8 +350,6 @@ def test_snapshot_table_full_sync_cycle(redirect_tables_dir):
         # Cleanup database only — filesystem is tmp_path, cleaned up automatically
         cursor.execute("DROP SCHEMA IF EXISTS etl_test_snap CASCADE")
         conn.commit()
-        cursor.close()
-        conn.close()
 
 
 #
@@ -370,6 +357,7 @@ def test_snapshot_table_full_sync_cycle(redirect_tables_dir):
 #
 
 
+@pytest.mark.slow_etl
 def test_snapshot_table_skips_invalid_create_sql(redirect_tables_dir):
     """
     Story: Files without valid CREATE TABLE are not treated as tables
@@ -394,6 +382,7 @@ def test_snapshot_table_skips_invalid_create_sql(redirect_tables_dir):
 #
 
 
+@pytest.mark.slow_etl
 def test_snapshot_table_unfiltered_exports_catalogs_and_diagram(redirect_all_paths):
     """
     Story: Unfiltered snapshot exports catalogs and generates ER diagram
@@ -550,7 +539,7 @@ def test_generate_er_diagram_edge_cases():
 #
 
 
-def test_load_schema_tables_skips_nonexistent_schema():
+def test_load_schema_tables_skips_nonexistent_schema(tables_dir):
     """
     Story: load_schema_tables_from_catalogs skips schemas without directories
 
@@ -559,10 +548,6 @@ def test_load_schema_tables_skips_nonexistent_schema():
     Then the missing schema is skipped and returns an empty list
     """
 
-    # Resolve tables directory
-    project_root = Path(__file__).parent.parent.parent.parent
-    tables_dir = project_root / "data" / "tables"
-
     # Include a schema that definitely doesn't exist
     result = load_schema_tables_from_catalogs(tables_dir, ["meta", "nonexistent_schema_xyz"])
 
@@ -576,7 +561,7 @@ def test_load_schema_tables_skips_nonexistent_schema():
 #
 
 
-def test_extract_table_name_returns_schema_dot_table():
+def test_extract_table_name_returns_schema_dot_table(tmp_path):
     """
     Story: extract_table_name parses quoted schema.table from CREATE TABLE SQL
 
@@ -586,18 +571,14 @@ def test_extract_table_name_returns_schema_dot_table():
     """
 
     # Quoted schema format hits group(1) + group(2) → line 222
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".sql", delete=False) as f:
-        f.write('CREATE TABLE "my_schema"."my_table" (id SERIAL PRIMARY KEY);')
-        sql_path = f.name
+    sql_path = tmp_path / "create.sql"
+    sql_path.write_text('CREATE TABLE "my_schema"."my_table" (id SERIAL PRIMARY KEY);')
 
-    try:
-        result = extract_table_name(sql_path)
-        assert result == "my_schema.my_table"
-    finally:
-        os.unlink(sql_path)
+    result = extract_table_name(str(sql_path))
+    assert result == "my_schema.my_table"
 
 
-def test_extract_table_name_returns_none_for_no_match():
+def test_extract_table_name_returns_none_for_no_match(tmp_path):
     """
     Story: extract_table_name returns None when no CREATE TABLE found
 
@@ -605,15 +586,11 @@ def test_extract_table_name_returns_none_for_no_match():
     When we call extract_table_name
     Then it returns None
     """
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".sql", delete=False) as f:
-        f.write("-- just a comment, no CREATE TABLE")
-        sql_path = f.name
+    sql_path = tmp_path / "create.sql"
+    sql_path.write_text("-- just a comment, no CREATE TABLE")
 
-    try:
-        result = extract_table_name(sql_path)
-        assert result is None
-    finally:
-        os.unlink(sql_path)
+    result = extract_table_name(str(sql_path))
+    assert result is None
 
 
 #
@@ -621,7 +598,8 @@ def test_extract_table_name_returns_none_for_no_match():
 #
 
 
-def test_export_catalogs_returns_zero_without_catalog_table():
+@pytest.mark.slow_etl
+def test_export_catalogs_returns_zero_without_catalog_table(db_cursor, tables_dir):
     """
     Story: export_catalogs_to_csv returns 0 when meta.catalog does not exist
 
@@ -629,8 +607,7 @@ def test_export_catalogs_returns_zero_without_catalog_table():
     When we call export_catalogs_to_csv
     Then it returns 0 immediately
     """
-    conn = get_connection()
-    cursor = conn.cursor()
+    conn, cursor = db_cursor
 
     # Back up meta.catalog into a temp table
     cursor.execute("CREATE TABLE meta.catalog_backup AS SELECT * FROM meta.catalog")
@@ -638,7 +615,6 @@ def test_export_catalogs_returns_zero_without_catalog_table():
     conn.commit()
 
     try:
-        tables_dir = Path(__file__).parent.parent.parent.parent / "data" / "tables"
         result = export_catalogs_to_csv(tables_dir)
         assert result == 0
 
@@ -647,8 +623,6 @@ def test_export_catalogs_returns_zero_without_catalog_table():
         cursor.execute("CREATE TABLE meta.catalog AS SELECT * FROM meta.catalog_backup")
         cursor.execute("DROP TABLE meta.catalog_backup")
         conn.commit()
-        cursor.close()
-        conn.close()
 
 
 #
@@ -656,6 +630,7 @@ def test_export_catalogs_returns_zero_without_catalog_table():
 #
 
 
+@pytest.mark.slow_etl
 def test_snapshot_creates_meta_catalog_with_order(redirect_all_paths):
     """
     Story: Snapshot creates meta.catalog with ORDER BY when table is new
@@ -683,3 +658,81 @@ def test_snapshot_creates_meta_catalog_with_order(redirect_all_paths):
     # Should have created files
     assert data["files_created"] >= 1
     assert seed_csv.exists()
+
+
+#
+# Tests for skipping unchanged seed.csv exports
+#
+
+
+@pytest.mark.slow_etl
+def test_snapshot_table_skips_unchanged_seed_exports(db_cursor, redirect_tables_dir):
+    """
+    Story: Snapshot only re-exports seed.csv when the table or the file changed
+
+    Given a table that has already been snapshotted
+    When we snapshot again without changes, then after an INSERT
+    Then the first re-run skips the export and the second one picks up the new row
+    """
+    seed_csv_path = redirect_tables_dir / "etl_test_skip" / "items" / "seed.csv"
+
+    conn, cursor = db_cursor
+
+    try:
+        cursor.execute("CREATE SCHEMA IF NOT EXISTS etl_test_skip")
+        cursor.execute("CREATE TABLE etl_test_skip.items (id SERIAL PRIMARY KEY, name TEXT)")
+        cursor.execute("INSERT INTO etl_test_skip.items (name) VALUES ('first')")
+        conn.commit()
+
+        # Initial snapshot creates and records the export
+        data = snapshot_table(usernames=["etl_test_skip"])
+        assert data["files_created"] == 1
+        assert (paths.CACHE_DIR / "snapshot_versions.json").exists()
+
+        # Unchanged table: export skipped, still counted as updated
+        data = snapshot_table(usernames=["etl_test_skip"])
+        assert data["files_updated"] == 1
+        assert data["exports_skipped"] == 1
+
+        # Changed table: export runs again
+        cursor.execute("INSERT INTO etl_test_skip.items (name) VALUES ('second')")
+        conn.commit()
+        data = snapshot_table(usernames=["etl_test_skip"])
+        assert data["exports_skipped"] == 0
+        assert "second" in seed_csv_path.read_text()
+
+    finally:
+        cursor.execute("DROP SCHEMA IF EXISTS etl_test_skip CASCADE")
+        conn.commit()
+
+
+@pytest.mark.slow_etl
+def test_snapshot_table_generated_column_has_no_default(db_cursor, redirect_tables_dir):
+    """
+    Story: Generated columns are not written out as DEFAULT expressions
+
+    Given a table with a GENERATED ALWAYS AS ... STORED column
+    When we snapshot it
+    Then its create.sql gives that column no DEFAULT (the expression names other columns)
+    """
+    create_sql_path = redirect_tables_dir / "etl_test_generated" / "items" / "create.sql"
+
+    conn, cursor = db_cursor
+
+    try:
+        cursor.execute("CREATE SCHEMA IF NOT EXISTS etl_test_generated")
+        cursor.execute(
+            "CREATE TABLE etl_test_generated.items ("
+            "price INTEGER DEFAULT 0, total INTEGER GENERATED ALWAYS AS (price * 2) STORED)"
+        )
+        conn.commit()
+
+        snapshot_table(usernames=["etl_test_generated"])
+
+        create_sql = create_sql_path.read_text()
+        assert "DEFAULT 0" in create_sql
+        assert "price * 2" not in create_sql
+
+    finally:
+        cursor.execute("DROP SCHEMA IF EXISTS etl_test_generated CASCADE")
+        conn.commit()
@@ -3,7 +3,10 @@
 #
 
 # Standard library
+import os
+import time
 from pathlib import Path
+from typing import Iterator, Union
 
 #
 # Path Constants
@@ -19,3 +22,103 @@ SCHEMA_MMD_PATH = PROJECT_ROOT / "data" / "schema.mmd"
 
 # Frontend source
 FRONTEND_SRC = PROJECT_ROOT / "frontend" / "src"
+
+# Machine-local sync state (kept out of the tracked data tree; ignored by git)
+CACHE_DIR = Path(__file__).resolve().parent / ".cache"
+
+#
+# Directory Listing Cache
+#
+
+# Listings newer than this are not cached: a change within the filesystem's mtime
+# granularity could otherwise leave the directory mtime unchanged
+LISTING_CACHE_MIN_AGE_NS = 2_000_000_000
+
+# Directory path -> (mtime_ns, subdirectory paths, file names)
+_listing_cache: dict[str, tuple[int, list[str], list[str]]] = {}
+
+
+def list_directory(path: str) -> tuple[list[str], list[str]]:
+    """
+    List a directory's subdirectories and files, reusing the last listing while the
+    directory's mtime is unchanged.
+
+    Adding, removing or renaming an entry updates the directory's mtime, so one stat()
+    is enough to validate a cached listing. Symlinked directories are not followed.
+
+    @param path (str): Directory to list
+    @returns tuple - (subdirectory paths, file names)
+    """
+
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _listing_cache.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1], cached[2]
+
+    subdirs: list[str] = []
+    files: list[str] = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.is_file():
+                files.append(entry.name)
+
+    if time.time_ns() - mtime_ns >= LISTING_CACHE_MIN_AGE_NS:
+        _listing_cache[path] = (mtime_ns, subdirs, files)
+
+    return subdirs, files
+
+
+#
+# Helper Functions
+#
+
+
+def walk_files(root: Union[str, Path], name: str) -> Iterator[str]:
+    """
+    Recursively yield paths of files called name under root.
+
+    Walks with an explicit stack over list_directory(), so unchanged directories cost
+    one stat() on repeated walks and no Path objects are built. Symlinked directories
+    are not followed and unreadable or missing directories are skipped.
+
+    @param root (str | Path): Directory to search
+    @param name (str): Exact file name to match (e.g. "create.sql")
+    @returns Iterator[str] - Matching file paths
+    """
+
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            subdirs, files = list_directory(directory)
+        except OSError:
+            continue
+
+        stack.extend(subdirs)
+        if name in files:
+            yield os.path.join(directory, name)
+
+
+def walk_relative_files(root: Union[str, Path]) -> Iterator[tuple[str, str]]:
+    """
+    Recursively yield every file under root with its "/"-separated path relative to root.
+
+    Uses the same cached list_directory() walk as walk_files().
+
+    @param root (str | Path): Directory to search
+    @returns Iterator[tuple[str, str]] - (file path, relative key)
+    """
+
+    stack = [(str(root), "")]
+    while stack:
+        directory, prefix = stack.pop()
+        try:
+            subdirs, files = list_directory(directory)
+        except OSError:
+            continue
+
+        stack.extend((subdir, f"{prefix}{os.path.basename(subdir)}/") for subdir in subdirs)
+        for file_name in files:
+            yield os.path.join(directory, file_name), f"{prefix}{file_name}"
@@ -3,7 +3,11 @@
 #
 
 # Standard library
+import functools
 import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
 
 # AWS SDK
 import boto3
@@ -30,15 +34,28 @@ MINIO_ACCESS_KEY = os.getenv("MINIO_ROOT_USER")
 MINIO_SECRET_KEY = os.getenv("MINIO_ROOT_PASSWORD")
 MINIO_REGION = os.getenv("MINIO_REGION")
 
+# HTTP connections kept alive per client (at least one per concurrent upload,
+# download or drop worker, whichever pool is largest)
+S3_MAX_POOL_CONNECTIONS = max(
+    32,
+    int(os.getenv("S3_UPLOAD_WORKERS", "16")),
+    int(os.getenv("S3_DOWNLOAD_WORKERS", "16")),
+    int(os.getenv("S3_DROP_WORKERS", "8")),
+)
+
 
 #
 # Helper Functions
 #
 
 
+@functools.lru_cache(maxsize=4)
 def get_s3_client(endpoint_url: str | None = None):
     """
-    Create a configured boto3 S3 client for MinIO.
+    Get a configured boto3 S3 client for MinIO.
+
+    Clients are cached per endpoint so every ETL step in a process shares one
+    client and its keep-alive connection pool (boto3 clients are thread-safe).
 
     @param endpoint_url (str | None): Optional endpoint URL override
     @returns boto3 S3 client
@@ -49,7 +66,10 @@ def get_s3_client(endpoint_url: str | None = None):
 
     # Configure for MinIO (path-style addressing)
     config = Config(
-        region_name=MINIO_REGION, signature_version="s3v4", s3={"addressing_style": "path"}
+        region_name=MINIO_REGION,
+        signature_version="s3v4",
+        s3={"addressing_style": "path"},
+        max_pool_connections=S3_MAX_POOL_CONNECTIONS,
     )
 
     logger.debug("Creating S3 client (endpoint=%s)", endpoint)
@@ -60,3 +80,77 @@ def get_s3_client(endpoint_url: str | None = None):
         aws_secret_access_key=MINIO_SECRET_KEY,
         config=config,
     )
+
+
+#
+# Bucket Listing Cache
+#
+
+# Bucket names by endpoint, only populated inside a bucket_cache() block
+_bucket_cache: Optional[dict[str, set[str]]] = None
+_bucket_cache_depth = 0
+_bucket_cache_lock = threading.Lock()
+
+
+@contextmanager
+def bucket_cache() -> Iterator[None]:
+    """
+    Share one list_buckets() result across every ETL step run inside this block.
+
+    Blocks may be nested; the cache is dropped when the outermost block exits.
+    Bucket creates and deletes made through record_bucket_created() and
+    record_bucket_deleted() keep the cached listing current.
+    """
+
+    global _bucket_cache, _bucket_cache_depth
+
+    with _bucket_cache_lock:
+        _bucket_cache_depth += 1
+        if _bucket_cache is None:
+            _bucket_cache = {}
+
+    try:
+        yield
+    finally:
+        with _bucket_cache_lock:
+            _bucket_cache_depth -= 1
+            if _bucket_cache_depth == 0:
+                _bucket_cache = None
+
+
+def list_bucket_names(client) -> set[str]:
+    """
+    List existing bucket names, reusing the cached listing inside a bucket_cache() block.
+
+    @param client: boto3 S3 client
+    @returns set[str] - Names of existing buckets
+    """
+
+    endpoint = client.meta.endpoint_url
+
+    with _bucket_cache_lock:
+        if _bucket_cache is not None and endpoint in _bucket_cache:
+            return set(_bucket_cache[endpoint])
+
+    list_response = client.list_buckets()
+    names = {bucket["Name"] for bucket in list_response.get("Buckets", [])}
+
+    with _bucket_cache_lock:
+        if _bucket_cache is not None:
+            _bucket_cache[endpoint] = set(names)
+
+    return names
+
+
+def record_bucket_created(client, bucket_name: str) -> None:
+    """Add a newly created bucket to the cached listing (no-op outside bucket_cache())"""
+    with _bucket_cache_lock:
+        if _bucket_cache is not None and client.meta.endpoint_url in _bucket_cache:
+            _bucket_cache[client.meta.endpoint_url].add(bucket_name)
+
+
+def record_bucket_deleted(client, bucket_name: str) -> None:
+    """Remove a deleted bucket from the cached listing (no-op outside bucket_cache())"""
+    with _bucket_cache_lock:
+        if _bucket_cache is not None and client.meta.endpoint_url in _bucket_cache:
+            _bucket_cache[client.meta.endpoint_url].discard(bucket_name)
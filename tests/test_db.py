@@ -2,11 +2,21 @@
 # Imports
 #
 
+# Standard library
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
 # Testing
+import psycopg2
+import psycopg2.extensions
+import psycopg2.extras
 import pytest
 
 # Module under test
-from dev.db import execute_query
+import dev.db as db
+from dev.db import execute_query, execute_script
 
 
 #
@@ -38,3 +48,218 @@ def test_execute_query_none():
 
     with pytest.raises(ValueError, match="SQL query cannot be empty"):
         execute_query(None)
+
+
+#
+# Tests — execute_script
+#
+
+
+def test_execute_script_empty_list():
+    """
+    Story: Empty statement list is a no-op
+
+    Given an empty list of SQL statements
+    When we call execute_script
+    Then it returns no failures without hitting the database
+    """
+
+    assert execute_script([]) == {}
+
+
+#
+# Tests — execute_script_concurrently
+#
+
+
+def test_execute_script_concurrently_runs_each_statement_once(monkeypatch):
+    """
+    Story: Statements are split across workers without loss or duplication
+
+    Given four workers and ten statements, two of which fail
+    When we call execute_script_concurrently
+    Then every statement runs exactly once
+    And each failure is keyed by the statement's index in the input list
+    """
+
+    # Arrange
+    statements = [f"SELECT {i}" for i in range(10)]
+    failing = {"SELECT 3", "SELECT 8"}
+    executed: list[str] = []
+    lock = threading.Lock()
+
+    def fake_execute_script(batch):
+        with lock:
+            executed.extend(batch)
+        return {i: f"{sql} failed" for i, sql in enumerate(batch) if sql in failing}
+
+    monkeypatch.setattr(db, "db_workers", lambda: 4)
+    monkeypatch.setattr(db, "execute_script", fake_execute_script)
+
+    # Act
+    failures = db.execute_script_concurrently(statements)
+
+    # Assert
+    assert sorted(executed) == sorted(statements)
+    assert failures == {3: "SELECT 3 failed", 8: "SELECT 8 failed"}
+
+
+#
+# Tests — map_with_connections
+#
+
+
+def test_map_with_connections_keeps_input_order(monkeypatch):
+    """
+    Story: Results come back in input order across several connections
+
+    Given three workers and items that finish in reverse order
+    When we call map_with_connections
+    Then each item is processed exactly once
+    And the results line up with the input items
+    And the work was spread over more than one connection
+    """
+
+    # Arrange
+    items = list(range(9))
+    processed: list[int] = []
+    borrowed: list[object] = []
+    lock = threading.Lock()
+
+    @contextmanager
+    def fake_pooled_connection():
+        conn = object()
+        with lock:
+            borrowed.append(conn)
+        yield conn
+
+    def fn(conn, item):
+        # Later items finish first, so completion order differs from input order
+        time.sleep((len(items) - item) * 0.002)
+        with lock:
+            processed.append(item)
+        return item * 10
+
+    monkeypatch.setattr(db, "db_workers", lambda: 3)
+    monkeypatch.setattr(db, "get_pooled_connection", fake_pooled_connection)
+
+    # Act
+    results = db.map_with_connections(fn, items)
+
+    # Assert
+    assert results == [item * 10 for item in items]
+    assert sorted(processed) == items
+    assert len(borrowed) == 3
+
+
+#
+# Tests — execute_async_batch
+#
+
+
+class FakeAsyncConnection:
+    """
+    Stand-in for a psycopg2 async connection.
+
+    "SELECT n" stays busy for n polls, "FAIL n" raises from poll() after n polls and
+    "REJECT" raises from execute() before anything is sent.
+    """
+
+    _filenos = itertools.count(100)
+
+    def __init__(self, executed: list[str]):
+        self._fileno = next(self._filenos)
+        self._executed = executed
+        self._statement = ""
+        self._polls_left = 0
+        self.closed = False
+
+    def fileno(self) -> int:
+        return self._fileno
+
+    def cursor(self):
+        return self
+
+    def execute(self, statement: str) -> None:
+        if statement == "REJECT":
+            raise psycopg2.Error("REJECT rejected")
+        self._executed.append(statement)
+        self._statement = statement
+        self._polls_left = int(statement.split()[1])
+
+    def poll(self) -> int:
+        if self._polls_left:
+            self._polls_left -= 1
+            return psycopg2.extensions.POLL_READ
+        if self._statement.startswith("FAIL"):
+            self._statement = ""
+            raise psycopg2.Error("FAIL failed")
+        return psycopg2.extensions.POLL_OK
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def fake_async_connections(monkeypatch):
+    """Patch execute_async_batch onto FakeAsyncConnections over three workers"""
+    executed: list[str] = []
+    connections: list[FakeAsyncConnection] = []
+
+    def connect(**kwargs):
+        assert kwargs.pop("async_") is True
+        connections.append(FakeAsyncConnection(executed))
+        return connections[-1]
+
+    monkeypatch.setattr(db, "db_workers", lambda: 3)
+    monkeypatch.setattr(db, "_db_params", lambda: {})
+    monkeypatch.setattr(psycopg2, "connect", connect)
+    monkeypatch.setattr(psycopg2.extras, "wait_select", lambda conn: None)
+    monkeypatch.setattr(db.select, "select", lambda readers, writers, errors: None)
+    return executed, connections
+
+
+def test_execute_async_batch_runs_each_statement_once(fake_async_connections):
+    """
+    Story: Every statement runs once, whatever order they finish in
+
+    Given three async connections and statements of very different durations
+    When we call execute_async_batch
+    Then every statement is executed exactly once
+    And all connections are closed afterwards
+    """
+
+    # Arrange
+    executed, connections = fake_async_connections
+    statements = ["SELECT 5", "SELECT 0", "SELECT 3", "SELECT 1", "SELECT 0", "SELECT 2"]
+
+    # Act
+    failures = db.execute_async_batch(statements)
+
+    # Assert
+    assert failures == {}
+    assert sorted(executed) == sorted(statements)
+    assert len(connections) == 3
+    assert all(conn.closed for conn in connections)
+
+
+def test_execute_async_batch_maps_errors_to_statements(fake_async_connections):
+    """
+    Story: Failures are reported against the statement that caused them
+
+    Given statements that fail while running and one rejected before sending
+    When we call execute_async_batch
+    Then each error is keyed by its statement's index
+    And the statements after a failure still run
+    """
+
+    # Arrange
+    executed, _ = fake_async_connections
+    statements = ["SELECT 4", "FAIL 2", "SELECT 0", "REJECT", "FAIL 0", "SELECT 1"]
+
+    # Act
+    failures = db.execute_async_batch(statements)
+
+    # Assert
+    assert failures == {1: "FAIL failed", 3: "REJECT rejected", 4: "FAIL failed"}
+    assert sorted(executed) == sorted(s for s in statements if s != "REJECT")
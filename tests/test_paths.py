@@ -0,0 +1,75 @@
+#
+# Imports
+#
+
+# Standard library
+import os
+
+# Module under test
+import dev.paths as paths
+from dev.paths import walk_files
+
+
+#
+# Tests — walk_files
+#
+
+
+def test_walk_files_finds_nested_matches(tmp_path):
+    """
+    Story: Only files with the exact name are found, at any depth
+
+    Given create.sql files at several depths and a directory named create.sql
+    When we call walk_files
+    Then only the regular files are returned
+    """
+
+    (tmp_path / "meta" / "users").mkdir(parents=True)
+    (tmp_path / "meta" / "users" / "create.sql").write_text("")
+    (tmp_path / "top").mkdir()
+    (tmp_path / "top" / "create.sql").write_text("")
+    (tmp_path / "top" / "seed.csv").write_text("")
+    (tmp_path / "odd" / "create.sql").mkdir(parents=True)
+
+    result = sorted(walk_files(tmp_path, "create.sql"))
+
+    assert result == [
+        str(tmp_path / "meta" / "users" / "create.sql"),
+        str(tmp_path / "top" / "create.sql"),
+    ]
+
+
+def test_walk_files_missing_root(tmp_path):
+    """
+    Story: A missing root yields nothing
+
+    Given a path that does not exist
+    When we call walk_files
+    Then no files are returned and no error is raised
+    """
+
+    assert list(walk_files(tmp_path / "missing", "create.sql")) == []
+
+
+def test_walk_files_sees_changes_after_cached_listing(tmp_path, monkeypatch):
+    """
+    Story: Cached directory listings are invalidated when a directory changes
+
+    Given a walk that cached every directory listing
+    When a new file is added and its directory mtime moves forward
+    Then the next walk finds the new file
+    """
+
+    # Cache every listing regardless of how recently it changed
+    monkeypatch.setattr(paths, "LISTING_CACHE_MIN_AGE_NS", 0)
+
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "create.sql").write_text("")
+    assert len(list(walk_files(tmp_path, "create.sql"))) == 1
+
+    (tmp_path / "b").mkdir()
+    (tmp_path / "b" / "create.sql").write_text("")
+    stat = os.stat(tmp_path)
+    os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert len(list(walk_files(tmp_path, "create.sql"))) == 2